@@ -1,8 +1,23 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
-from collections import Counter
-import re
+import plotly.graph_objects as go
+import os
+import sys
+
+# Shared data-layer modules live next to the batch scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from dashboard_data import (DATA_PATH, DISTINCT_MODE, RETENTION_MIN_BUYERS, SKETCH_DIMS, SUMMARIES,
+                            build_full_dataset, current_version, get_buyer_sketch, get_filter_index,
+                            get_keyword_index, get_rollup_cube, get_uid_codes, load_snapshot, write_snapshot)
+from dataset import DatasetWatcher
+from distinct_sketch import expected_error
+from memo_cache import MemoCache
+from profiling import stage, start_run
+from rollup_cube import filter_cube, top_by
+from seller_lifecycle import FREQS
+from streamlit.runtime.scriptrunner import RerunException, StopException
 
 # Configuration
 st.set_page_config(page_title="마케팅 인사이트 대시보드", layout="wide")
@@ -11,72 +26,185 @@ st.set_page_config(page_title="마케팅 인사이트 대시보드", layout="wid
 import plotly.io as pio
 pio.templates.default = "plotly_white"
 
-@st.cache_data
+# Pages receive lazy-copy views of the shared dataset; Copy-on-Write keeps writes local to a view
+# (always on from pandas 3)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# Seconds between source checks of the background refresh (0 turns the watcher off)
+REFRESH_SECONDS = float(os.environ.get('DASHBOARD_REFRESH_SECONDS', 30))
+
+def warm_dataset(ds):
+    # Runs on a background thread (after the first load, and before each swap), so no rerun waits for these
+    get_filter_index(ds)
+    get_rollup_cube(ds)
+    if '상품명' in ds.columns:
+        get_keyword_index(ds)
+    # Next boot serves home and the detail tabs from this version's snapshot
+    if load_snapshot(ds.version) is None:
+        write_snapshot(ds)
+
+def release_dataset(old, new):
+    # Memoized results of the replaced version can never be hit again
+    get_memo().discard(lambda key: key[0] == old.version)
+
+@st.cache_resource
+def get_dataset_watcher():
+    # Started on the first rerun: the dataset is loaded off the request path from boot, and a changed CSV is
+    # loaded the same way and swapped in atomically (see DatasetWatcher)
+    return DatasetWatcher(DATA_PATH, build_full_dataset, warm_fn=warm_dataset, on_swap=release_dataset,
+                          interval=REFRESH_SECONDS).start()
+
 def load_data():
-    filepath = 'data/project1 - classification_results.csv'
-    try:
-        df = pd.read_csv(filepath)
-    except FileNotFoundError:
-        st.error(f"파일을 찾을 수 없습니다: {filepath}")
-        return pd.DataFrame()
+    # One read-only dataset per process, shared by every session and rerun (no per-session copies).
+    # Each rerun takes the current version once and keeps it to the end, even if a swap happens meanwhile.
+    # Never waits: None while the watcher is still loading the first version
+    watcher = get_dataset_watcher()
+    ds = watcher.peek()
+    if ds is None and isinstance(watcher.error, FileNotFoundError):
+        st.error(f"파일을 찾을 수 없습니다: {DATA_PATH}")
+    return ds
 
-    # Numeric cleanup
-    numeric_cols = ['주문수량', '취소수량', '주문-취소 수량', '결제금액', '실결제 금액', '판매단가', '공급단가', '재구매 횟수']
-    for col in numeric_cols:
-        if col in df.columns and df[col].dtype == object:
-             try:
-                df[col] = df[col].str.replace(',', '').astype(float)
-             except:
-                pass
+# Seconds between checks while a page shows a placeholder for work running in the background
+POLL_SECONDS = 2
 
-    # Date parse
-    date_cols = ['주문일', '배송준비 처리일', '입금일']
-    for col in date_cols:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors='coerce')
-    
+@st.fragment(run_every=POLL_SECONDS)
+def wait_for(ready, message):
+    # Placeholder for data prepared in the background; reruns the whole page once ready() holds
+    if ready():
+        st.rerun()
+    st.info(message, icon="⏳")
 
+@st.cache_resource
+def get_snapshot_holder():
+    # Last snapshot loaded in this process and the dataset version it belongs to
+    return {}
 
-    valid_sales = df[df['주문-취소 수량'] > 0].copy()
-    
-    # Derived Columns
-    if '광역지역' in valid_sales.columns:
-        valid_sales['RegionGroup'] = valid_sales['광역지역'].apply(lambda x: '서울' if '서울' in str(x) else '비서울')
-        
-    # Month for Lifecycle
-    if '주문일' in valid_sales.columns:
-        valid_sales['YearMonth'] = valid_sales['주문일'].dt.to_period('M').astype(str)
+def get_snapshot():
+    # (snapshot, stale): the snapshot of the current source (a stat plus two small JSON reads). While a changed
+    # source is reloaded in the background, the last snapshot (of this process, else on disk) is returned with
+    # stale=True; (None, False) when there is none at all
+    holder = get_snapshot_holder()
+    version = current_version()
+    if version is not None and holder.get('version') != version:
+        frames = load_snapshot(version)
+        if frames is not None:
+            holder.update(version=version, frames=frames)
+    if version is not None and holder.get('version') == version:
+        return holder['frames'], False
+    if 'frames' not in holder:
+        frames = load_snapshot()
+        if frames is None:
+            return None, False
+        holder.update(version=None, frames=frames)
+    return holder['frames'], True
+
+def get_summary(src, name):
+    # src is a snapshot bundle or the row-level Dataset; None when the data lacks the summary's columns
+    if isinstance(src, dict):
+        return src.get(name)
+    columns, build = SUMMARIES[name]
+    if not all(c in src.columns for c in columns):
+        return None
+    return memoized(src, 'summary', (name,), lambda: build(src))
+
+@st.cache_resource
+def get_memo():
+    # Filter-dependent results shared by all sessions, bounded by DASHBOARD_MEMO_MB (LRU by bytes)
+    return MemoCache()
+
+def memoized(ds, page, key, compute_fn):
+    # Cached per (dataset version, page, key); returned values are shared and must not be modified
+    return get_memo().get((ds.version, page) + key, compute_fn)
+
+def show_chart(fig, name):
+    # Plotly figure serialization happens inside st.plotly_chart, so it gets its own stage
+    with stage(f'chart.{name}'):
+        st.plotly_chart(fig, use_container_width=True)
 
-    # Keywords Extraction (Simple)
-    if '상품명' in valid_sales.columns:
-        def extract_keywords(text):
-            # Extract distinct words, remove numbers/symbols
-            words = re.findall(r'[가-힣]+', str(text))
-            return words
-        valid_sales['Keywords'] = valid_sales['상품명'].apply(extract_keywords)
+def session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        return get_script_run_ctx().session_id
+    except (ImportError, AttributeError):
+        return None
 
-    return valid_sales
+def render_profile_panel(profiler):
+    # Optional sidebar panel with the stage timings of this rerun (DASHBOARD_PROFILE=1)
+    with st.sidebar.expander("⏱ 성능 프로파일 (최근 실행)", expanded=False):
+        st.caption(f"총 {profiler.total_ms:,.0f} ms · 페이지: {profiler.page}")
+        timings = pd.DataFrame([
+            {'단계': '　' * s.depth + s.name, 'ms': round(s.ms, 1), '처리 행 수': s.rows,
+             '프로세스 RSS Δ(MB)': round(s.mem_mb, 1)}
+            for s in profiler.stages if s.ms is not None
+        ])
+        st.dataframe(timings, hide_index=True)
+        # RSS is read for the whole server process, so other sessions and background threads show up in the delta
+        st.caption("RSS Δ 는 프로세스 전체 값으로, 같은 시간에 실행된 다른 세션과 백그라운드 작업의 메모리도 포함됩니다.")
+        memo = get_memo().stats()
+        st.caption(f"메모 캐시: {memo['entries']}개 · {memo['bytes'] / 2 ** 20:,.1f} / {memo['budget'] / 2 ** 20:,.0f} MB · "
+                   f"적중 {memo['hits']} · 미스 {memo['misses']} · 제거 {memo['evictions']} "
+                   f"(적중률 {memo['hit_rate']:.0%})")
 
 def main():
+    # Stage timings are only collected when DASHBOARD_PROFILE is set (otherwise no-ops)
+    profiler = start_run(session_id())
     st.title("🍊 이커머스 마케팅 인사이트 대시보드")
     
-    df = load_data()
-    if df.empty:
-        st.warning("데이터가 없습니다. 데이터 소스를 확인해주세요.")
-        return
-        
     # Sidebar Navigation
     st.sidebar.header("네비게이션")
     page = st.sidebar.radio("이동:", ["홈 (개요)", "상세 분석", "교차 분석 (Drill Down)", "EDA 보고서"])
     
-    if page == "홈 (개요)":
-        render_home(df)
-    elif page == "상세 분석":
-        render_details(df)
-    elif page == "교차 분석 (Drill Down)":
-        render_cross_analysis(df)
-    elif page == "EDA 보고서":
-        render_report()
+    # finally: the placeholder / no-data returns still close the run, so every rerun is logged;
+    # st.rerun() / st.stop() end the run early too, but then nothing more is rendered
+    interrupted = False
+    try:
+        # The dataset is loaded (and reloaded when the source changes) by the watcher's thread from boot
+        watcher = get_dataset_watcher()
+    
+        # Home and the detail tabs are served from the snapshot bundle. While a changed source is reloaded in the
+        # background the previous snapshot is shown, marked stale. The order rows are only used for Drill Down,
+        # or when there is no snapshot; until the watcher has them, a placeholder is shown instead of blocking
+        src, stale = None, False
+        if page in ("홈 (개요)", "상세 분석"):
+            with stage('load_snapshot'):
+                src, stale = get_snapshot()
+        if src is None and page != "EDA 보고서":
+            with stage('load_data') as s:
+                src = load_data()
+                s.rows = None if src is None else len(src)
+            # Drill Down also waits for warm_dataset (filter index, cube), so its first render does not build them
+            ready = watcher.warmed if page == "교차 분석 (Drill Down)" else lambda: watcher.peek() is not None
+            if watcher.error is None and not ready():
+                wait_for(ready, "주문 데이터를 불러오는 중입니다. 준비되면 자동으로 표시됩니다.")
+                return
+            if src is None or src.empty:
+                st.warning("데이터가 없습니다. 데이터 소스를 확인해주세요.")
+                return
+        if stale:
+            wait_for(lambda: not get_snapshot()[1], "데이터가 바뀌어 새 요약을 준비하는 중입니다. 아래는 이전 데이터 기준입니다.")
+    
+        if page == "홈 (개요)":
+            with stage('render_home'):
+                render_home(src)
+        elif page == "상세 분석":
+            with stage('render_details'):
+                render_details(src)
+        elif page == "교차 분석 (Drill Down)":
+            with stage('render_cross_analysis'):
+                render_cross_analysis(src)
+        elif page == "EDA 보고서":
+            with stage('render_report'):
+                render_report()
+    except (RerunException, StopException):
+        interrupted = True
+        raise
+    finally:
+        if profiler is not None:
+            profiler.page = page
+            run = profiler.finish()
+            if not interrupted:
+                render_profile_panel(run)
 
 def render_report():
     try:
@@ -86,13 +214,15 @@ def render_report():
     except FileNotFoundError:
         st.error("보고서 파일을 찾을 수 없습니다. (reports/EDA_Report.md)")
 
-def render_home(df):
+def render_home(src):
     st.header("경영 요약 (Executive Summary)")
     
-    # KPIs
-    total_sales = df['실결제 금액'].sum()
-    total_orders = df['주문-취소 수량'].sum()
-    avg_price = df['판매단가'].mean()
+    # KPIs (re-aggregated from the rollup cube instead of the order rows, or read from the snapshot)
+    with stage('home.kpis'):
+        kpi = get_summary(src, 'kpis').iloc[0]
+    total_sales = kpi['total_sales']
+    total_orders = kpi['total_orders']
+    avg_price = kpi['avg_price']
     
     col1, col2, col3 = st.columns(3)
     col1.metric("총 매출", f"₩{total_sales:,.0f}")
@@ -106,144 +236,241 @@ def render_home(df):
     
     with c1:
         st.subheader("매출 상위 5개 셀러")
-        if '셀러명' in df.columns:
-            top_sellers = df.groupby('셀러명')['실결제 금액'].sum().nlargest(5).reset_index()
+        with stage('home.top_sellers'):
+            top_sellers = get_summary(src, 'top_sellers')
+        if top_sellers is not None:
             fig_seller = px.bar(top_sellers, x='셀러명', y='실결제 금액', title="상위 셀러 매출")
-            st.plotly_chart(fig_seller, use_container_width=True)
+            show_chart(fig_seller, 'seller')
         else:
             st.info("셀러 데이터가 없습니다.")
         
     with c2:
         st.subheader("매출 상위 5개 상품")
-        if '상품명' in df.columns:
-            top_products = df.groupby('상품명')['실결제 금액'].sum().nlargest(5).reset_index()
-            top_products['ShortName'] = top_products['상품명'].str[:20] + "..."
+        with stage('home.top_products'):
+            top_products = get_summary(src, 'top_products')
+        if top_products is not None:
+            top_products = top_products.assign(ShortName=top_products['상품명'].astype(str).str[:20] + "...")
             fig_prod = px.bar(top_products, x='ShortName', y='실결제 금액', title="상위 상품 매출", hover_data=['상품명'])
-            st.plotly_chart(fig_prod, use_container_width=True)
+            show_chart(fig_prod, 'prod')
         else:
             st.info("상품 데이터가 없습니다.")
 
-def render_details(df):
+# Computation paths of the Drill Down page, kept free of Streamlit calls so they can be benchmarked
+def filtered_cube(ds, index, filters, search):
+    # Products matching the search are resolved on distinct names, then applied to the cube as a name list
+    products = None
+    if search and '상품명' in ds.columns:
+        products = index.uniques['상품명'][index.match_products(search)]
+    return filter_cube(get_rollup_cube(ds), filters, products)
+
+# Distinct buyers on the Drill Down page (DISTINCT_MODE): 'exact' counts the UIDs of the matching rows, 'approx'
+# merges HyperLogLog sketches kept per seller x month x region (error set by DASHBOARD_SKETCH_ERROR)
+
+def count_codes(codes):
+    # Distinct non-missing codes
+    codes = codes[codes >= 0]
+    return int(np.count_nonzero(np.bincount(codes))) if len(codes) else 0
+
+def distinct_counts(ds, index, filters, search, keywords=None):
+    # (buyers, sellers, approximate) for a filter combination. Sketches carry no product dimension,
+    # so a product search always counts exactly; sellers are exact from the sketch's group keys
+    if DISTINCT_MODE == 'approx' and not search and all(c in ds.columns for c in SKETCH_DIMS + ['UID']):
+        sketch = get_buyer_sketch(ds)
+        mask = np.ones(len(sketch.keys), dtype=bool)
+        for col, value in filters.items():
+            mask &= (sketch.keys[col] == value).to_numpy()
+        return round(sketch.estimate(mask)), int(sketch.keys.loc[mask, '셀러명'].nunique()), True
+    rows = index.select(filters, search, keywords)
+    buyers = sellers = 0
+    if 'UID' in ds.columns:
+        codes = get_uid_codes(ds)
+        buyers = count_codes(codes if rows is None else codes[rows])
+    if '셀러명' in index.codes:
+        codes = index.codes['셀러명']
+        sellers = count_codes(codes if rows is None else codes[rows])
+    return buyers, sellers, False
+
+def price_histogram_figure(bins):
+    fig = px.bar(bins, x='Mid', y='Count', title="가격대별 분포 (Sweet Spot: 29k-39k)",
+                 hover_data={'Left': ':,.0f', 'Right': ':,.0f', 'Mid': False},
+                 labels={'Mid': '판매단가', 'Count': 'count', 'Left': '구간 시작', 'Right': '구간 끝'})
+    fig.update_traces(width=(bins['Right'] - bins['Left']).to_numpy())
+    fig.update_layout(bargap=0)
+    return fig
+
+def price_box_figure(stats, outliers):
+    # Precomputed box statistics; outliers are drawn as a separate sampled scatter
+    fig = go.Figure(go.Box(x=stats['목적'].astype(str), q1=stats['Q1'], median=stats['Median'], q3=stats['Q3'],
+                           lowerfence=stats['LowerFence'], upperfence=stats['UpperFence'], mean=stats['Mean'],
+                           name='판매단가', boxpoints=False))
+    fig.add_trace(go.Scatter(x=outliers['목적'].astype(str), y=outliers['판매단가'], mode='markers',
+                             name='이상치 (표본)', marker={'size': 4, 'opacity': 0.5}))
+    fig.update_layout(title="목적별 판매단가 분포", xaxis_title='목적', yaxis_title='판매단가', showlegend=False)
+    return fig
+
+def render_details(src):
     st.header("상세 분석")
     
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["상품명(키워드)", "가격 & 기획", "이벤트 효율", "셀러 & 리텐션", "지역 & 배송"])
     
-    with tab1:
+    with tab1, stage('details.keywords'):
         st.subheader("상품명 키워드 분석")
         st.markdown("매출을 견인하는 핵심 키워드는 **'감귤', '타이벡', '전용'** 등 입니다.")
         
-        all_keywords = [word for keywords in df['Keywords'] for word in keywords]
-        keyword_counts = Counter(all_keywords)
-        common_keywords = keyword_counts.most_common(20)
-        
-        kw_df = pd.DataFrame(common_keywords, columns=['Keyword', 'Count'])
-        fig_kw = px.bar(kw_df, x='Keyword', y='Count', title="상위 20개 상품명 키워드 등장 빈도")
-        st.plotly_chart(fig_kw, use_container_width=True)
+        kw_df = get_summary(src, 'keywords_count')
+        if kw_df is not None:
+            fig_kw = px.bar(kw_df, x='Keyword', y='Count', title="상위 20개 상품명 키워드 등장 빈도")
+            show_chart(fig_kw, 'kw')
         
-        # Keyword Profitability (Optional/Advanced)
-        # Calculate average sales for products containing specific keywords
+        # Keyword Profitability
+        # Revenue and average price of orders whose product name contains each keyword
+        st.subheader("키워드별 수익성")
+        kw_rev = get_summary(src, 'keywords_revenue')
+        if kw_rev is not None:
+            fig_kw_rev = px.bar(kw_rev, x='Keyword', y='Revenue', title="매출 상위 20개 키워드",
+                                hover_data=['Orders', 'AvgPrice'], labels={'Revenue': '실결제 금액'})
+            show_chart(fig_kw_rev, 'kw_rev')
+            st.dataframe(kw_rev.rename(columns={'Count': '등장 횟수', 'Orders': '주문 건수', 'Revenue': '매출', 'AvgPrice': '평균 단가'})
+                         .style.format({'매출': '₩{:,.0f}', '평균 단가': '₩{:,.0f}'}))
         
-    with tab2:
+    with tab2, stage('details.price'):
         st.subheader("가격 정책")
-        if '판매단가' in df.columns:
-            fig_price = px.histogram(df, x='판매단가', nbins=50, title="가격대별 분포 (Sweet Spot: 29k-39k)")
+        bins = get_summary(src, 'price_histogram')
+        if bins is not None:
+            fig_price = price_histogram_figure(bins)
             fig_price.add_vline(x=29000, line_dash="dash", line_color="red", annotation_text="Sweet Spot Start")
             fig_price.add_vline(x=39000, line_dash="dash", line_color="red", annotation_text="Sweet Spot End")
-            st.plotly_chart(fig_price, use_container_width=True)
+            show_chart(fig_price, 'price')
         
         st.subheader("선물 vs 가정용")
-        if '목적' in df.columns and '판매단가' in df.columns:
-            fig_gift = px.box(df, x='목적', y='판매단가', title="목적별 판매단가 분포")
-            st.plotly_chart(fig_gift, use_container_width=True)
+        box = get_summary(src, 'price_box')
+        if box is not None:
+            fig_gift = price_box_figure(box, get_summary(src, 'price_outliers'))
+            show_chart(fig_gift, 'gift')
 
-    with tab3:
+    with tab3, stage('details.event'):
         st.subheader("이벤트 효율 분석")
-        if '이벤트 여부' in df.columns:
-            event_stats = df.groupby('이벤트 여부')[['실결제 금액']].sum().reset_index()
-            
+        event_stats = get_summary(src, 'event_split')
+        if event_stats is not None:
             fig_event_sales = px.pie(event_stats, values='실결제 금액', names='이벤트 여부', title="이벤트 여부별 매출 비중")
-            st.plotly_chart(fig_event_sales, use_container_width=True)
+            show_chart(fig_event_sales, 'event_sales')
                 
             st.success("💡 **인사이트**: 이벤트 상품의 매출 기여도를 확인하세요.")
         else:
             st.info("'이벤트 여부' 컬럼이 없습니다.")
 
-    with tab4:
+    with tab4, stage('details.retention'):
         st.subheader("셀러 리텐션 (재구매율)")
-        if '셀러명' in df.columns and 'UID' in df.columns:
-            user_counts = df.groupby('셀러명')['UID'].nunique()
-            dup_orders = df[df.duplicated(subset=['UID', '셀러명'], keep=False)]
-            repurchase_counts = dup_orders.groupby('셀러명')['UID'].nunique()
-            
-            retention_df = pd.concat([user_counts, repurchase_counts], axis=1).fillna(0)
-            retention_df.columns = ['총 구매자 수', '재구매자 수']
-            retention_df['재구매율(%)'] = (retention_df['재구매자 수'] / retention_df['총 구매자 수'] * 100).round(1)
-            
-            retention_df = retention_df[retention_df['총 구매자 수'] > 10].sort_values('재구매율(%)', ascending=False).head(10)
-            
-            st.write("재구매율 상위 셀러 (최소 10명 이상 구매)")
+        retention_df = get_summary(src, 'retention')
+        if retention_df is not None:
+            st.write(f"재구매율 상위 셀러 (최소 {RETENTION_MIN_BUYERS}명 이상 구매)")
             st.dataframe(retention_df)
             
-        st.subheader("셀러 생애주기 (월별 활동)")
-        if 'YearMonth' in df.columns:
-            monthly_active = df.groupby('YearMonth')['셀러명'].nunique().reset_index()
-            fig_lifecycle = px.line(monthly_active, x='YearMonth', y='셀러명', markers=True, title="월별 활동 셀러 수 추이")
-            st.plotly_chart(fig_lifecycle, use_container_width=True)
+        st.subheader("셀러 생애주기")
+        unit = st.radio("집계 단위", list(FREQS.values()), horizontal=True)
+        freq = next(f for f, label in FREQS.items() if label == unit)
+        stats = get_summary(src, f'lifecycle.{freq}')
+        if stats is not None:
+            fig_lifecycle = px.line(stats, x='Period', y=['활동', '신규', '이탈', '유지', '복귀'], markers=True,
+                                    title=f"{FREQS[freq]}별 셀러 활동 / 신규 / 이탈 / 유지 / 복귀",
+                                    labels={'Period': '기간', 'value': '셀러 수', 'variable': '구분'})
+            show_chart(fig_lifecycle, 'lifecycle')
+            if DISTINCT_MODE == 'approx':
+                st.caption(f"≈ HyperLogLog 근사값 (상대 표준 오차 약 ±{expected_error():.1%}), 코호트 리텐션은 정확값")
+            
+            # Cohort = period of a seller's first order; cells = % of the cohort active N periods later
+            cohort = get_summary(src, f'cohort.{freq}')
+            fig_cohort = px.imshow(cohort.drop(columns='Size'), y=cohort.index, aspect='auto',
+                                   color_continuous_scale='Blues', title="셀러 코호트 리텐션 (%)",
+                                   labels={'x': f'첫 주문 후 경과 ({FREQS[freq]})', 'y': '첫 주문 기간', 'color': '활동 비율(%)'})
+            show_chart(fig_cohort, 'cohort')
 
-    with tab5:
+    with tab5, stage('details.region'):
         st.subheader("서울 vs 비서울 상품 선호도")
-        if 'RegionGroup' in df.columns and '무게 구분' in df.columns:
-            cross = pd.crosstab(df['무게 구분'], df['RegionGroup'], normalize='columns').reset_index()
-            cross = pd.melt(cross, id_vars='무게 구분', var_name='지역', value_name='비율')
-            cross['비율'] = cross['비율'] * 100
-            
+        cross = get_summary(src, 'region_weight')
+        if cross is not None:
             fig_region = px.bar(cross, x='무게 구분', y='비율', color='지역', barmode='group', 
                                 title="지역별 포장 단위 선호도 (%)")
-            st.plotly_chart(fig_region, use_container_width=True)
+            show_chart(fig_region, 'region')
 
-def render_cross_analysis(df):
+def render_cross_analysis(ds):
     st.header("교차 분석 (Drill Down)")
     st.markdown("필터를 사용하여 **지역, 셀러, 상품**별 성과를 교차 분석하세요.")
     
+    # Row-id indexes built once per dataset; filters never copy the frame.
+    # A Hangul search word is answered from the keyword index's row postings
+    with stage('cross.index'):
+        index = get_filter_index(ds)
+        keywords = get_keyword_index(ds) if '상품명' in ds.columns else None
+    
     c1, c2, c3 = st.columns(3)
     
     with c1:
-        regions = ['전체'] + sorted(df['광역지역'].dropna().unique().tolist()) if '광역지역' in df.columns else []
+        regions = ['전체'] + index.options('광역지역') if '광역지역' in ds.columns else []
         sel_region = st.selectbox("지역 선택", regions)
         
     with c2:
-        sellers = ['전체'] + sorted(df['셀러명'].dropna().unique().tolist()) if '셀러명' in df.columns else []
+        sellers = ['전체'] + index.options('셀러명') if '셀러명' in ds.columns else []
         sel_seller = st.selectbox("셀러 선택", sellers)
         
     with c3:
         search_prod = st.text_input("상품명 검색 (키워드)", "")
 
-    filtered_df = df.copy()
-    
+    filters = {}
     if sel_region != '전체':
-        filtered_df = filtered_df[filtered_df['광역지역'] == sel_region]
+        filters['광역지역'] = sel_region
         
     if sel_seller != '전체':
-        filtered_df = filtered_df[filtered_df['셀러명'] == sel_seller]
+        filters['셀러명'] = sel_seller
         
-    if search_prod and '상품명' in df.columns:
-        filtered_df = filtered_df[filtered_df['상품명'].str.contains(search_prod, case=False, na=False)]
+    # Totals and the group chart come from the rollup cube (see filtered_cube)
+    # Results are memoized per filter combination, so switching back to a selection is a lookup
+    filter_key = (tuple(sorted(filters.items())), search_prod)
+    
+    def sub_cube():
+        return memoized(ds, 'cross', filter_key + ('cube',), lambda: filtered_cube(ds, index, filters, search_prod))
+    
+    def totals():
+        cube = sub_cube()
+        return int(cube['rows'].sum()), float(cube['실결제 금액'].sum())
+    
+    with stage('cross.filter') as s:
+        n_rows, revenue = memoized(ds, 'cross', filter_key + ('metric',), totals)
+        s.rows = n_rows
         
-    st.metric("필터링된 데이터 건수", f"{len(filtered_df)}건", f"매출: ₩{filtered_df['실결제 금액'].sum():,.0f}")
+    st.metric("필터링된 데이터 건수", f"{n_rows}건", f"매출: ₩{revenue:,.0f}")
+    
+    with stage('cross.distinct'):
+        buyers, n_sellers, approx = memoized(ds, 'cross', filter_key + ('distinct',),
+                                             lambda: distinct_counts(ds, index, filters, search_prod, keywords))
+    d1, d2 = st.columns(2)
+    if approx:
+        # Approximate figures are marked with ≈ and state their error
+        d1.metric("구매자 수", f"≈{buyers:,}명",
+                  help=f"HyperLogLog 근사값 (상대 표준 오차 약 ±{get_buyer_sketch(ds).relative_error:.1%})")
+    else:
+        d1.metric("구매자 수", f"{buyers:,}명")
+    d2.metric("셀러 수", f"{n_sellers:,}명")
     
     st.subheader("필터링 데이터 미리보기")
-    if not filtered_df.empty:
-        cols_to_show = [c for c in ['주문일', '상품명', '셀러명', '광역지역', '실결제 금액', '주문-취소 수량'] if c in df.columns]
-        st.dataframe(filtered_df[cols_to_show].head(100))
+    if n_rows > 0:
+        cols_to_show = [c for c in ['주문일', '상품명', '셀러명', '광역지역', '실결제 금액', '주문-취소 수량'] if c in ds.columns]
+        # Only the preview needs row ids (None means no filter applied)
+        with stage('cross.preview', rows=n_rows):
+            rows = memoized(ds, 'cross', filter_key + ('rows',), lambda: index.select(filters, search_prod, keywords))
+            preview_rows = np.arange(min(n_rows, 100)) if rows is None else rows[:100]
+            st.dataframe(ds.view(cols_to_show).iloc[preview_rows])
         
         st.subheader("매출 분석 (필터링)")
-        group_opts = [c for c in ['상품명', '셀러명', '광역지역', '과수 크기', '무게 구분', '이벤트 여부'] if c in df.columns]
+        group_opts = [c for c in ['상품명', '셀러명', '광역지역', '과수 크기', '무게 구분', '이벤트 여부'] if c in ds.columns]
         if group_opts:
             group_col = st.selectbox("그룹화 기준", group_opts)
-            agg_df = filtered_df.groupby(group_col)['실결제 금액'].sum().reset_index().sort_values('실결제 금액', ascending=False).head(20)
+            with stage('cross.group'):
+                agg_df = memoized(ds, 'cross', filter_key + ('group', group_col),
+                                  lambda: top_by(sub_cube(), group_col, n=20))
             
             fig = px.bar(agg_df, x=group_col, y='실결제 금액', title=f"{group_col}별 매출", text_auto='.2s')
-            st.plotly_chart(fig, use_container_width=True)
+            show_chart(fig, 'group')
 
 if __name__ == "__main__":
     main()
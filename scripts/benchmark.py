@@ -0,0 +1,404 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import cached_property
+
+import pandas as pd
+
+# 앱 모듈은 저장소 루트에 있음 (app.py lives in the repository root)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 기본 결과 경로 (Default results path; machine-specific, so kept out of git under data/)
+output_path = 'data/benchmark_results.json'
+
+# 등록된 벤치마크: 이름 -> (준비 함수, 측정 함수)
+# (Registered benchmarks: name -> (setup fn, timed fn)); 준비 시간은 측정에서 제외 (setup is not timed)
+BENCHMARKS = {}
+
+
+def benchmark(name, setup=None):
+    def register(fn):
+        BENCHMARKS[name] = (setup, fn)
+        return fn
+    return register
+
+
+class BenchContext:
+    # 벤치마크 간에 공유하는 입력, 처음 쓸 때 한 번만 준비 (Shared inputs, prepared lazily once)
+
+    def __init__(self, path, work_dir):
+        self.path = path
+        self.work_dir = work_dir
+
+    @cached_property
+    def app(self):
+        # Streamlit 렌더링 없이 계산 경로만 사용 (Only the computation paths are used, nothing is rendered)
+        with contextlib.redirect_stderr(io.StringIO()):
+            import app
+        return app
+
+    @cached_property
+    def data(self):
+        # 데이터셋 / 요약 계산 (Dataset and summary paths shared by app.py and scripts/snapshot.py)
+        import dashboard_data
+        return dashboard_data
+
+    @cached_property
+    def raw(self):
+        return pd.read_csv(self.path)
+
+    @cached_property
+    def dataset(self):
+        # 파생 컬럼까지 모두 읽은 프레임 (Every column, derived ones included)
+        from dataset import Dataset
+        from ingest import read_orders
+        return Dataset(self.data.build_dataset(read_orders(self.path)), self.data.DERIVED_COLUMNS).view()
+
+    @cached_property
+    def cube(self):
+        from rollup_cube import build_cube
+        return build_cube(self.dataset)
+
+    @cached_property
+    def filter_index(self):
+        from filter_index import FilterIndex
+        return FilterIndex(self.dataset)
+
+    @cached_property
+    def keyword_index(self):
+        from keyword_index import KeywordIndex
+        return KeywordIndex(self.dataset)
+
+    @cached_property
+    def aggregates(self):
+        from seller_aggregates import build_seller_aggregates
+        return build_seller_aggregates(self.raw)
+
+    @cached_property
+    def eda_frame(self):
+        import eda_analysis
+        with contextlib.redirect_stdout(io.StringIO()):
+            return eda_analysis.load_and_clean_data(self.path)[1]
+
+    def cache_dir(self, name):
+        return os.path.join(self.work_dir, name)
+
+
+# --- load_data ---
+
+def _fresh_cache(ctx):
+    shutil.rmtree(ctx.cache_dir('cold'), ignore_errors=True)
+    return ctx
+
+
+@benchmark('load_data.cold', setup=_fresh_cache)
+def bench_load_cold(ctx):
+    from data_cache import load_cached
+    from ingest import read_orders
+    load_cached(ctx.path, ctx.data.build_dataset, 'bench', cache_dir=ctx.cache_dir('cold'), read_fn=read_orders)
+
+
+def _warm_cache(ctx):
+    bench_load_warm(ctx)
+    return ctx
+
+
+@benchmark('load_data.warm', setup=_warm_cache)
+def bench_load_warm(ctx):
+    from data_cache import load_cached
+    from ingest import read_orders
+    load_cached(ctx.path, ctx.data.build_dataset, 'bench', cache_dir=ctx.cache_dir('warm'), read_fn=read_orders)
+
+
+@benchmark('load_data.lazy', setup=_warm_cache)
+def bench_load_lazy(ctx):
+    # 메모리 맵만 열고 교차 분석 미리보기 컬럼만 변환 (Open the memory map, convert only the Drill Down preview columns)
+    from data_cache import load_cached
+    from dataset import Dataset
+    from ingest import read_orders
+    ds = Dataset(load_cached(ctx.path, ctx.data.build_dataset, 'bench', cache_dir=ctx.cache_dir('warm'),
+                             read_fn=read_orders, lazy=True), ctx.data.DERIVED_COLUMNS)
+    ds.view(['주문일', '상품명', '셀러명', '광역지역', '실결제 금액', '주문-취소 수량'])
+
+
+def _write_snapshot(ctx):
+    from data_cache import store_bundle
+    from dataset import Dataset
+    frames = ctx.data.build_snapshot(Dataset(ctx.dataset))
+    store_bundle('bench.snapshot', frames, {}, cache_dir=ctx.cache_dir('snapshot'))
+    return ctx
+
+
+@benchmark('load_data.snapshot', setup=_write_snapshot)
+def bench_load_snapshot(ctx):
+    # 빠른 시작: 홈 / 상세 탭 요약만 로드 (Fast start: only the home / detail summaries are loaded)
+    from data_cache import load_bundle
+    load_bundle('bench.snapshot', cache_dir=ctx.cache_dir('snapshot'))
+
+
+# --- render_home ---
+
+@benchmark('home.cube_build')
+def bench_home_cube(ctx):
+    from rollup_cube import build_cube
+    build_cube(ctx.dataset)
+
+
+@benchmark('home.kpis')
+def bench_home_kpis(ctx):
+    from rollup_cube import kpis, top_by
+    kpis(ctx.cube)
+    top_by(ctx.cube, '셀러명', n=5)
+    top_by(ctx.cube, '상품명', n=5)
+
+
+# --- render_details ---
+
+@benchmark('details.keywords')
+def bench_details_keywords(ctx):
+    from keyword_index import KeywordIndex
+    index = KeywordIndex(ctx.dataset)
+    index.top(20, by='Count')
+    index.top(20, by='Revenue')
+
+
+@benchmark('details.price')
+def bench_details_price(ctx):
+    from distribution_summary import box_stats, histogram_bins
+    df = ctx.dataset
+    # 그림 JSON 직렬화까지 포함 (Includes figure JSON serialization, the payload sent to browsers)
+    ctx.app.price_histogram_figure(histogram_bins(df['판매단가'], nbins=ctx.data.PRICE_BINS)).to_json()
+    ctx.app.price_box_figure(*box_stats(df, '목적', '판매단가')).to_json()
+
+
+@benchmark('details.event')
+def bench_details_event(ctx):
+    ctx.data.event_split(ctx.dataset)
+
+
+@benchmark('details.retention')
+def bench_details_retention(ctx):
+    from retention_index import RetentionIndex
+    ctx.data.retention_table(RetentionIndex(ctx.dataset['UID'], ctx.dataset['셀러명']))
+
+
+@benchmark('details.lifecycle')
+def bench_details_lifecycle(ctx):
+    from seller_lifecycle import SellerLifecycle
+    for freq in ('M', 'W', 'D'):
+        lifecycle = SellerLifecycle.from_orders(ctx.dataset, freq)
+        lifecycle.summary()
+        lifecycle.cohort_matrix()
+
+
+@benchmark('details.lifecycle_approx')
+def bench_details_lifecycle_approx(ctx):
+    # DASHBOARD_DISTINCT=approx 의 생애주기 차트 (The lifecycle chart under DASHBOARD_DISTINCT=approx)
+    from seller_lifecycle import ApproxLifecycle
+    for freq in ('M', 'W', 'D'):
+        ApproxLifecycle.from_orders(ctx.dataset, freq).summary()
+
+
+@benchmark('details.region')
+def bench_details_region(ctx):
+    ctx.data.region_weight_share(ctx.dataset)
+
+
+# --- render_cross_analysis ---
+
+@benchmark('cross.index_build')
+def bench_cross_index(ctx):
+    from filter_index import FilterIndex
+    FilterIndex(ctx.dataset)
+
+
+@benchmark('cross.filter')
+def bench_cross_filter(ctx):
+    from rollup_cube import filter_cube, top_by
+    index = ctx.filter_index
+    region = index.options('광역지역')[0]
+    seller = index.options('셀러명')[0]
+    for filters, search in [({}, ''), ({'광역지역': region}, ''), ({'셀러명': seller}, ''), ({}, '감귤'),
+                            ({'광역지역': region}, '타이벡')]:
+        rows = index.select(filters, search, ctx.keyword_index)
+        products = index.uniques['상품명'][index.match_products(search)] if search else None
+        sub = filter_cube(ctx.cube, filters, products)
+        top_by(sub, '셀러명', n=20)
+        # 미리보기 100행 (The 100-row preview)
+        ctx.dataset.iloc[rows[:100] if rows is not None else slice(0, 100)]
+
+
+@benchmark('cross.distinct_exact')
+def bench_cross_distinct_exact(ctx):
+    index = ctx.filter_index
+    region = index.options('광역지역')[0]
+    uid = pd.factorize(ctx.dataset['UID'])[0]
+    for filters in [{}, {'광역지역': region}]:
+        rows = index.select(filters)
+        ctx.app.count_codes(uid if rows is None else uid[rows])
+
+
+@benchmark('cross.distinct_sketch')
+def bench_cross_distinct_sketch(ctx):
+    # 스케치 1회 생성 + 필터 조합별 병합 (One sketch build, then a merge per filter combination)
+    from distinct_sketch import DistinctSketch
+    sketch = DistinctSketch.build(ctx.dataset, ctx.data.SKETCH_DIMS, 'UID')
+    region = ctx.filter_index.options('광역지역')[0]
+    for mask in [None, (sketch.keys['광역지역'] == region).to_numpy()]:
+        sketch.estimate(mask)
+
+
+# --- classify_* ---
+
+@benchmark('classify.aggregates')
+def bench_classify_aggregates(ctx):
+    from seller_aggregates import build_seller_aggregates
+    build_seller_aggregates(ctx.raw)
+
+
+@benchmark('classify.premium')
+def bench_classify_premium(ctx):
+    from classify_premium import classify_premium
+    classify_premium(ctx.raw)
+
+
+@benchmark('classify.seller_type')
+def bench_classify_seller_type(ctx):
+    from classify_sellers import classify_seller_type
+    classify_seller_type(ctx.raw, ctx.aggregates)
+
+
+@benchmark('classify.seller_grade')
+def bench_classify_seller_grade(ctx):
+    from classify_seller_grades import classify_seller_grade
+    classify_seller_grade(ctx.raw, ctx.aggregates)
+
+
+@benchmark('classify.pipeline')
+def bench_classify_pipeline(ctx):
+    from classify_pipeline import run_pipeline
+    run_pipeline(ctx.raw, report=False)
+
+
+# --- eda_analysis H1-H7 ---
+
+def _eda_frame(ctx):
+    # 가설 함수는 프레임을 수정하지 않으므로 공유 프레임 사용 (Hypotheses no longer mutate the frame, so it is shared)
+    return ctx.eda_frame
+
+
+def _register_eda():
+    import eda_analysis
+    hypotheses = [
+        ('H1', eda_analysis.analyze_region_seller_impact),
+        ('H2', eda_analysis.analyze_event_efficiency),
+        ('H3', eda_analysis.analyze_gift_options),
+        ('H4', eda_analysis.analyze_seller_retention),
+        ('H5', eda_analysis.analyze_seller_specialty),
+        ('H6', eda_analysis.analyze_seller_lifecycle),
+        ('H7', eda_analysis.analyze_seoul_packages),
+    ]
+    for label, fn in hypotheses:
+        def run(df, fn=fn):
+            with contextlib.redirect_stdout(io.StringIO()):
+                fn(df)
+        benchmark(f'eda.{label}', setup=_eda_frame)(run)
+
+    # H1-H7 를 청크 스트리밍으로 한 번에 (All seven in one chunked pass, read and parse included)
+    def stream(ctx):
+        with contextlib.redirect_stdout(io.StringIO()):
+            eda_analysis.run_streaming(ctx.path, chunksize=100_000)
+    benchmark('eda.stream')(stream)
+
+    # 프로세스 풀 병렬 실행, 공유 파일 쓰기 포함 (Process-pool run, writing the shared frame included)
+    def parallel(df):
+        with contextlib.redirect_stdout(io.StringIO()):
+            eda_analysis.run_parallel(df)
+    benchmark('eda.parallel', setup=_eda_frame)(parallel)
+
+
+def measure(setup, fn, ctx, repeat):
+    # 벽시계 시간은 tracemalloc 없이, 최대 메모리는 별도 1회 실행으로 측정
+    # (Wall time is measured without tracemalloc; peak memory comes from one extra traced run)
+    times = []
+    for _ in range(repeat):
+        arg = setup(ctx) if setup else ctx
+        start = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - start)
+
+    arg = setup(ctx) if setup else ctx
+    tracemalloc.start()
+    try:
+        fn(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'seconds': min(times),
+        'mean_seconds': sum(times) / len(times),
+        'peak_mb': round(peak / 2 ** 20, 2),
+        'repeat': repeat,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 / 배치 스크립트 성능 측정 (Benchmark dashboard and batch paths)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--input', help="classification_results 형식 CSV (Classified order CSV)")
+    source.add_argument('--rows', help="합성 데이터 행 수, 예: 100k, 1M, 10M (Generate synthetic data of this size)")
+    parser.add_argument('--output', default=output_path)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', nargs='*', help="이름이 이 접두사로 시작하는 항목만 (Only names with these prefixes)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    _register_eda()
+    work_dir = tempfile.mkdtemp(prefix='eda2-bench-')
+    try:
+        path = args.input
+        if path is None:
+            from classify_pipeline import run_pipeline
+            from generate_synthetic_data import generate, parse_rows
+            raw_path = os.path.join(work_dir, 'preprocessed.csv')
+            generate(parse_rows(args.rows), raw_path, seed=args.seed)
+            path = os.path.join(work_dir, 'classification_results.csv')
+            run_pipeline(pd.read_csv(raw_path), report=False).to_csv(path, index=False)
+
+        ctx = BenchContext(path, work_dir)
+        results = {}
+        for name, (setup, fn) in BENCHMARKS.items():
+            if args.only and not any(name.startswith(prefix) for prefix in args.only):
+                continue
+            results[name] = measure(setup, fn, ctx, args.repeat)
+            print(f"{name:<24} {results[name]['seconds'] * 1000:10.1f} ms  {results[name]['peak_mb']:9.1f} MB")
+
+        report = {
+            'meta': {
+                'input': args.input,
+                'rows': len(ctx.raw),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'machine': platform.machine(),
+            },
+            'results': results,
+        }
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과가 저장되었습니다: {args.output} (Results saved)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import argparse
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from classify_premium import RULES_PATH, classify_premium, premium_columns, print_premium_summary
+from classify_sellers import REGIONAL_SHARE, classify_seller_type, print_seller_summary
+from classify_seller_grades import classify_seller_grade, print_grade_summary
+from data_cache import CACHE_DIR, load_state, store_state
+from ingest import read_orders, read_source, write_with_columns
+from seller_aggregates import (AGGREGATE_COLUMNS, build_seller_aggregates, merge_seller_tables, seller_table,
+                               table_aggregates)
+
+# 데이터 파일 경로 설정 (Set data file path)
+file_path = 'data/project1 - preprocessed_data.csv'
+output_path = 'data/project1 - classification_results.csv'
+
+# 등록된 분류 단계: 이름 -> (분류 함수, 결과 출력 함수)
+# (Registered classification stages: name -> (classify fn, report fn))
+# 분류 함수는 (df, aggregates) 를 받아 {컬럼명: 값} 을 반환하며 df 를 직접 수정하지 않는다.
+# (A classify fn takes (df, aggregates) and returns {column: values} without touching df.)
+STAGES = {}
+
+# 라벨이 셀러 집계만으로 정해지는 단계 (Stages whose labels depend only on the seller's aggregates)
+SELLER_STAGES = set()
+
+# 단계가 셀러 집계 외에 읽는 원본 컬럼, 단계 옵션을 받아 목록 반환 (Source columns a stage reads besides the seller aggregates,
+# as a function of the stage options)
+STAGE_COLUMNS = {}
+
+# 추가 모드의 셀러 누적 상태 이름 (Name of the running seller state used by --append)
+STATE_NAME = 'seller_state'
+
+# 라벨이 바뀐 셀러의 기존 행을 고쳐 쓸 때 한 번에 읽는 행 수 (Rows per chunk when relabelling the stored results)
+RELABEL_CHUNK = 500_000
+
+
+def register_stage(name, classify_fn, report_fn=None, per_seller=False, columns_fn=None):
+    STAGES[name] = (classify_fn, report_fn)
+    if per_seller:
+        SELLER_STAGES.add(name)
+    if columns_fn is not None:
+        STAGE_COLUMNS[name] = columns_fn
+
+
+register_stage('premium', classify_premium, print_premium_summary, columns_fn=premium_columns)
+register_stage('seller_type', classify_seller_type, print_seller_summary, per_seller=True)
+register_stage('seller_grade', classify_seller_grade, print_grade_summary, per_seller=True)
+
+
+def classify_columns(df, aggregates, stages, stage_options=None):
+    # 선택된 단계의 새 컬럼 {컬럼명: 값} (New columns of the selected stages)
+    # 모든 단계는 원본 컬럼만 읽으므로 실행 순서와 무관 (Stages only read source columns, so order does not matter)
+    stage_options = stage_options or {}
+    new_columns = {}
+    for name in stages:
+        classify_fn, _ = STAGES[name]
+        new_columns.update(classify_fn(df, aggregates, **stage_options.get(name, {})))
+    return new_columns
+
+
+def input_columns(stages, stage_options=None):
+    # 선택된 단계가 읽는 원본 컬럼, 이 컬럼만 로드해서 분류 (Source columns the selected stages read; only these are loaded)
+    stage_options = stage_options or {}
+    columns = list(AGGREGATE_COLUMNS)
+    for name in stages:
+        if name in STAGE_COLUMNS:
+            columns += STAGE_COLUMNS[name](**stage_options.get(name, {}))
+    return list(dict.fromkeys(columns))
+
+
+def run_pipeline(df, stages=None, report=True, stage_options=None):
+    # 선택된 단계를 공유 집계 위에서 한 번에 적용 (Apply the selected stages over shared aggregates)
+    # stage_options: 단계별 추가 인자 {이름: kwargs} (Extra keyword arguments per stage)
+    stages = list(STAGES) if stages is None else stages
+    stage_options = stage_options or {}
+    aggregates = build_seller_aggregates(df)
+    new_columns = classify_columns(df, aggregates, stages, stage_options)
+
+    # 기존 분류 컬럼은 교체 (Replace classification columns that already exist)
+    df = df.drop(columns=[c for c in new_columns if c in df.columns]).assign(**new_columns)
+
+    if report:
+        for name in stages:
+            _, report_fn = STAGES[name]
+            if report_fn is not None:
+                report_fn(df, aggregates, **stage_options.get(name, {}))
+    return df
+
+
+def seller_labels(aggregates, stages, stage_options=None):
+    # 셀러 단위 단계를 셀러당 한 행으로 실행한 셀러별 라벨 (Per-seller labels: the seller stages run on one row per seller)
+    stages = [s for s in stages if s in SELLER_STAGES]
+    sellers = pd.DataFrame({'셀러명': aggregates['sellers']})
+    per_seller = dict(aggregates, seller_codes=np.arange(len(sellers)))
+    labels = sellers.assign(**classify_columns(sellers, per_seller, stages, stage_options))
+    return labels.set_index('셀러명')
+
+
+def _state_meta(output_path):
+    # 상태가 가리키는 결과 파일 버전 (The results file version the state belongs to)
+    stat = os.stat(output_path)
+    return {'output': os.path.abspath(output_path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _load_seller_state(output_path, stages, stage_options, cache_dir):
+    # 결과 파일과 맞는 저장 상태를 읽고, 없거나 결과 파일이 바뀌었으면 결과 파일에서 한 번 재구성
+    # (Load the stored state if it matches the results file, else rebuild it once from the results)
+    state, meta = load_state(STATE_NAME, cache_dir)
+    if state is not None and meta.get('file') == _state_meta(output_path):
+        state = state.set_index('셀러명')
+        labels = state[meta['label_columns']]
+        return state.drop(columns=meta['label_columns']), labels
+
+    print(f"셀러 상태 재구성 (Rebuilding the seller state from {output_path})")
+    history = pd.read_csv(output_path, usecols=lambda c: c in AGGREGATE_COLUMNS)
+    table = seller_table(build_seller_aggregates(history))
+    return table, seller_labels(table_aggregates(table, history.iloc[:0]), stages, stage_options)
+
+
+def _rewrite_results(output_path, labels, rows):
+    # 결과 파일을 청크로 읽어 labels 에 있는 셀러 행의 라벨 컬럼만 바꾸고 rows 를 붙인 뒤 교체
+    # (Stream the results file, replace the label columns of the sellers in `labels`, append `rows`, then swap)
+    # 다른 컬럼은 문자열 그대로 옮기므로 원래 표기가 유지됨 (Other columns are copied as text, unchanged)
+    header = pd.read_csv(output_path, nrows=0).columns
+    columns = [c for c in labels.columns if c in header]
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='', suffix='.tmp', delete=False,
+                                     dir=os.path.dirname(os.path.abspath(output_path))) as f:
+        tmp_path = f.name
+        try:
+            pd.DataFrame(columns=header).to_csv(f, index=False)
+            for chunk in pd.read_csv(output_path, dtype=str, keep_default_na=False, chunksize=RELABEL_CHUNK):
+                hit = chunk['셀러명'].isin(labels.index).to_numpy()
+                if hit.any():
+                    chunk = chunk.astype({c: object for c in columns})
+                    chunk.loc[hit, columns] = labels.loc[chunk.loc[hit, '셀러명'], columns].to_numpy()
+                chunk.to_csv(f, header=False, index=False)
+            rows.reindex(columns=header).to_csv(f, header=False, index=False)
+        except BaseException:
+            f.close()
+            os.remove(tmp_path)
+            raise
+    os.replace(tmp_path, output_path)
+
+
+def append_delta(delta, output_path, stages=None, stage_options=None, cache_dir=CACHE_DIR):
+    # 추가 주문만 분류해서 결과 CSV 뒤에 붙임 (Classify only the new orders and append them to the results CSV)
+    #  - 셀러 누적 상태(지역별 건수, 총 건수, 매출)에 추가분만 더함 (the running seller state only adds the delta)
+    #  - 등급 백분위 / 지역셀러 비중은 셀러 단위 상태에서 재계산, 비용은 추가 행 + 셀러 수에 비례
+    #    (grade percentiles and regional shares are recomputed per seller: cost scales with delta rows + sellers)
+    #  - 셀러 라벨이 바뀌면 그 셀러의 기존 행도 현재 라벨로 고쳐 써서 결과는 전체 실행과 같음,
+    #    이때만 결과 파일을 한 번 훑음 (분류는 다시 하지 않음)
+    #    (when a seller's labels change, its stored rows are relabelled too, so the results match a full run;
+    #     only then is the results file streamed once, without re-classifying)
+    stages = list(STAGES) if stages is None else stages
+    table, old_labels = _load_seller_state(output_path, stages, stage_options, cache_dir)
+
+    table = merge_seller_tables(table, seller_table(build_seller_aggregates(delta)))
+    aggregates = table_aggregates(table, delta)
+    labels = seller_labels(aggregates, stages, stage_options)
+
+    # 라벨이 바뀐 셀러, 매 주문마다 움직이는 비중 값은 비교하지 않음
+    # (Sellers whose labels changed; numeric shares move with every order and are not compared)
+    compared = [c for c in labels.columns if c in old_labels.columns and not pd.api.types.is_numeric_dtype(labels[c])]
+    before = old_labels[compared].reindex(labels.index)
+    differs = (labels[compared] != before) & ~(labels[compared].isna() & before.isna())
+    changed = labels.index[differs.any(axis=1) & labels.index.isin(old_labels.index)]
+    new_sellers = labels.index.difference(old_labels.index)
+
+    # 기존 행을 고쳐 써야 하는 셀러, 비중 같은 숫자 컬럼도 포함 (Sellers whose stored rows need relabelling, numeric columns included)
+    previous = old_labels.reindex(index=labels.index, columns=labels.columns)
+    moved = (labels != previous) & ~(labels.isna() & previous.isna())
+    stale = moved.any(axis=1) & labels.index.isin(old_labels.index)
+
+    # 추가 행을 기존 결과 파일의 컬럼 순서로 붙임 (Append the delta rows in the column order of the results file)
+    columns = classify_columns(delta, aggregates, stages, stage_options)
+    rows = delta.drop(columns=[c for c in columns if c in delta.columns]).assign(**columns)
+    if stale.any():
+        _rewrite_results(output_path, labels[stale], rows)
+    else:
+        header = pd.read_csv(output_path, nrows=0).columns
+        rows.reindex(columns=header).to_csv(output_path, mode='a', header=False, index=False)
+
+    state = table.join(labels).reset_index()
+    store_state(STATE_NAME, state, {'file': _state_meta(output_path), 'label_columns': list(labels.columns)},
+                cache_dir)
+    return {'rows': len(delta), 'new_sellers': new_sellers, 'relabelled': int(stale.sum()),
+            'changed': pd.concat({'before': before.loc[changed], 'after': labels.loc[changed, compared]}, axis=1)}
+
+
+def print_append_summary(result):
+    print("\n--- 추가 반영 결과 (Append Results) ---")
+    print(f"추가 행 수 (Appended rows): {result['rows']}")
+    print(f"신규 셀러 수 (New sellers): {len(result['new_sellers'])}")
+    print(f"라벨 변경 셀러 수 (Sellers with changed labels): {len(result['changed'])}")
+    print(f"기존 행을 고쳐 쓴 셀러 수 (Sellers whose stored rows were relabelled): {result['relabelled']}")
+    if len(result['changed']):
+        print(result['changed'].head(10))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프리미엄 / 지역셀러 / 셀러등급 분류를 한 번에 실행 (Run all classifiers in one pass)")
+    parser.add_argument('--input', default=file_path,
+                        help="주문 CSV 또는 파티션 디렉터리 / glob (Order CSV, or a directory / glob of partitions)")
+    parser.add_argument('--output', default=output_path)
+    parser.add_argument('--skip', nargs='*', default=[], choices=list(STAGES), help="건너뛸 단계 (Stages to disable)")
+    parser.add_argument('--only', nargs='*', choices=list(STAGES), help="실행할 단계만 지정 (Run only these stages)")
+    parser.add_argument('--regional-share', type=float, default=REGIONAL_SHARE,
+                        help="지역셀러 판단 비중 (Share threshold for a regional seller)")
+    parser.add_argument('--with-region', action='store_true',
+                        help="셀러별 주력지역 / 주력지역_비중 컬럼 추가 (Add dominant region and share columns)")
+    parser.add_argument('--premium-rules', default=RULES_PATH,
+                        help="프리미엄 규칙 설정 파일 (Premium rule config, JSON)")
+    parser.add_argument('--with-rule', action='store_true',
+                        help="처음 맞은 프리미엄 규칙 이름 컬럼(premium_rule) 추가 (Add the name of the first matching premium rule)")
+    parser.add_argument('--append', metavar='DELTA',
+                        help="추가 주문 CSV 만 분류해서 --output 뒤에 붙임 (Classify a delta CSV and append it to --output)")
+    args = parser.parse_args()
+
+    stages = [s for s in (args.only or STAGES) if s not in args.skip]
+    stage_options = {'premium': {'rules_path': args.premium_rules, 'with_rule': args.with_rule},
+                     'seller_type': {'threshold': args.regional_share, 'with_region': args.with_region}}
+
+    if args.append:
+        try:
+            delta = read_source(args.append)
+        except FileNotFoundError:
+            print(f"파일을 찾을 수 없습니다: {args.append} (File not found)")
+            exit()
+        if not os.path.exists(args.output):
+            print(f"기존 결과 파일이 없습니다, 먼저 전체 실행이 필요합니다: {args.output} (Run the full pipeline first)")
+            exit()
+        print(f"실행 단계 (Stages): {', '.join(stages)}")
+        print_append_summary(append_delta(delta, args.output, stages, stage_options))
+        print(f"\n결과가 추가되었습니다: {args.output} (Results appended)")
+        return
+
+    # 데이터 로드는 한 번만, 단계가 읽는 컬럼만 (Load data once, only the columns the stages read)
+    try:
+        df = read_orders(args.input, usecols=input_columns(stages, stage_options))
+        print("데이터 로드 성공 (Data loaded successfully)")
+    except FileNotFoundError:
+        print(f"파일을 찾을 수 없습니다: {args.input} (File not found)")
+        exit()
+
+    print(f"실행 단계 (Stages): {', '.join(stages)}")
+    classified = run_pipeline(df, stages, stage_options=stage_options)
+    labels = {c: classified[c] for c in classified.columns if c not in df.columns}
+
+    # 결과 저장도 한 번만, 원본의 모든 컬럼을 그대로 옮기고 분류 컬럼은 교체해서 끝에 붙임
+    # (Write once: every source column is copied through; classification columns are replaced and appended)
+    write_with_columns(args.input, args.output, labels, drop=list(labels))
+    print(f"\n결과가 저장되었습니다: {args.output} (Results saved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,49 +1,188 @@
+import json
+import os
+import re
+from functools import lru_cache
 
 import pandas as pd
 import numpy as np
 
+from ingest import read_orders, write_with_columns
+
 # 데이터 파일 경로 설정 (Set data file path)
 file_path = '/Users/ivy/Documents/class/eda2/data/project1 - preprocessed_data.csv'
 output_path = '/Users/ivy/Documents/class/eda2/data/project1 - classification_results.csv'
 
-# 데이터 로드 (Load data)
-try:
-    df = pd.read_csv(file_path)
-    print("데이터 로드 성공 (Data loaded successfully)")
-except FileNotFoundError:
-    print(f"파일을 찾을 수 없습니다: {file_path} (File not found)")
-    exit()
-
-# 프리미엄 여부 초기화 (Initialize premium status)
-df['is_premium'] = '일반'
-
-# 1. 선물세트: 상품 설명에 선물세트/선물용이 명시된 모든 상품
-# (Gift Set: All products with 'Gift Set'/'For Gift' in product description or option)
-gift_mask = (df['상품명'].str.contains('선물세트|선물용', na=False)) | \
-            (df['고객선택옵션'].str.contains('선물세트|선물용', na=False))
-
-# 2. 감귤 계열: 품종이 '감귤'이면서 크기가 '로얄과'인 경우
-# (Tangerine Series: Variety is 'Tangerine' AND Size is 'Royal')
-tangerine_mask = (df['품종'] == '감귤') & (df['과수 크기'] == '로얄과')
-
-# 3. 만감류: 황금향, 한라봉, 레드향, 천혜향 중 크기가 '중과', '중대과', '대과'인 경우
-# (Mangamryu: Variety is one of ['Hwanggeumhyang', 'Hallabong', 'Redhyang', 'Cheonhyehyang'] AND Size is one of ['Medium', 'Medium-Large', 'Large'])
-mangamryu_varieties = ['황금향', '한라봉', '레드향', '천혜향']
-mangamryu_sizes = ['중과', '중대과', '대과']
-mangamryu_mask = (df['품종'].isin(mangamryu_varieties)) & (df['과수 크기'].isin(mangamryu_sizes))
-
-# 조건 적용 (Apply conditions)
-premium_mask = gift_mask | tangerine_mask | mangamryu_mask
-df.loc[premium_mask, 'is_premium'] = '프리미엄'
-
-# 결과 확인 (Verify results)
-print("\n--- 분류 결과 (Classification Results) ---")
-print(df['is_premium'].value_counts())
-
-# 샘플 데이터 출력 (Print sample data for premium items)
-print("\n--- 프리미엄 상품 예시 (Premium Product Examples) ---")
-print(df[df['is_premium'] == '프리미엄'][['상품명', '품종', '과수 크기', 'is_premium']].head())
-
-# 결과 저장 (Save results)
-df.to_csv(output_path, index=False)
-print(f"\n결과가 저장되었습니다: {output_path} (Results saved)")
+
+# 프리미엄 규칙 설정 파일, 위에서부터 처음 맞은 규칙이 기록됨
+# (Premium rule config; rules are checked in order and the first one that matches is reported)
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'premium_rules.json')
+
+# 지원하는 조건 연산자 (Supported condition operators)
+OPERATORS = ('contains', 'equals', 'in')
+
+# 결과 출력에 쓰는 컬럼 (Columns the summary prints)
+REPORT_COLUMNS = ['상품명', '품종', '과수 크기']
+
+
+class PremiumRules:
+    # 설정 파일에서 읽은 규칙을 컴파일한 엔진 (Rule engine compiled from the config file)
+    #  - 행을 참조 컬럼 값 조합(고유 튜플)으로 묶고 규칙은 튜플마다 한 번만 평가
+    #    (rows are factorized to distinct tuples of the referenced columns; rules run once per tuple)
+    #  - 컬럼별 contains 패턴은 하나의 결합 정규식으로 고유값에 한 번 적용
+    #    (per column, all contains patterns are joined into one regex run once over the distinct values)
+    #  - 결과는 튜플 코드로 행에 다시 펼침 (results are broadcast back to rows through the tuple codes)
+    # 조건: {"column", "contains" | "equals" | "in"} 또는 {"any": [...]} / {"all": [...]}
+    # (A condition is a column test or an any / all group; a rule is a named condition)
+
+    def __init__(self, config):
+        self.label = config.get('label', '프리미엄')
+        self.default = config.get('default', '일반')
+        self.rules = config['rules']
+        self.names = np.array([rule['name'] for rule in self.rules], dtype=object)
+        self.columns = []
+        self.patterns = {}
+        for rule in self.rules:
+            self._compile(rule, rule['name'])
+
+    @classmethod
+    def from_file(cls, path=RULES_PATH):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _compile(self, node, rule_name):
+        if 'any' in node or 'all' in node:
+            for child in node.get('any', node.get('all')):
+                self._compile(child, rule_name)
+            return
+        ops = [op for op in OPERATORS if op in node]
+        if 'column' not in node or len(ops) != 1:
+            raise ValueError(f"잘못된 조건 (Invalid condition in rule '{rule_name}'): {node}")
+        if node['column'] not in self.columns:
+            self.columns.append(node['column'])
+        if ops[0] == 'contains':
+            re.compile(node['contains'])
+            patterns = self.patterns.setdefault(node['column'], [])
+            if node['contains'] not in patterns:
+                patterns.append(node['contains'])
+
+    def _tuples(self, df):
+        # 참조 컬럼의 고유 값 조합 코드와 튜플별 컬럼 값 코드 (Tuple code per row, and per-column value codes per tuple)
+        key = np.zeros(len(df), dtype=np.int64)
+        column_codes, uniques = {}, {}
+        for col in self.columns:
+            codes, uniques[col] = pd.factorize(df[col])
+            column_codes[col] = codes
+            key, _ = pd.factorize(key * (len(uniques[col]) + 1) + (codes + 1))
+        n_tuples = int(key.max()) + 1 if len(key) else 0
+        # 튜플마다 처음 나온 행 (First row of each tuple)
+        first = np.empty(n_tuples, dtype=np.int64)
+        first[key[::-1]] = np.arange(len(key))[::-1]
+        return key, n_tuples, {col: column_codes[col][first] for col in self.columns}, uniques
+
+    def _contains(self, col, uniques):
+        # 컬럼 고유값마다 각 패턴의 일치 여부, 결합 정규식에 걸린 값만 개별 패턴 확인
+        # (Per-pattern matches over the distinct values; single patterns only run on values the joined regex hit)
+        patterns = self.patterns.get(col, [])
+        names = pd.Series(uniques, dtype=object)
+        hit = names.str.contains('|'.join(f'(?:{p})' for p in patterns), na=False, regex=True).to_numpy()
+        if len(patterns) == 1:
+            return {patterns[0]: hit}
+        matches = {}
+        for pattern in patterns:
+            match = np.zeros(len(names), dtype=bool)
+            match[hit] = names[hit].str.contains(pattern, na=False, regex=True).to_numpy()
+            matches[pattern] = match
+        return matches
+
+    def _eval(self, node, codes, uniques, contains):
+        # 튜플별 조건 결과 (Condition result per tuple)
+        if 'any' in node:
+            return np.logical_or.reduce([self._eval(c, codes, uniques, contains) for c in node['any']])
+        if 'all' in node:
+            return np.logical_and.reduce([self._eval(c, codes, uniques, contains) for c in node['all']])
+        col = node['column']
+        values = pd.Index(uniques[col])
+        if 'contains' in node:
+            if col not in contains:
+                contains[col] = self._contains(col, values)
+            per_value = contains[col][node['contains']]
+        elif 'equals' in node:
+            per_value = np.asarray(values == node['equals'], dtype=bool)
+        else:
+            per_value = values.isin(node['in'])
+        # 결측(-1)은 어떤 조건에도 맞지 않음 (Missing values (-1) never match)
+        return np.append(per_value, False)[codes[col]]
+
+    def evaluate(self, df):
+        # 행마다 처음 맞은 규칙 번호, 없으면 -1 (Index of the first matching rule per row, -1 when none)
+        row_tuples, n_tuples, codes, uniques = self._tuples(df)
+        fired = np.full(n_tuples, -1)
+        contains = {}
+        for i in range(len(self.rules) - 1, -1, -1):
+            fired[self._eval(self.rules[i], codes, uniques, contains)] = i
+        return fired[row_tuples]
+
+
+@lru_cache(maxsize=8)
+def _load_rules(path, mtime_ns):
+    return PremiumRules.from_file(path)
+
+
+def load_rules(path=RULES_PATH):
+    # 설정 파일이 바뀌면 다시 컴파일 (Recompiled when the config file changes)
+    return _load_rules(os.path.abspath(path), os.stat(path).st_mtime_ns)
+
+
+def premium_columns(rules_path=RULES_PATH, with_rule=False):
+    # 규칙과 결과 출력이 읽는 원본 컬럼, 이 컬럼만 로드 (Source columns the rules and the summary read; the only ones loaded)
+    return list(dict.fromkeys(load_rules(rules_path).columns + REPORT_COLUMNS))
+
+
+def classify_premium(df, aggregates=None, rules_path=RULES_PATH, with_rule=False):
+    # 프리미엄 여부, 어떤 규칙에도 맞지 않으면 '일반' (Premium label; '일반' when no rule matches)
+    # with_rule: 처음 맞은 규칙 이름 컬럼(premium_rule, 없으면 NaN)도 추가, 결과 파일에 컬럼이 하나 늘어남
+    # (with_rule: also add premium_rule, the name of the first matching rule or NaN; one more results column)
+    rules = load_rules(rules_path)
+    fired = rules.evaluate(df)
+    columns = {'is_premium': np.where(fired >= 0, rules.label, rules.default)}
+    if with_rule:
+        columns['premium_rule'] = np.append(rules.names, np.nan)[fired]
+    return columns
+
+
+def print_premium_summary(df, aggregates=None, rules_path=RULES_PATH, with_rule=False):
+    # 결과 확인 (Verify results)
+    print("\n--- 분류 결과 (Classification Results) ---")
+    print(df['is_premium'].value_counts())
+
+    # 규칙별 적용 건수 (Rows per fired rule)
+    if with_rule:
+        print("\n--- 규칙별 프리미엄 건수 (Premium Rows by Rule) ---")
+        print(df['premium_rule'].value_counts())
+
+    # 샘플 데이터 출력, 라벨은 규칙 설정 파일의 값 (Print sample data for premium items; the label comes from the config)
+    print("\n--- 프리미엄 상품 예시 (Premium Product Examples) ---")
+    label = load_rules(rules_path).label
+    print(df[df['is_premium'] == label][['상품명', '품종', '과수 크기', 'is_premium']].head())
+
+
+def main():
+    # 데이터 로드 (Load data)
+    try:
+        df = read_orders(file_path, usecols=premium_columns())
+        print("데이터 로드 성공 (Data loaded successfully)")
+    except FileNotFoundError:
+        print(f"파일을 찾을 수 없습니다: {file_path} (File not found)")
+        exit()
+
+    # 프리미엄 여부 분류 (Classify premium status)
+    labels = classify_premium(df)
+    print_premium_summary(df.assign(**labels))
+
+    # 결과 저장, 원본의 모든 컬럼을 그대로 옮기며 라벨을 붙임 (Save results: every source column copied through, labels attached)
+    write_with_columns(file_path, output_path, labels)
+    print(f"\n결과가 저장되었습니다: {output_path} (Results saved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,107 @@
+import numpy as np
 
-import pandas as pd
+from ingest import read_orders, write_with_columns
+from seller_aggregates import AGGREGATE_COLUMNS, build_seller_aggregates
 
 # 데이터 파일 경로 설정 (Set data file path)
 file_path = '/Users/ivy/Documents/class/eda2/data/project1 - classification_results.csv'
 output_path = '/Users/ivy/Documents/class/eda2/data/project1 - classification_results.csv'
 
-# 데이터 로드 (Load data)
-try:
-    df = pd.read_csv(file_path)
-    print("데이터 로드 성공 (Data loaded successfully)")
-except FileNotFoundError:
-    print(f"파일을 찾을 수 없습니다: {file_path} (File not found)")
-    exit()
-
-# 셀러별 총 판매 건수 계산 (Calculate total sales count per seller)
-seller_counts = df['셀러명'].value_counts()
-
-# 셀러별 지역별 판매 건수 계산 (Calculate sales count per region for each seller)
-seller_region_counts = df.groupby(['셀러명', '광역지역']).size().reset_index(name='count')
-
-# 셀러별 지역 판매 비중 계산 (Calculate regional sales share for each seller)
-seller_region_counts['total_sales'] = seller_region_counts['셀러명'].map(seller_counts)
-seller_region_counts['share'] = seller_region_counts['count'] / seller_region_counts['total_sales']
-
-# 지역 셀러 식별 (Identify Regional Sellers: share >= 0.5)
-regional_sellers = seller_region_counts[seller_region_counts['share'] >= 0.5]['셀러명'].unique()
-
-print(f"\n--- 지역 셀러 분석 결과 (Regional Seller Analysis) ---")
-print(f"총 셀러 수 (Total Sellers): {len(seller_counts)}")
-print(f"지역 셀러 수 (Regional Sellers): {len(regional_sellers)}")
-
-# seller_type 컬럼 추가 (Add seller_type column)
-df['seller_type'] = df['셀러명'].apply(lambda x: '지역셀러' if x in regional_sellers else '일반 셀러')
-
-# 결과 확인 (Verify results)
-print("\n--- 셀러 분류 결과 (Seller Classification Results) ---")
-print(df['seller_type'].value_counts())
-
-# 지역 셀러 예시 출력 (Print examples of Regional Sellers)
-print("\n--- 지역 셀러 예시 (Regional Seller Examples) ---")
-sample_regional_sellers = list(regional_sellers)[:5]
-for seller in sample_regional_sellers:
-    region_info = seller_region_counts[(seller_region_counts['셀러명'] == seller) & (seller_region_counts['share'] >= 0.5)]
-    region = region_info['광역지역'].values[0]
-    share = region_info['share'].values[0]
-    print(f"셀러: {seller}, 주력 지역: {region} (비중: {share:.2f})")
-
-# 결과 저장 (Save results)
-df.to_csv(output_path, index=False)
-print(f"\n결과가 저장되었습니다: {output_path} (Results saved)")
+# 지역 셀러 판단 기준 비중 (Share threshold for a regional seller)
+REGIONAL_SHARE = 0.5
+
+# 셀러 유형 라벨, 인덱스 0 = 일반, 1 = 지역 (seller_type labels indexed by the regional flag)
+SELLER_TYPE_LABELS = np.array(['일반 셀러', '지역셀러'], dtype=object)
+
+
+def dominant_regions(aggregates):
+    # 셀러별 주력 지역 코드와 비중 (Dominant region code and its share per seller)
+    # 비중 행렬은 셀러 x 지역 건수 행렬에서 한 번만 계산 (Share matrix derived once from the count matrix)
+    region_matrix = aggregates['region_matrix']
+    totals = aggregates['seller_totals']
+    if region_matrix.shape[1] == 0:
+        return np.full(len(totals), -1), np.zeros(len(totals))
+
+    share = region_matrix / np.maximum(totals, 1)[:, None]
+    dominant = share.argmax(axis=1)
+    dominant_share = share[np.arange(len(dominant)), dominant]
+    # 지역 정보가 전혀 없는 셀러는 주력 지역 없음 (-1) (Sellers with no known region get -1)
+    dominant = np.where(dominant_share > 0, dominant, -1)
+    return dominant, dominant_share
+
+
+def find_regional_sellers(aggregates, threshold=REGIONAL_SHARE):
+    # 지역 셀러 식별 (Identify Regional Sellers: dominant share >= threshold)
+    _, dominant_share = dominant_regions(aggregates)
+    return aggregates['sellers'][dominant_share >= threshold]
+
+
+def classify_seller_type(df, aggregates, threshold=REGIONAL_SHARE, with_region=False):
+    dominant, dominant_share = dominant_regions(aggregates)
+    is_regional = dominant_share >= threshold
+
+    # 행 단위 판정은 셀러 코드로 조회만 하므로 O(rows) (Row labels are a code lookup, O(rows))
+    codes = aggregates['seller_codes']
+    has_seller = codes >= 0
+    row_flag = np.zeros(len(codes), dtype=np.int8)
+    row_flag[has_seller] = is_regional[codes[has_seller]]
+
+    # seller_type 컬럼 추가 (Add seller_type column)
+    columns = {'seller_type': SELLER_TYPE_LABELS[row_flag]}
+
+    # 다지역 모드: 셀러별 주력 지역과 비중을 함께 기록 (Multi-region mode: dominant region and share per seller)
+    if with_region:
+        regions = np.append(np.asarray(aggregates['regions'], dtype=object), np.nan)
+        seller_region = np.full(len(codes), -1)
+        seller_region[has_seller] = dominant[codes[has_seller]]
+        seller_share = np.full(len(codes), np.nan)
+        seller_share[has_seller] = dominant_share[codes[has_seller]]
+        columns['주력지역'] = regions[seller_region]
+        columns['주력지역_비중'] = seller_share
+    return columns
+
+
+def print_seller_summary(df, aggregates, threshold=REGIONAL_SHARE, with_region=False):
+    seller_counts = aggregates['seller_counts']
+    regional_sellers = find_regional_sellers(aggregates, threshold)
+
+    print(f"\n--- 지역 셀러 분석 결과 (Regional Seller Analysis) ---")
+    print(f"총 셀러 수 (Total Sellers): {len(seller_counts)}")
+    print(f"지역 셀러 수 (Regional Sellers): {len(regional_sellers)}")
+
+    # 결과 확인 (Verify results)
+    print("\n--- 셀러 분류 결과 (Seller Classification Results) ---")
+    print(df['seller_type'].value_counts())
+
+    # 지역 셀러 예시 출력 (Print examples of Regional Sellers)
+    print("\n--- 지역 셀러 예시 (Regional Seller Examples) ---")
+    dominant, dominant_share = dominant_regions(aggregates)
+    regional_codes = np.flatnonzero(dominant_share >= threshold)[:5]
+    for code in regional_codes:
+        seller = aggregates['sellers'][code]
+        region = aggregates['regions'][dominant[code]]
+        share = dominant_share[code]
+        print(f"셀러: {seller}, 주력 지역: {region} (비중: {share:.2f})")
+
+
+def main():
+    # 데이터 로드 (Load data)
+    try:
+        df = read_orders(file_path, usecols=AGGREGATE_COLUMNS)
+        print("데이터 로드 성공 (Data loaded successfully)")
+    except FileNotFoundError:
+        print(f"파일을 찾을 수 없습니다: {file_path} (File not found)")
+        exit()
+
+    # 셀러별 / 셀러-지역별 판매 건수 집계 (Per-seller and per-seller-region sales counts)
+    aggregates = build_seller_aggregates(df)
+    labels = classify_seller_type(df, aggregates)
+    print_seller_summary(df.assign(**labels), aggregates)
+
+    # 결과 저장, 원본의 모든 컬럼을 그대로 옮기며 라벨을 붙임 (Save results: every source column copied through, labels attached)
+    write_with_columns(file_path, output_path, labels)
+    print(f"\n결과가 저장되었습니다: {output_path} (Results saved)")
+
+
+if __name__ == "__main__":
+    main()
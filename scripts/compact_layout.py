@@ -0,0 +1,124 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# 고유값 비율이 이보다 낮은 문자열 컬럼은 사전 인코딩 (String columns below this distinct ratio are dictionary-encoded)
+CATEGORY_MAX_RATIO = 0.5
+
+# 정수 다운캐스트 하한, 컬럼끼리 곱해도 넘치지 않도록 int32 부터
+# (Smallest integer dtype used; int32 keeps column-by-column arithmetic from overflowing)
+MIN_INT_DTYPE = np.int32
+
+
+def _is_text(series):
+    return series.dtype == object or (pd.api.types.is_string_dtype(series.dtype)
+                                      and not isinstance(series.dtype, pd.CategoricalDtype))
+
+
+def to_category(series, max_ratio=CATEGORY_MAX_RATIO):
+    # 반복이 많은 문자열 컬럼만 범주형으로, 리스트 등 해시 불가 값은 그대로
+    # (Only repetitive string columns become categoricals; unhashable values such as lists are left alone)
+    if not _is_text(series) or len(series) == 0:
+        return series
+    try:
+        n_unique = series.nunique(dropna=True)
+    except TypeError:
+        return series
+    if n_unique > len(series) * max_ratio:
+        return series
+    return series.astype('category')
+
+
+def downcast_numeric(series):
+    # 정수 값만 있는 컬럼은 가능한 작은 정수형으로 (Integral columns get the smallest integer dtype that holds them)
+    # 결측이 있거나 소수가 있는 실수는 합계 정밀도를 위해 float64 유지
+    # (Floats with NaN or fractions stay float64 so sums keep full precision)
+    kind = series.dtype.kind
+    if kind not in 'iuf' or len(series) == 0:
+        return series
+    values = series.to_numpy()
+    if kind == 'f':
+        if not np.isfinite(values).all() or (values != np.round(values)).any():
+            return series
+    low, high = values.min(), values.max()
+    for dtype in (MIN_INT_DTYPE, np.int64):
+        limits = np.iinfo(dtype)
+        if limits.min <= low and high <= limits.max:
+            return series.astype(dtype)
+    return series
+
+
+def compact_frame(df, max_ratio=CATEGORY_MAX_RATIO):
+    # 문자열은 사전 인코딩, 숫자는 다운캐스트한 새 프레임 (New frame with dictionary-encoded text and downcast numerics)
+    return pd.DataFrame({col: downcast_numeric(to_category(df[col], max_ratio)) for col in df.columns},
+                        index=df.index)
+
+
+def concat_frames(frames):
+    # 범주형 컬럼은 사전을 합쳐 범주형을 유지한 채 이어 붙임 (pd.concat 은 사전이 다르면 object 로 풀어버림)
+    # (Concatenate keeping categoricals categorical; pd.concat falls back to object when dictionaries differ)
+    frames = [f for f in frames if len(f)] or frames[:1]
+    if len(frames) == 1:
+        return frames[0]
+    # 파티션마다 따로 압축했다면 같은 컬럼이 한쪽만 범주형일 수 있음, 그때는 문자열 쪽도 범주형으로
+    # (Frames compacted separately, e.g. partitions, may disagree; text parts then join the categoricals)
+    dtypes = {}
+    for col in dict.fromkeys(c for f in frames for c in f.columns):
+        parts = [f[col] for f in frames if col in f.columns]
+        categorical = [isinstance(p.dtype, pd.CategoricalDtype) for p in parts]
+        if any(categorical) and all(c or _is_text(p) for c, p in zip(categorical, parts)):
+            parts = [p if c else p.astype('category') for c, p in zip(categorical, parts)]
+            dtypes[col] = pd.CategoricalDtype(union_categoricals(parts, sort_categories=True).categories)
+    if not dtypes:
+        return pd.concat(frames)
+    return pd.concat([f.astype({c: d for c, d in dtypes.items() if c in f.columns}) for f in frames])
+
+
+def _column_table(df, extra):
+    # 컬럼별 dtype 과 상주 바이트 (dtype and resident bytes per column, strings included)
+    # extra: {이름: 바이트} 프레임 밖에 두는 구조 (structures kept outside the frame)
+    table = pd.DataFrame({'dtype': df.dtypes.astype(str), 'bytes': df.memory_usage(deep=True, index=False)})
+    if extra:
+        table = pd.concat([table, pd.DataFrame({'dtype': 'external', 'bytes': pd.Series(extra)})])
+    return table
+
+
+def memory_report(before, after, before_extra=None, after_extra=None):
+    # 컬럼별 변환 전후 바이트와 감소 배율 (Bytes per column before and after, with the reduction factor)
+    left, right = _column_table(before, before_extra), _column_table(after, after_extra)
+    order = list(dict.fromkeys([*left.index, *right.index]))
+    report = left.add_suffix('_before').join(right.add_suffix('_after'), how='outer').reindex(order)
+    report[['bytes_before', 'bytes_after']] = report[['bytes_before', 'bytes_after']].fillna(0).astype(np.int64)
+    report.loc['TOTAL'] = ['', report['bytes_before'].sum(), '', report['bytes_after'].sum()]
+    report['ratio'] = (report['bytes_before'] / report['bytes_after'].replace(0, np.nan)).astype(float).round(1)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 데이터셋 메모리 리포트 (Per-column memory report of the dashboard dataset)")
+    parser.add_argument('--input', default='data/project1 - classification_results.csv')
+    args = parser.parse_args()
+
+    # 앱의 정제 로직을 그대로 사용 (Reuse the app's cleaning)
+    from dashboard_data import build_dataset
+    from ingest import read_orders
+    from keyword_index import KeywordColumn, extract_keywords_column
+
+    before = build_dataset(read_orders(args.input), compact=False)
+    after = compact_frame(before)
+    keywords = KeywordColumn(after['상품명'])
+    # 이전 배치: 행마다 키워드 리스트 (Previous layout: one Python list of keywords per row)
+    before['Keywords'] = extract_keywords_column(before['상품명'])
+
+    report = memory_report(before, after, after_extra={'Keywords': keywords.nbytes})
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(report)
+    total = report.loc['TOTAL']
+    print(f"\n{total['bytes_before'] / 2 ** 20:,.1f} MB -> {total['bytes_after'] / 2 ** 20:,.1f} MB "
+          f"({total['ratio']}x)")
+
+
+if __name__ == "__main__":
+    main()
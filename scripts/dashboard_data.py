@@ -0,0 +1,267 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from compact_layout import compact_frame
+from data_cache import load_bundle, load_cached, load_derived, source_version, store_bundle
+from dataset import Dataset
+from distinct_sketch import DistinctSketch
+from distribution_summary import box_stats, histogram_bins
+from filter_index import INDEXED_COLS, FilterIndex
+from ingest import clean_orders, read_orders
+from keyword_index import KeywordColumn, KeywordIndex
+from retention_index import RetentionIndex
+from rollup_cube import CUBE_DIMS, CUBE_VERSION, build_cube, kpis, merge_cubes, top_by
+from seller_lifecycle import FREQS, ApproxLifecycle, SellerLifecycle
+
+# 대시보드 데이터 계층: 데이터셋 로드, 파생 색인, 요약, 스냅샷 (Streamlit 없이 사용 가능)
+# (Dashboard data layer: dataset loading, derived indexes, summaries and the snapshot; no Streamlit,
+#  shared by app.py and scripts/snapshot.py)
+
+# 정제 코드가 바뀌면 올려서 디스크 캐시를 재생성 (Bump when the cleaning below changes so stale caches are rebuilt)
+CACHE_VERSION = 4
+
+# 원본 CSV 하나, 또는 파티션 디렉터리 / glob (예: 월별 export), 파티션은 병렬로 읽음
+# (One CSV, or a directory / glob of partitions, e.g. one export per month, parsed in parallel)
+DATA_PATH = os.environ.get('DASHBOARD_DATA', 'data/project1 - classification_results.csv')
+
+DATASET_NAME = 'classification_results'
+
+# 고유 개수 모드: 'exact' 또는 'approx' (HyperLogLog, 오차는 DASHBOARD_SKETCH_ERROR)
+# 교차 분석의 구매자 수와 셀러 생애주기 차트에 적용, 재구매율 / 코호트는 항상 정확값
+# (Distinct-count mode, 'exact' or 'approx' with HyperLogLog sketches. It applies to the Drill Down buyer count
+#  and the seller lifecycle chart; repurchase rates need per-pair order counts and cohorts per-seller first periods,
+#  which a distinct-count sketch does not keep, so those stay exact)
+DISTINCT_MODE = os.environ.get('DASHBOARD_DISTINCT', 'exact')
+
+
+def build_dataset(df, compact=True):
+    # 콤마 숫자 / 날짜는 고유값마다 한 번만 파싱, 배치 스크립트와 공유
+    # (Comma numbers and dates are parsed once per distinct value; shared with the batch scripts)
+    df = clean_orders(df)
+
+    valid_sales = df[df['주문-취소 수량'] > 0].copy()
+
+    # 파생 컬럼(RegionGroup, YearMonth)은 저장하지 않음, DERIVED_COLUMNS 참고
+    # (Derived columns are not stored; see DERIVED_COLUMNS)
+    # 키워드도 행마다 저장하지 않음, get_keyword_column 참고 (Keywords neither; see get_keyword_column)
+
+    # 사전 인코딩 텍스트 / 축소된 숫자형 (Dictionary-encoded text and downcast numerics;
+    # python scripts/compact_layout.py prints the savings)
+    return compact_frame(valid_sales) if compact else valid_sales
+
+
+def region_group(df):
+    # 서울 / 비서울, 고유 지역마다 한 번 판정, 결측은 비서울 (Decided once per distinct region; missing is 비서울)
+    codes, uniques = pd.factorize(df['광역지역'])
+    seoul = np.array(['서울' in str(x) for x in uniques] + [False])
+    return pd.Series(pd.Categorical.from_codes(seoul[codes].astype(np.int8), categories=['비서울', '서울']),
+                     index=df.index)
+
+
+def year_month(df):
+    # 주문일의 'YYYY-MM', 고유 월마다 한 번 포맷, 결측은 'NaT' (Formatted once per distinct month; 'NaT' when missing)
+    codes, uniques = pd.factorize(df['주문일'].to_numpy().astype('datetime64[M]'), sort=True)
+    labels = pd.DatetimeIndex(uniques).strftime('%Y-%m').append(pd.Index(['NaT']))
+    return pd.Series(pd.Categorical.from_codes(np.where(codes < 0, len(uniques), codes), categories=labels),
+                     index=df.index)
+
+
+# 뷰가 처음 요청할 때 계산하는 컬럼: 이름 -> (입력 컬럼, fn(frame))
+# (Columns computed from stored ones the first time a view asks for them: name -> (inputs, fn(frame)))
+DERIVED_COLUMNS = {
+    'RegionGroup': (['광역지역'], region_group),
+    'YearMonth': (['주문일'], year_month),
+}
+
+
+def build_full_dataset():
+    # 정제 결과는 Arrow 캐시로 보관, 원본이 바뀔 때만 재생성 (Cleaned frame is cached on disk, rebuilt on source change)
+    # 컬럼은 페이지 / 색인이 필요로 할 때만 메모리 맵에서 변환 (Columns are converted only when something needs them)
+    return Dataset(load_cached(DATA_PATH, build_dataset, name=DATASET_NAME,
+                               version=CACHE_VERSION, read_fn=read_orders, lazy=True), DERIVED_COLUMNS)
+
+
+def current_version():
+    # 원본을 읽지 않고 확인한 현재 데이터셋 버전, 캐시가 원본과 다르면 None
+    # (Current dataset version without reading the source; None when the cache does not match it)
+    return source_version(DATA_PATH, DATASET_NAME)
+
+
+# 데이터셋에서 파생된 색인, 데이터셋마다 한 번 만들어 공유, 각각 나열한 컬럼만 읽음
+# (Indexes derived from the dataset are built once and shared with it; each reads only the columns it lists)
+def get_keyword_column(ds):
+    return ds.derived('keywords', lambda df: KeywordColumn(df['상품명']), columns=['상품명'])
+
+
+def get_keyword_index(ds):
+    return ds.derived('keyword_index', lambda df: KeywordIndex(df, keywords=get_keyword_column(ds)),
+                      columns=['상품명', '실결제 금액', '판매단가'])
+
+
+def get_filter_index(ds):
+    return ds.derived('filter_index', FilterIndex, columns=INDEXED_COLS)
+
+
+def get_retention_index(ds):
+    # (UID, 셀러) 쌍 개수, scripts/eda_analysis.py (H4) 와 공유 ((UID, seller) pair counts, shared with eda H4)
+    return ds.derived('retention_index', lambda df: RetentionIndex(df['UID'], df['셀러명']), columns=['UID', '셀러명'])
+
+
+def get_seller_lifecycle(ds, freq):
+    # 셀러 x 기간 활동 비트맵, 단위별 하나 (Seller x period activity bitmap, one per granularity)
+    return ds.derived(f'seller_lifecycle.{freq}', lambda df: SellerLifecycle.from_orders(df, freq),
+                      columns=['주문일', '셀러명'])
+
+
+def get_approx_lifecycle(ds, freq):
+    # 기간별 셀러 스케치, 단위별 하나 (Per-period seller sketches, one per granularity)
+    return ds.derived(f'approx_lifecycle.{freq}', lambda df: ApproxLifecycle.from_orders(df, freq),
+                      columns=['주문일', '셀러명'])
+
+
+PRICE_BINS = 50
+
+
+def get_price_histogram(ds):
+    # 서버에서 구간화, 차트는 주문 전체 대신 PRICE_BINS 개 막대만 전달
+    # (Binned on the server so the figure carries PRICE_BINS bars instead of every order)
+    return ds.derived('price_histogram', lambda df: histogram_bins(df['판매단가'], nbins=PRICE_BINS),
+                      columns=['판매단가'])
+
+
+def get_price_box(ds):
+    # 목적별 사분위 / 울타리와 제한된 이상치 표본 (Quartiles / whiskers per 목적 plus a bounded outlier sample)
+    return ds.derived('price_box', lambda df: box_stats(df, '목적', '판매단가'), columns=['목적', '판매단가'])
+
+
+# 셀러 x 월 x 지역별 구매자 HyperLogLog 스케치의 차원 (Dimensions of the per-group buyer sketches)
+SKETCH_DIMS = ['셀러명', 'YearMonth', '광역지역']
+
+
+def get_buyer_sketch(ds):
+    # 데이터셋마다 한 번 생성, 필터 조합은 해당 그룹들의 레지스터 병합
+    # (Built once per dataset; any filter combination is a register-wise merge of its groups)
+    return ds.derived('buyer_sketch', lambda df: DistinctSketch.build(df, SKETCH_DIMS, 'UID'),
+                      columns=SKETCH_DIMS + ['UID'])
+
+
+def get_uid_codes(ds):
+    # UID 정수 코드, 정확한 고유 개수는 선택 행의 bincount (UID codes; exact distinct counts are a bincount)
+    return ds.derived('uid_codes', lambda df: pd.factorize(df['UID'])[0], columns=['UID'])
+
+
+# 롤업 큐브 입력 컬럼: 차원과 측정값 입력 (Columns the rollup cube is built from: its dimensions and measure inputs)
+CUBE_COLUMNS = CUBE_DIMS + ['실결제 금액', '주문-취소 수량', '판매단가']
+
+
+def get_rollup_cube(ds):
+    # 데이터 캐시 옆에 보관, 추가된 행만 병합 (Persisted next to the data cache; appended rows are folded in)
+    # 데이터셋 자체를 넘겨 저장된 큐브는 컬럼을 읽지 않고 제공, CACHE_VERSION / CUBE_VERSION 이 바뀌면 재생성
+    # (The dataset itself is handed over so a stored cube is served without reading any column;
+    #  it is rebuilt when CACHE_VERSION or CUBE_VERSION changes)
+    return ds.derived('rollup_cube', lambda df: load_derived(ds, f'{DATASET_NAME}.cube', build_cube,
+                                                             merge_cubes, columns=CUBE_COLUMNS,
+                                                             version=CUBE_VERSION), columns=[])
+
+
+# 상세 탭의 계산 경로 (Computation paths of the detail tabs, benchmarked in scripts/benchmark.py)
+def event_split(df):
+    return df.groupby('이벤트 여부', observed=True)[['실결제 금액']].sum().reset_index()
+
+
+# 재구매율 순위에 필요한 셀러별 최소 구매자 수 (Minimum distinct buyers for a seller to be ranked by repurchase rate)
+RETENTION_MIN_BUYERS = 10
+
+
+def retention_table(retention, min_buyers=RETENTION_MIN_BUYERS):
+    retention_df = retention.top(min_buyers, n=10).rename(
+        columns={'Buyers': '총 구매자 수', 'RepeatBuyers': '재구매자 수', 'RepurchaseRate': '재구매율(%)'})
+    retention_df['재구매율(%)'] = retention_df['재구매율(%)'].round(1)
+    return retention_df
+
+
+def lifecycle_table(lifecycle):
+    stats = lifecycle.summary().rename(columns={'Active': '활동', 'New': '신규', 'Churned': '이탈',
+                                                'Retained': '유지', 'Reactivated': '복귀'})
+    stats['Period'] = stats['Period'].astype(str)
+    return stats
+
+
+def lifecycle_summary(ds, freq):
+    if DISTINCT_MODE == 'approx':
+        return lifecycle_table(get_approx_lifecycle(ds, freq))
+    return lifecycle_table(get_seller_lifecycle(ds, freq))
+
+
+def cohort_table(lifecycle):
+    # 문자열 라벨: 범주로 그려지고 스냅샷에 저장 가능 (String labels: plotted as categories and storable in the
+    # snapshot, since Arrow needs string column names)
+    cohort = lifecycle.cohort_matrix()
+    cohort.index = cohort.index.astype(str)
+    cohort.columns = cohort.columns.astype(str)
+    return cohort
+
+
+def region_weight_share(df):
+    cross = pd.crosstab(df['무게 구분'], df['RegionGroup'], normalize='columns').reset_index()
+    cross = pd.melt(cross, id_vars='무게 구분', var_name='지역', value_name='비율')
+    cross['비율'] = cross['비율'] * 100
+    return cross
+
+
+# 홈 / 상세 탭의 요약: 이름 -> (필요 컬럼, build(ds)), 스냅샷이 최신이면 스냅샷에서 읽음
+# (Summaries behind the home page and the detail tabs: name -> (required columns, build(ds));
+#  read from the snapshot when it is current, else built from the dataset)
+SUMMARIES = {
+    'kpis': ([], lambda ds: pd.DataFrame([kpis(get_rollup_cube(ds))])),
+    'top_sellers': (['셀러명'], lambda ds: top_by(get_rollup_cube(ds), '셀러명', n=5)),
+    'top_products': (['상품명'], lambda ds: top_by(get_rollup_cube(ds), '상품명', n=5)),
+    'keywords_count': (['상품명'], lambda ds: get_keyword_index(ds).top(20, by='Count')),
+    'keywords_revenue': (['상품명'], lambda ds: get_keyword_index(ds).top(20, by='Revenue')),
+    'price_histogram': (['판매단가'], get_price_histogram),
+    'price_box': (['목적', '판매단가'], lambda ds: get_price_box(ds)[0]),
+    'price_outliers': (['목적', '판매단가'], lambda ds: get_price_box(ds)[1]),
+    'event_split': (['이벤트 여부'], lambda ds: event_split(ds.view(['이벤트 여부', '실결제 금액']))),
+    'retention': (['셀러명', 'UID'], lambda ds: retention_table(get_retention_index(ds))),
+    'region_weight': (['RegionGroup', '무게 구분'], lambda ds: region_weight_share(ds.view(['무게 구분', 'RegionGroup']))),
+}
+for _freq in FREQS:
+    SUMMARIES[f'lifecycle.{_freq}'] = (['주문일', '셀러명'], lambda ds, f=_freq: lifecycle_summary(ds, f))
+    SUMMARIES[f'cohort.{_freq}'] = (['주문일', '셀러명'], lambda ds, f=_freq: cohort_table(get_seller_lifecycle(ds, f)))
+
+
+# 주문 행을 읽지 않고 홈 / 상세 탭을 그리는 요약 묶음 (Aggregate bundle that lets home and the detail tabs
+# render without loading the order rows; python scripts/snapshot.py, refreshed by the app's warm-up)
+SNAPSHOT_NAME = f'{DATASET_NAME}.snapshot'
+
+# build_snapshot 이나 요약 계산이 바뀌면 올려서 저장된 스냅샷을 재생성
+# (Bump when build_snapshot or a summary's build changes so stored snapshots are rebuilt)
+SNAPSHOT_VERSION = 2
+
+
+def snapshot_key(dataset_version):
+    # 같은 데이터, 정제 코드, 요약 정의일 때만 저장된 스냅샷 사용
+    # (A stored snapshot is served only for the same data, cleaning code and summary definitions)
+    return {'dataset_version': dataset_version, 'cache_version': CACHE_VERSION,
+            'snapshot_version': SNAPSHOT_VERSION, 'summaries': sorted(SUMMARIES), 'distinct_mode': DISTINCT_MODE}
+
+
+def build_snapshot(ds):
+    return {name: build(ds) for name, (columns, build) in SUMMARIES.items() if all(c in ds.columns for c in columns)}
+
+
+def write_snapshot(ds):
+    frames = build_snapshot(ds)
+    store_bundle(SNAPSHOT_NAME, frames, snapshot_key(ds.version))
+    return frames
+
+
+def load_snapshot(dataset_version=None):
+    # 해당 버전의 스냅샷 {이름: 프레임}, 없으면 None; dataset_version 이 None 이면 데이터 버전과 무관하게 마지막 스냅샷
+    # (The snapshot of that version, None when missing; with None, the last stored one whatever data it was built from)
+    match = snapshot_key(dataset_version)
+    if dataset_version is None:
+        del match['dataset_version']
+    return load_bundle(SNAPSHOT_NAME, match=match)
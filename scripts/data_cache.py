@@ -0,0 +1,427 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from compact_layout import concat_frames
+from ingest import is_partitioned, read_partitions, source_signature
+
+# 캐시 디렉터리 기본값 (Default cache directory, next to the data files)
+CACHE_DIR = 'data/.cache'
+
+# 해시 계산 시 한 번에 읽는 바이트 수 (Block size for content hashing)
+_HASH_BLOCK = 1 << 20
+
+# 보관하는 이전 버전 수 (How many earlier dataset versions the lineage keeps)
+_LINEAGE_DEPTH = 20
+
+
+def _cache_paths(cache_dir, name):
+    # 캐시 데이터 파일과 매니페스트 경로 (Paths of the cached frame and its manifest)
+    return (os.path.join(cache_dir, f'{name}.arrow'),
+            os.path.join(cache_dir, f'{name}.manifest.json'))
+
+
+def _read_manifest(manifest_path):
+    # 매니페스트 로드, 없거나 깨졌으면 None (Load manifest; None when missing or corrupt)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, write_fn):
+    # 임시 파일에 쓴 뒤 교체하여 반쯤 쓰인 캐시를 방지 (Write to a temp file then swap it in)
+    # 임시 파일 이름은 쓰는 쪽마다 달라서 동시에 써도 서로의 파일을 덮지 않음
+    # (Each writer gets its own temp name, so concurrent writers never clobber each other's file)
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or '.', prefix=f'{os.path.basename(path)}.',
+                                     suffix='.tmp', delete=False) as f:
+        tmp_path = f.name
+    try:
+        write_fn(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _hash_source(path, prefix_size=None):
+    # 전체 내용 해시와 (선택적으로) 앞부분 prefix_size 바이트의 해시를 한 번에 계산
+    # (Hash the whole file, and optionally its first prefix_size bytes, in one pass)
+    full = hashlib.sha256()
+    prefix_digest = None
+    read = 0
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(_HASH_BLOCK)
+            if not block:
+                break
+            if prefix_size is not None and prefix_digest is None and read + len(block) >= prefix_size:
+                cut = prefix_size - read
+                full.update(block[:cut])
+                prefix_digest = full.hexdigest()
+                full.update(block[cut:])
+            else:
+                full.update(block)
+            read += len(block)
+    return full.hexdigest(), prefix_digest
+
+
+def _read_header(path):
+    # CSV 헤더 한 줄 (The CSV header line, used to parse an appended tail on its own)
+    with open(path, 'rb') as f:
+        return f.readline()
+
+
+def _ends_with_newline(path, size):
+    # 파일이 줄바꿈으로 끝나는지 (Whether the file ends on a record boundary)
+    if size == 0:
+        return False
+    with open(path, 'rb') as f:
+        f.seek(size - 1)
+        return f.read(1) == b'\n'
+
+
+def _read_table(data_path):
+    # 메모리 맵으로 캐시 로드, 버퍼는 파일을 그대로 참조 (Memory-map the Arrow IPC cache; buffers point into the file)
+    with pa.memory_map(data_path, 'r') as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def _read_frame(data_path):
+    return _read_table(data_path).to_pandas()
+
+
+class ArrowColumns:
+    # 메모리 맵 Arrow 캐시를 컬럼 단위로 읽는 저장소 (Column store over the memory-mapped Arrow cache)
+    #  - 프레임처럼 columns / attrs / len / store[[...]] 제공 (frame-like: columns, attrs, len, store[[...]])
+    #  - 요청한 컬럼만 pandas 로 변환, 나머지는 페이지 캐시에만 존재
+    #    (only requested columns are converted to pandas; the rest stay in the page cache)
+
+    def __init__(self, table):
+        self.table = table
+        # 저장된 pandas 인덱스 컬럼은 항상 함께 읽음 (The stored pandas index is read with every selection)
+        metadata = table.schema.pandas_metadata or {}
+        self._index = [c for c in metadata.get('index_columns', []) if isinstance(c, str)]
+        self.columns = pd.Index([c for c in table.column_names if c not in self._index])
+        self.attrs = {}
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def __getitem__(self, columns):
+        return self.table.select(list(columns) + self._index).to_pandas()
+
+
+def _write_frame(data_path, df):
+    # 압축 없이 저장해야 메모리 맵 로드가 가능 (Uncompressed so it can be memory-mapped)
+    _write_atomic(data_path, lambda p: feather.write_feather(df, p, compression='uncompressed'))
+
+
+def _write_manifest(manifest_path, manifest):
+    def write(p):
+        with open(p, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    _write_atomic(manifest_path, write)
+
+
+def _load_incremental(source_path, build_fn, read_fn, stat, manifest, data_path, manifest_path, version, lazy):
+    # 기존 캐시로 응답 가능하면 결과를, 아니면 None 반환 (Serve from the cache when possible, else None)
+    read = (lambda path: ArrowColumns(_read_table(path))) if lazy else _read_frame
+    # 1) 크기와 mtime 이 같으면 바로 사용 (Same size and mtime: trust the cache)
+    if manifest['size'] == stat.st_size and manifest['mtime_ns'] == stat.st_mtime_ns:
+        return _tag(read(data_path), manifest)
+
+    # 2) 내용이 같으면 mtime 만 갱신 (Touched but unchanged: refresh mtime only)
+    if manifest['size'] == stat.st_size:
+        digest, _ = _hash_source(source_path)
+        if digest == manifest['sha256']:
+            manifest['mtime_ns'] = stat.st_mtime_ns
+            _write_manifest(manifest_path, manifest)
+            return _tag(read(data_path), manifest)
+
+    # 3) 기존 내용 뒤에 행만 추가된 경우 추가분만 처리 (Append-only change: rebuild the tail only)
+    elif manifest['size'] < stat.st_size and manifest.get('ends_with_newline'):
+        digest, prefix_digest = _hash_source(source_path, prefix_size=manifest['size'])
+        if prefix_digest == manifest['sha256']:
+            with open(source_path, 'rb') as f:
+                f.seek(manifest['size'])
+                tail = f.read()
+            raw = read_fn(io.BytesIO(_read_header(source_path) + tail))
+            # 원본 행 번호가 이어지도록 인덱스 보정 (Keep the original row numbering)
+            raw.index = raw.index + manifest['raw_rows']
+            delta = build_fn(raw)
+            cached = _read_frame(data_path)
+            # 범주형 사전은 합쳐서 유지 (Categorical dictionaries are unioned, not expanded to object)
+            df = concat_frames([cached, delta])
+            new_manifest = _store(data_path, manifest_path, df, source_path, stat, digest, version,
+                                  manifest['raw_rows'] + len(raw), manifest.get('lineage', []))
+            return _tag(df, new_manifest)
+    return None
+
+
+def load_cached(source_path, build_fn, name, version=1, cache_dir=CACHE_DIR, read_fn=pd.read_csv, lazy=False):
+    # 원본 CSV 를 정제한 결과(build_fn(read_fn(source_path)))를 Arrow 캐시로 보관하고 재사용
+    # (Cache the cleaned frame; invalidated by source size, mtime, content hash and `version`.
+    #  When rows were only appended to the source, only the appended tail is rebuilt.)
+    # lazy: 캐시가 유효하면 프레임 대신 ArrowColumns 반환, 재생성한 경우는 메모리의 프레임 그대로
+    # (lazy: return an ArrowColumns store when the cache is valid; a rebuilt frame is returned as is)
+    # source_path 가 디렉터리 / glob 이면 파티션 단위로 처리 (A partition directory or glob goes through _load_partitions)
+    if is_partitioned(source_path):
+        return _load_partitions(source_path, build_fn, name, version, cache_dir, read_fn, lazy)
+    stat = os.stat(source_path)
+    data_path, manifest_path = _cache_paths(cache_dir, name)
+    manifest = _read_manifest(manifest_path)
+    usable = (manifest is not None and manifest.get('version') == version
+              and manifest.get('source') == os.path.abspath(source_path)
+              and os.path.exists(data_path))
+
+    if usable:
+        try:
+            df = _load_incremental(source_path, build_fn, read_fn, stat, manifest,
+                                   data_path, manifest_path, version, lazy)
+            if df is not None:
+                return df
+        except (OSError, pa.ArrowException) as e:
+            # 깨진 캐시는 전체 재생성으로 복구 (Recover from a corrupt cache with a full rebuild)
+            print(f"캐시 로드 실패, 재생성합니다 (Cache load failed, rebuilding): {e}")
+
+    # 4) 전체 재생성 (Full rebuild)
+    digest, _ = _hash_source(source_path)
+    raw = read_fn(source_path)
+    df = build_fn(raw)
+    return _tag(df, _store(data_path, manifest_path, df, source_path, stat, digest, version, len(raw)))
+
+
+def _partition_entries(source_path, known=()):
+    # 파티션별 [경로, 크기, mtime, sha256], 크기와 mtime 이 같은 파일은 이전 해시 재사용
+    # ([path, size, mtime_ns, sha256] per partition; files with an unchanged size and mtime keep their hash)
+    digests = {tuple(entry[:3]): entry[3] for entry in known}
+    return [key + [digests.get(tuple(key)) or _hash_source(key[0])[0]] for key in source_signature(source_path)]
+
+
+def _load_partitions(source_path, build_fn, name, version, cache_dir, read_fn, lazy):
+    # 파티션 묶음용 load_cached: 파티션마다 병렬로 정제하고, 뒤에 파티션만 추가됐으면 새 파티션만 처리
+    # (load_cached for a partition set: partitions are cleaned in parallel; when partitions were only
+    #  added after the cached ones, e.g. a new month, only the new files are read)
+    data_path, manifest_path = _cache_paths(cache_dir, name)
+    manifest = _read_manifest(manifest_path)
+    usable = (manifest is not None and manifest.get('version') == version
+              and manifest.get('source') == os.path.abspath(source_path)
+              and 'partitions' in manifest and os.path.exists(data_path))
+    cached = manifest['partitions'] if usable else []
+    entries = _partition_entries(source_path, cached)
+    if not entries:
+        raise FileNotFoundError(f"파티션 파일이 없습니다 (No partition files): {source_path}")
+    files = [entry[0] for entry in entries]
+    digests, cached_digests = [entry[3] for entry in entries], [entry[3] for entry in cached]
+
+    if usable:
+        try:
+            # 1) 내용이 같으면 캐시 사용, 바뀐 mtime 만 기록 (Same contents: serve the cache, record new mtimes)
+            if digests == cached_digests:
+                if entries != cached:
+                    manifest['partitions'] = entries
+                    _write_manifest(manifest_path, manifest)
+                read = (lambda path: ArrowColumns(_read_table(path))) if lazy else _read_frame
+                return _tag(read(data_path), manifest)
+            # 2) 기존 파티션 뒤에 새 파티션만 추가 (New partitions after the unchanged ones)
+            if digests[:len(cached)] == cached_digests:
+                delta, raw_rows = read_partitions(files[len(cached):], read_fn, build_fn)
+                # 원본 행 번호가 이어지도록 인덱스 보정 (Keep the original row numbering)
+                delta.index = delta.index + manifest['raw_rows']
+                df = concat_frames([_read_frame(data_path), delta])
+                return _tag(df, _store_partitions(data_path, manifest_path, df, source_path, entries, version,
+                                                  manifest['raw_rows'] + sum(raw_rows), manifest.get('lineage', [])))
+        except (OSError, pa.ArrowException) as e:
+            print(f"캐시 로드 실패, 재생성합니다 (Cache load failed, rebuilding): {e}")
+
+    # 3) 전체 재생성 (Full rebuild)
+    df, raw_rows = read_partitions(files, read_fn, build_fn)
+    return _tag(df, _store_partitions(data_path, manifest_path, df, source_path, entries, version, sum(raw_rows)))
+
+
+def _store_partitions(data_path, manifest_path, df, source_path, entries, version, raw_rows, parent_lineage=()):
+    # 데이터셋 버전 = 파티션 해시들의 해시 (Dataset version = hash of the partition hashes, in file order)
+    digest = hashlib.sha256(''.join(entry[3] for entry in entries).encode()).hexdigest()
+    manifest = {
+        'source': os.path.abspath(source_path),
+        'version': version,
+        'partitions': entries,
+        'sha256': digest,
+        'raw_rows': raw_rows,
+        'lineage': (list(parent_lineage) + [[digest, len(df)]])[-_LINEAGE_DEPTH:],
+    }
+    return _write_cache(data_path, manifest_path, df, manifest)
+
+
+def _tag(df, manifest):
+    # 데이터셋 버전과 계보를 프레임에 기록 (Record the dataset version and lineage on the frame)
+    # lineage: [(버전, 행 수), ...] 이전 버전은 현재 프레임의 앞부분 행과 같음
+    # (earlier versions are a row prefix of the current frame; used by load_derived)
+    df.attrs['dataset_version'] = manifest['sha256']
+    # 정제 코드 버전, 파생 캐시도 이 값이 바뀌면 재생성 (Cleaning version; derived caches are rebuilt when it changes)
+    df.attrs['cache_version'] = manifest['version']
+    df.attrs['dataset_lineage'] = [tuple(item) for item in manifest.get('lineage', [])]
+    return df
+
+
+def _store(data_path, manifest_path, df, source_path, stat, digest, version, raw_rows, parent_lineage=()):
+    manifest = {
+        'source': os.path.abspath(source_path),
+        'version': version,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': digest,
+        'raw_rows': raw_rows,
+        'ends_with_newline': _ends_with_newline(source_path, stat.st_size),
+        'lineage': (list(parent_lineage) + [[digest, len(df)]])[-_LINEAGE_DEPTH:],
+    }
+    return _write_cache(data_path, manifest_path, df, manifest)
+
+
+def _write_cache(data_path, manifest_path, df, manifest):
+    # 캐시 쓰기 실패는 치명적이지 않으므로 무시 (A failed cache write only costs the next start)
+    try:
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        _write_frame(data_path, df)
+        _write_manifest(manifest_path, manifest)
+    except (OSError, pa.ArrowException) as e:
+        print(f"캐시 저장 실패 (Cache write failed): {e}")
+    return manifest
+
+
+def load_derived(df, name, build_fn, merge_fn=None, cache_dir=CACHE_DIR, columns=None, version=1):
+    # load_cached 로 읽은 데이터셋에서 파생된 프레임(집계 등)을 캐시 옆에 보관
+    # (Persist a frame derived from a load_cached dataset, e.g. a rollup, next to the data cache.)
+    # 데이터셋 버전, 정제 버전(cache_version), build_fn 의 버전(version) 이 모두 같을 때만 재사용
+    # (Reused only when the dataset version, the cleaning version and this artifact's `version` all match;
+    #  bump `version` when build_fn / merge_fn change)
+    # 캐시된 파생 결과가 이전 버전 것이고 merge_fn 이 있으면 추가된 행만 build_fn 후 병합
+    # (If the stored result belongs to an earlier version in the lineage and merge_fn is given,
+    #  only the appended rows are built and merged into it.)
+    # df 가 Dataset 이면 캐시가 맞지 않을 때만 columns 를 읽음 (A Dataset is only read, projected to `columns`, on a miss)
+    frame = (lambda: df.view(columns)) if hasattr(df, 'view') else (lambda: df)
+    dataset_version = df.attrs.get('dataset_version')
+    if dataset_version is None:
+        return build_fn(frame())
+
+    data_path, manifest_path = _cache_paths(cache_dir, name)
+    manifest = _read_manifest(manifest_path)
+    build_key = {'cache_version': df.attrs.get('cache_version'), 'version': version}
+    prefix_rows = dict(df.attrs.get('dataset_lineage', []))
+    result = None
+    try:
+        if (manifest is not None and os.path.exists(data_path)
+                and all(manifest.get(k) == v for k, v in build_key.items())):
+            if manifest['dataset_version'] == dataset_version:
+                return _read_frame(data_path)
+            if merge_fn is not None and manifest['dataset_version'] in prefix_rows:
+                delta = frame().iloc[prefix_rows[manifest['dataset_version']]:]
+                result = merge_fn(_read_frame(data_path), build_fn(delta))
+    except (OSError, KeyError, pa.ArrowException) as e:
+        print(f"캐시 로드 실패, 재생성합니다 (Cache load failed, rebuilding): {e}")
+    if result is None:
+        result = build_fn(frame())
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _write_frame(data_path, result)
+        _write_manifest(manifest_path, dict(build_key, dataset_version=dataset_version))
+    except (OSError, pa.ArrowException) as e:
+        print(f"캐시 저장 실패 (Cache write failed): {e}")
+    return result
+
+
+def store_state(name, df, meta, cache_dir=CACHE_DIR):
+    # 배치 스크립트의 누적 상태 프레임과 메타데이터 저장 (Persist a batch script's running state frame and its metadata)
+    data_path, manifest_path = _cache_paths(cache_dir, name)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _write_frame(data_path, df)
+        _write_manifest(manifest_path, meta)
+    except (OSError, pa.ArrowException) as e:
+        print(f"캐시 저장 실패 (Cache write failed): {e}")
+
+
+def load_state(name, cache_dir=CACHE_DIR):
+    # store_state 로 저장한 (프레임, 메타데이터), 없거나 깨졌으면 (None, None)
+    # (The (frame, metadata) saved by store_state; (None, None) when missing or corrupt)
+    data_path, manifest_path = _cache_paths(cache_dir, name)
+    meta = _read_manifest(manifest_path)
+    if meta is None or not os.path.exists(data_path):
+        return None, None
+    try:
+        return _read_frame(data_path), meta
+    except (OSError, pa.ArrowException) as e:
+        print(f"캐시 로드 실패, 재생성합니다 (Cache load failed, rebuilding): {e}")
+        return None, None
+
+
+def source_version(source_path, name, cache_dir=CACHE_DIR):
+    # 원본을 읽지 않고 현재 데이터셋 버전 확인, 캐시가 원본과 맞지 않으면 None
+    # (Current dataset version without reading the source; None unless the cache matches it)
+    manifest = _read_manifest(_cache_paths(cache_dir, name)[1])
+    if is_partitioned(source_path):
+        try:
+            signature = source_signature(source_path)
+        except OSError:
+            return None
+        if (manifest is None or manifest.get('source') != os.path.abspath(source_path)
+                or [entry[:3] for entry in manifest.get('partitions', [])] != signature):
+            return None
+        return manifest['sha256']
+    try:
+        stat = os.stat(source_path)
+    except OSError:
+        return None
+    if (manifest is None or manifest.get('source') != os.path.abspath(source_path)
+            or manifest.get('size') != stat.st_size or manifest.get('mtime_ns') != stat.st_mtime_ns):
+        return None
+    return manifest['sha256']
+
+
+def store_bundle(name, frames, meta, cache_dir=CACHE_DIR):
+    # 작은 프레임 묶음(스냅샷 등)을 항목별 Arrow 파일과 매니페스트로 저장
+    # (Persist a bundle of small frames, e.g. a snapshot, as one Arrow file per item plus a manifest)
+    # 항목 파일은 저장마다 새 이름으로 쓰고 매니페스트를 마지막에 교체하므로, 읽는 쪽은 항상 한 번의 저장 결과만 봄
+    # (Items are written under names unique to this store and the manifest is swapped in last, so a reader
+    #  never mixes items of two stores); 이전 매니페스트의 항목 파일은 교체 후 삭제 (the previous items are removed after)
+    bundle_dir = os.path.join(cache_dir, name)
+    manifest_path = os.path.join(bundle_dir, 'manifest.json')
+    store_id = uuid.uuid4().hex[:12]
+    try:
+        os.makedirs(bundle_dir, exist_ok=True)
+        previous = _read_manifest(manifest_path) or {}
+        files = {}
+        for key, df in frames.items():
+            files[key] = f'{key}.{store_id}.arrow'
+            _write_frame(os.path.join(bundle_dir, files[key]), df)
+        _write_manifest(manifest_path, dict(meta, items=list(frames), files=files))
+        for stale in set(previous.get('files', {}).values()) - set(files.values()):
+            if os.path.exists(os.path.join(bundle_dir, stale)):
+                os.remove(os.path.join(bundle_dir, stale))
+    except (OSError, pa.ArrowException) as e:
+        print(f"캐시 저장 실패 (Cache write failed): {e}")
+
+
+def load_bundle(name, match=None, cache_dir=CACHE_DIR):
+    # store_bundle 로 저장한 {항목: 프레임}, 매니페스트가 match 와 다르거나 없으면 None
+    # ({item: frame} saved by store_bundle; None when missing or when the manifest differs from `match`)
+    bundle_dir = os.path.join(cache_dir, name)
+    manifest = _read_manifest(os.path.join(bundle_dir, 'manifest.json'))
+    if manifest is None or any(manifest.get(k) != v for k, v in (match or {}).items()):
+        return None
+    try:
+        return {key: _read_frame(os.path.join(bundle_dir, manifest['files'][key])) for key in manifest['items']}
+    except (OSError, KeyError, pa.ArrowException) as e:
+        print(f"캐시 로드 실패 (Cache load failed): {e}")
+        return None
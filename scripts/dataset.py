@@ -0,0 +1,206 @@
+import threading
+import traceback
+
+import pandas as pd
+
+from ingest import source_signature
+
+
+class Dataset:
+    # 프로세스 전체가 공유하는 읽기 전용 데이터셋 핸들 (Read-only dataset handle shared by the whole process)
+    #  - 원본 프레임은 노출하지 않고 view() 로만 전달 (the frame itself is never handed out, only views)
+    #  - Copy-on-Write 하에서 뷰를 수정하면 뷰만 복사되므로 공유 데이터는 변하지 않음
+    #    (under Copy-on-Write a write to a view copies that view, never the shared data)
+    #  - 색인 / 집계 같은 파생 객체는 이름별로 한 번만 생성 (derived indexes are built once per name)
+    #  - 컬럼은 뷰가 처음 요청할 때 source 에서 읽고, 파생 컬럼도 그때 계산
+    #    (columns are read from `source` the first time a view asks for them; derived columns are computed then)
+    #    source: 프레임 또는 같은 모양의 컬럼 저장소 (a frame, or a column store with the same shape, e.g. ArrowColumns)
+    #    derived_columns: {이름: (입력 컬럼, fn(frame) -> Series)} ({name: (input columns, fn(frame) -> Series)})
+
+    def __init__(self, source, derived_columns=None):
+        self._source = source
+        self.attrs = dict(source.attrs)
+        self.version = self.attrs.get('dataset_version')
+        self._derived_columns = {name: spec for name, spec in (derived_columns or {}).items()
+                                 if name not in source.columns and all(c in source.columns for c in spec[0])}
+        self.columns = source.columns.append(pd.Index(list(self._derived_columns)))
+        # 읽은 컬럼만 담는 프레임, 컬럼이 늘 때마다 새 프레임으로 교체 (Loaded columns only; replaced, never modified)
+        self._frame = source[[]]
+        self._frame.attrs = self.attrs
+        self._derived = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._columns_lock = threading.Lock()
+
+    @property
+    def empty(self):
+        return len(self._source) == 0 or len(self.columns) == 0
+
+    @property
+    def loaded_columns(self):
+        return self._frame.columns
+
+    def __len__(self):
+        return len(self._source)
+
+    def view(self, columns=None):
+        # 지연 복사 뷰, columns 를 주면 해당 컬럼만 읽음 (Lazy-copy view; with `columns`, only those are read)
+        columns = list(self.columns) if columns is None else [c for c in columns if c in self.columns]
+        self._load(columns)
+        return self._frame[columns]
+
+    def _load(self, columns):
+        if all(c in self._frame.columns for c in columns):
+            return
+        with self._columns_lock:
+            frame = self._frame
+            missing = [c for c in columns if c not in frame.columns]
+            inputs = [c for name in missing if name in self._derived_columns for c in self._derived_columns[name][0]]
+            stored = [c for c in dict.fromkeys(missing + inputs) if c in self._source.columns and c not in frame.columns]
+            if stored:
+                frame = pd.concat([frame, self._source[stored]], axis=1)
+            derived = {name: self._derived_columns[name][1](frame) for name in missing if name in self._derived_columns}
+            if derived:
+                frame = frame.assign(**derived)
+            frame.attrs = self.attrs
+            # 참조 대입은 원자적, 이미 만든 뷰는 이전 프레임을 계속 사용 (Atomic swap; existing views keep the old frame)
+            self._frame = frame
+
+    def derived(self, name, build_fn, columns=None):
+        # build_fn(view(columns)) 결과를 이름별로 한 번만 계산해 공유 (Build once per name and share across sessions)
+        if name in self._derived:
+            return self._derived[name]
+        # 이름별 잠금으로 같은 객체를 동시에 두 번 만들지 않음 (Per-name lock: concurrent reruns build it once)
+        with self._lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._derived:
+                self._derived[name] = build_fn(self.view(columns))
+        return self._derived[name]
+
+
+class DatasetWatcher:
+    # 원본 파일을 감시하다가 바뀌면 백그라운드에서 새 데이터셋을 만들어 원자적으로 교체
+    # (Watches the source file; on change builds the next dataset in the background and swaps it in atomically)
+    #  - 요청 경로는 current() 로 참조만 가져가므로 교체 중에도 대기하지 않음 (requests only read the reference)
+    #  - 실행 중인 rerun 은 받은 데이터셋을 끝까지 사용, 참조가 사라지면 이전 버전은 해제
+    #    (in-flight reruns keep the dataset they got; the old version is freed once nothing references it)
+    #  - 파일이 쓰이는 중일 수 있으므로 연속 두 번 같은 크기 / mtime 일 때만 재생성
+    #    (a change is only built once two consecutive polls see the same size and mtime)
+    #  - start() 하면 첫 버전도 백그라운드에서 로드, peek() 은 기다리지 않음
+    #    (after start() the first version is loaded in the background too; peek() never waits for it)
+
+    def __init__(self, path, load_fn, warm_fn=None, on_swap=None, interval=30):
+        self.path = path
+        self.load_fn = load_fn
+        self.warm_fn = warm_fn
+        self.on_swap = on_swap
+        self.interval = interval
+        self._current = None
+        self._signature = None
+        self._pending = None
+        self._failed = None
+        # 마지막 첫 로드 실패 원인, 성공하면 None (Why the first load last failed; None once it succeeds)
+        self.error = None
+        self._warmed = threading.Event()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stat(self):
+        # 파일별 (경로, 크기, mtime), 파티션 디렉터리 / glob 도 동일 (Per-file signature; works for partition sets too)
+        return tuple(tuple(entry) for entry in source_signature(self.path))
+
+    def current(self):
+        # 현재 데이터셋, 첫 호출만 동기 로드 (The current dataset; only the very first call loads synchronously)
+        if self._current is None:
+            with self._lock:
+                if self._current is None:
+                    self._swap(self._stat(), warm=False)
+                    # 첫 버전의 색인 / 스냅샷은 백그라운드에서 생성 (First version is warmed off the request path)
+                    if self.warm_fn is not None:
+                        threading.Thread(target=self._warm, args=(self._current,), name='dataset-warm',
+                                         daemon=True).start()
+                    else:
+                        self._warmed.set()
+        return self._current
+
+    def peek(self):
+        # 기다리지 않고 현재 데이터셋, 첫 로드가 끝나기 전에는 None (The current dataset without waiting; None until loaded)
+        return self._current
+
+    def warmed(self):
+        # 첫 버전의 예열까지 끝났는지, 이후 버전은 교체 전에 예열됨
+        # (Whether the first version is loaded and warmed; later versions are warmed before they are swapped in)
+        return self._warmed.is_set()
+
+    def _load_first(self):
+        try:
+            self.current()
+            self.error = None
+        except Exception as e:
+            # 다음 주기에 재시도, 요청 경로는 error 로 원인 확인 (Retried next interval; requests can report `error`)
+            self.error = e
+            print(f"데이터셋 로드 실패 (Dataset load failed): {e}")
+
+    def _warm(self, ds):
+        try:
+            self.warm_fn(ds)
+        except Exception:
+            # 예열 실패는 요청 경로에서 필요할 때 다시 생성됨 (Anything missing is built on demand instead)
+            traceback.print_exc()
+        finally:
+            self._warmed.set()
+
+    def _swap(self, signature, warm=True):
+        ds = self.load_fn()
+        # 색인 등을 미리 만들어 교체 후 첫 요청이 기다리지 않게 함 (Warm derived indexes before anyone sees it)
+        if warm and self.warm_fn is not None:
+            self.warm_fn(ds)
+        old = self._current
+        # 참조 대입은 원자적 (A single reference assignment is atomic)
+        self._current, self._signature = ds, signature
+        if old is not None and self.on_swap is not None:
+            self.on_swap(old, ds)
+
+    def refresh(self):
+        # 한 번 검사, 새 버전으로 교체했으면 True (Check once; True when a new version was swapped in)
+        try:
+            signature = self._stat()
+        except OSError:
+            return False
+        if self._current is None or signature in (self._signature, self._failed):
+            self._pending = None
+            return False
+        if signature != self._pending:
+            self._pending = signature
+            return False
+        with self._lock:
+            self._swap(signature)
+        self._pending = None
+        return True
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='dataset-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        # 첫 버전은 요청을 기다리지 않고 바로 로드, interval 이 0 이면 감시는 하지 않음
+        # (The first version is loaded right away, before any request asks; interval 0 turns polling off)
+        self._load_first()
+        while self.interval and not self._stop.wait(self.interval):
+            if self._current is None:
+                self._load_first()
+                continue
+            try:
+                self.refresh()
+            except Exception:
+                # 실패하면 이전 버전을 계속 제공, 파일이 다시 바뀌면 재시도
+                # (Keep serving the old version; retry once the file changes again)
+                self._failed, self._pending = self._pending, None
+                traceback.print_exc()
@@ -0,0 +1,167 @@
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+# 근사 고유 개수의 목표 상대 표준 오차, 환경 변수로 조정 (Target relative standard error, tunable through the environment)
+#   DASHBOARD_SKETCH_ERROR=<비율>   예: 0.01 = 약 ±1% (e.g. 0.01 for about ±1%)
+DEFAULT_ERROR = float(os.environ.get('DASHBOARD_SKETCH_ERROR', 0.01))
+
+# 그룹당 레지스터 수 2^p 의 범위 (Range of the precision p; each group has 2^p registers)
+MIN_PRECISION, MAX_PRECISION = 4, 18
+
+_HASH_BITS = 64
+
+
+def precision_for(error):
+    # 상대 표준 오차 1.04 / sqrt(2^p) 가 error 이하가 되는 가장 작은 p (Smallest p with 1.04 / sqrt(2^p) <= error)
+    p = math.ceil(math.log2((1.04 / error) ** 2))
+    return min(max(p, MIN_PRECISION), MAX_PRECISION)
+
+
+def expected_error(error=DEFAULT_ERROR):
+    # error 로 만든 스케치의 실제 상대 표준 오차, 화면 표시용 (Actual relative standard error of sketches built for `error`)
+    return 1.04 / math.sqrt(1 << precision_for(error))
+
+
+def _bit_length(values):
+    # uint64 의 비트 길이, 32비트씩 나눠 float 변환을 정확하게 유지 (Exact bit length of uint64, in 32-bit halves)
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+def _registers(values, precision):
+    # 값별 (레지스터 번호, 순위): 해시 상위 p 비트 = 레지스터, 나머지의 선행 0 개수 + 1 = 순위
+    # ((register, rank) per value: top p hash bits pick the register, leading zeros + 1 of the rest is the rank)
+    hashes = pd.util.hash_array(np.asarray(values, dtype=object))
+    rest_bits = _HASH_BITS - precision
+    registers = (hashes >> np.uint64(rest_bits)).astype(np.int64)
+    rest = hashes & np.uint64((1 << rest_bits) - 1)
+    ranks = (rest_bits - _bit_length(rest) + 1).astype(np.uint8)
+    return registers, ranks
+
+
+def _alpha(m):
+    # HyperLogLog 편향 보정 상수 (Bias correction constant)
+    return {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+
+
+def _estimate(inverse_sum, zeros, m):
+    # 원시 추정치, 작은 값은 선형 계수로 보정 (Raw estimate; small cardinalities use linear counting)
+    raw = _alpha(m) * m * m / inverse_sum
+    with np.errstate(divide='ignore'):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+
+def estimate_registers(dense):
+    # 레지스터 행렬의 행마다 추정치, 행끼리 np.maximum 으로 합친 합집합에도 사용
+    # (Estimate per row of a register matrix; rows merged with np.maximum estimate the union)
+    m = dense.shape[-1]
+    zeros = np.count_nonzero(dense == 0, axis=-1)
+    return _estimate(np.exp2(-dense.astype(np.float64)).sum(axis=-1), zeros, m)
+
+
+class DistinctSketch:
+    # 그룹별 HyperLogLog 근사 고유 개수 (Per-group HyperLogLog sketches, e.g. distinct buyers per seller x month x region)
+    #  - 희소 저장: 0 이 아닌 (그룹, 레지스터) 의 최대 순위만 보관, 메모리는 그룹 수가 아니라 쌍 수에 비례
+    #    (sparse: only the max rank of non-zero (group, register) slots is kept; memory follows pairs, not groups)
+    #  - 아무 그룹 묶음이나 레지스터별 최댓값으로 합쳐 추정 (any set of groups is merged by register-wise max)
+    #  - rollup() 으로 더 굵은 단위로, merge() 로 다른 스케치와 합침 (coarser grains with rollup(), other sketches with merge())
+    #  - 같은 값은 항상 같은 해시이므로 결과는 실행마다 동일 (hashing is deterministic, so results are stable across runs)
+
+    def __init__(self, keys, slots, ranks, precision):
+        self.keys = keys
+        self.precision = precision
+        self.slots = slots
+        self.ranks = ranks
+
+    @classmethod
+    def build(cls, df, dims, value_col, error=DEFAULT_ERROR):
+        # dims 조합별 value_col 의 스케치, 결측 값은 세지 않음 (Sketch of value_col per dims combination; missing values are skipped)
+        precision = precision_for(error)
+        grouper = df.groupby(dims, observed=True, sort=True, dropna=False)
+        keys = grouper.size().index.to_frame(index=False)
+        groups = grouper.ngroup().to_numpy()
+        # 해시는 고유값마다 한 번 (Hash once per distinct value)
+        codes, uniques = pd.factorize(df[value_col])
+        registers, ranks = _registers(uniques, precision)
+        valid = codes >= 0
+        codes = codes[valid]
+        return cls._from_entries(keys, groups[valid], registers[codes], ranks[codes], precision)
+
+    @classmethod
+    def _from_entries(cls, keys, groups, registers, ranks, precision):
+        # (그룹, 레지스터) 슬롯마다 최대 순위만 남기고 슬롯 순으로 정렬 (Keep the max rank per slot, sorted by slot)
+        slots = (groups.astype(np.int64) << precision) | registers
+        order = np.lexsort((ranks, slots))
+        slots, ranks = slots[order], ranks[order]
+        last = np.append(slots[1:] != slots[:-1], True) if len(slots) else np.empty(0, dtype=bool)
+        return cls(keys, slots[last], ranks[last], precision)
+
+    @property
+    def registers_per_group(self):
+        return 1 << self.precision
+
+    @property
+    def relative_error(self):
+        # 추정치의 상대 표준 오차 (Relative standard error of an estimate)
+        return 1.04 / math.sqrt(self.registers_per_group)
+
+    @property
+    def nbytes(self):
+        return int(self.slots.nbytes + self.ranks.nbytes + self.keys.memory_usage(deep=True).sum())
+
+    def estimates(self):
+        # 그룹별 추정치, keys 와 같은 순서 (Estimate per group, aligned with keys)
+        m = self.registers_per_group
+        groups = self.slots >> self.precision
+        n_groups = len(self.keys)
+        filled = np.bincount(groups, minlength=n_groups)
+        inverse_sum = np.bincount(groups, weights=np.exp2(-self.ranks.astype(np.float64)), minlength=n_groups)
+        zeros = m - filled
+        return _estimate(inverse_sum + zeros, zeros, m)
+
+    def estimate(self, mask=None):
+        # mask 로 고른 그룹들의 합집합 추정치, None 이면 전체 (Estimate for the union of the selected groups; all when None)
+        m = self.registers_per_group
+        slots, ranks = self.slots, self.ranks
+        if mask is not None:
+            keep = np.asarray(mask)[slots >> self.precision]
+            slots, ranks = slots[keep], ranks[keep]
+        dense = np.zeros(m, dtype=np.uint8)
+        np.maximum.at(dense, slots & (m - 1), ranks)
+        return float(estimate_registers(dense))
+
+    def dense(self):
+        # 그룹 x 레지스터 행렬, keys 와 같은 순서 (Group x register matrix, aligned with keys)
+        m = self.registers_per_group
+        dense = np.zeros((len(self.keys), m), dtype=np.uint8)
+        dense[self.slots >> self.precision, self.slots & (m - 1)] = self.ranks
+        return dense
+
+    def rollup(self, dims):
+        # dims 단위로 그룹을 합친 새 스케치 (New sketch with the groups merged up to `dims`)
+        grouper = self.keys.groupby(dims, observed=True, sort=True, dropna=False)
+        keys = grouper.size().index.to_frame(index=False)
+        mapping = grouper.ngroup().to_numpy()
+        registers = self.slots & (self.registers_per_group - 1)
+        return DistinctSketch._from_entries(keys, mapping[self.slots >> self.precision], registers, self.ranks,
+                                            self.precision)
+
+    def merge(self, other):
+        # 같은 dims / 정밀도의 스케치를 합친 새 스케치, 예: 파티션별 스케치 (Union with a sketch of equal dims and precision)
+        if other.precision != self.precision:
+            raise ValueError(f"정밀도가 다릅니다 (Precision mismatch): {self.precision} != {other.precision}")
+        dims = list(self.keys.columns)
+        combined = pd.concat([self.keys, other.keys], ignore_index=True)
+        grouper = combined.groupby(dims, observed=True, sort=True, dropna=False)
+        keys = grouper.size().index.to_frame(index=False)
+        mapping = grouper.ngroup().to_numpy()
+        groups = np.concatenate([mapping[:len(self.keys)][self.slots >> self.precision],
+                                 mapping[len(self.keys):][other.slots >> other.precision]])
+        registers = np.concatenate([self.slots, other.slots]) & (self.registers_per_group - 1)
+        return DistinctSketch._from_entries(keys, groups, registers, np.concatenate([self.ranks, other.ranks]),
+                                            self.precision)
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+# 상자그림 수염 길이, 사분위 범위 배수 (Whisker reach in IQRs, the Tukey / Plotly default)
+WHISKER_IQR = 1.5
+
+# 그룹별로 그림에 싣는 이상치 최대 개수 (Outliers kept per group for the chart)
+MAX_OUTLIERS = 200
+
+
+def histogram_bins(values, nbins=50):
+    # 등간격 구간별 건수, 행 수와 관계없이 nbins 행 (Counts per equal-width bin; always nbins rows)
+    values = pd.Series(values).dropna().to_numpy(dtype=float)
+    if len(values) == 0:
+        return pd.DataFrame(columns=['Left', 'Right', 'Mid', 'Count'])
+    counts, edges = np.histogram(values, bins=nbins)
+    return pd.DataFrame({
+        'Left': edges[:-1],
+        'Right': edges[1:],
+        'Mid': (edges[:-1] + edges[1:]) / 2,
+        'Count': counts,
+    })
+
+
+def box_stats(df, group_col, value_col, max_outliers=MAX_OUTLIERS, seed=0):
+    # 그룹별 사분위, 수염, 평균과 표본 추출한 이상치 (Quartiles, whiskers and mean per group, plus sampled outliers)
+    #  - 사분위는 선형 보간 (Plotly 기본과 동일) (quartiles use linear interpolation, as Plotly does)
+    #  - 수염은 Q1 - 1.5 IQR ~ Q3 + 1.5 IQR 안의 가장 먼 값 (whiskers reach the farthest value within 1.5 IQR)
+    data = df[[group_col, value_col]].dropna()
+    groups = data.groupby(group_col, observed=True, sort=True)[value_col]
+    stats = groups.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ['Q1', 'Median', 'Q3']
+    stats['Mean'] = groups.mean()
+    stats['Count'] = groups.size()
+
+    iqr = stats['Q3'] - stats['Q1']
+    low = data[group_col].map(stats['Q1'] - WHISKER_IQR * iqr).astype(float)
+    high = data[group_col].map(stats['Q3'] + WHISKER_IQR * iqr).astype(float)
+    inside = data[value_col].between(low, high)
+    whiskers = data[inside].groupby(group_col, observed=True)[value_col]
+    stats['LowerFence'] = whiskers.min()
+    stats['UpperFence'] = whiskers.max()
+
+    outliers = data[~inside]
+    if len(outliers):
+        # 그룹마다 최대 max_outliers 개, 시드 고정으로 새로고침해도 같은 점 (Fixed seed: same points every rerun)
+        rng = np.random.default_rng(seed)
+        order = outliers.iloc[rng.permutation(len(outliers))]
+        outliers = order[order.groupby(group_col, observed=True).cumcount() < max_outliers].sort_index()
+    return stats.reset_index(), outliers.reset_index(drop=True)
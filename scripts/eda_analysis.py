@@ -1,3 +1,6 @@
+import argparse
+from functools import partial
+
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -5,28 +8,22 @@ import matplotlib.font_manager as fm
 import re
 from collections import Counter
 
+from hypothesis_runner import Hypothesis, run_hypotheses
+from ingest import NUMERIC_COLS, clean_orders, is_partitioned, list_partitions, read_orders, read_partitions
+from distinct_sketch import DEFAULT_ERROR
+from retention_index import RetentionIndex
+from seller_lifecycle import ApproxLifecycle, SellerLifecycle
+
 # Set Korean font
 plt.rcParams['font.family'] = 'AppleGothic'
 plt.rcParams['axes.unicode_minus'] = False
 
-def load_and_clean_data(filepath):
-    print(f"Loading data from {filepath}...")
-    df = pd.read_csv(filepath)
-    
-    # Numeric cleanup
-    numeric_cols = ['주문수량', '취소수량', '주문-취소 수량', '결제금액', '주문취소 금액', '실결제 금액', '판매단가', '공급단가', '재구매 횟수']
-    for col in numeric_cols:
-        if col in df.columns and df[col].dtype == object:
-             try:
-                df[col] = df[col].str.replace(',', '').astype(float)
-             except (ValueError, AttributeError):
-                pass
-
-    # Date parse
-    date_cols = ['주문일', '배송준비 처리일', '입금일']
-    for col in date_cols:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors='coerce')
+# 스트리밍 모드 기본 청크 크기 (Default chunk size of the streaming mode)
+CHUNK_SIZE = 500_000
+
+def clean_data(df):
+    # Numeric cleanup / Date parse (shared ingest, one parse per distinct value)
+    df = clean_orders(df, numeric_cols=NUMERIC_COLS + ['주문취소 금액'])
     
     # Ensure numeric
     for col in ['주문-취소 수량', '실결제 금액', '판매단가', '공급단가']:
@@ -40,6 +37,18 @@ def load_and_clean_data(filepath):
         df['NetProfit'] = 0
 
     valid_sales = df[df['주문-취소 수량'] > 0].copy() if '주문-취소 수량' in df.columns else df.copy()
+    return df, valid_sales
+
+def load_and_clean_data(filepath, columns=None):
+    # columns: only these source columns are read (see hypothesis_columns); None reads them all
+    print(f"Loading data from {filepath}...")
+    read_fn = partial(read_orders, usecols=columns)
+    if is_partitioned(filepath):
+        # Partitions are read and parsed in parallel; clean_data then passes the parsed columns through
+        df = read_partitions(list_partitions(filepath), read_fn, lambda part: clean_data(part)[0])[0]
+        df, valid_sales = clean_data(df)
+    else:
+        df, valid_sales = clean_data(read_fn(filepath))
     
     print(f"Data Loaded. Total: {len(df)}, Valid Sales: {len(valid_sales)}")
     return df, valid_sales
@@ -49,37 +58,88 @@ def analyze_product_names(df):
     pass # Skipped for brevity in this run, focusing on new hypotheses
 
 # --- New Hypothesis Modules ---
+# 각 가설은 (부분 집계, 출력) 두 단계: 부분 집계는 청크별로 계산해 merge_partials 로 합칠 수 있음
+# (Each hypothesis is a partial aggregate plus a report; partials of chunks are combined with merge_partials,
+#  so the in-memory and streaming modes print from the same merged state)
 
-def analyze_region_seller_impact(df):
-    print("\n[H1] Gyeonggi-do Sales vs Sellers")
+def _add_by_index(x, y):
+    # 인덱스(키)별 합산 (Sum two count/sum tables key by key)
+    combined = pd.concat([x, y])
+    return combined.groupby(level=list(range(combined.index.nlevels))).sum()
+
+def merge_partials(a, b):
+    # 부분 집계 병합: 숫자는 합, Series/DataFrame 은 키별 합, Index 는 합집합 (고유값 집합), 색인은 merge
+    # (Merge partials: numbers add, Series/DataFrame add per key, an Index is a distinct set and is unioned,
+    #  index objects such as RetentionIndex merge themselves)
+    if a is None or b is None:
+        return a if b is None else b
+    merged = {}
+    for key, x in a.items():
+        y = b[key]
+        if x is None or y is None:
+            merged[key] = x if y is None else y
+        elif isinstance(x, pd.Index):
+            merged[key] = x.union(y)
+        elif isinstance(x, (pd.Series, pd.DataFrame)):
+            merged[key] = _add_by_index(x, y)
+        elif isinstance(x, (RetentionIndex, ApproxLifecycle)):
+            merged[key] = x.merge(y)
+        else:
+            merged[key] = x + y
+    return merged
+
+def _rank(counts):
+    # 내림차순, 동률은 키 순서 (Largest first; ties in key order so every mode prints the same)
+    return counts.sort_index().sort_values(ascending=False, kind='stable')
+
+def region_seller_partial(df):
     if '광역지역' not in df.columns or '셀러명' not in df.columns:
+        return None
+    gyeonggi = df[df['광역지역'].astype(str).str.contains('경기', na=False)]
+    return {
+        'total_sales': gyeonggi['실결제 금액'].sum(),
+        'seller_sales': gyeonggi.groupby('셀러명')['실결제 금액'].sum(),
+    }
+
+def region_seller_report(state):
+    print("\n[H1] Gyeonggi-do Sales vs Sellers")
+    if state is None:
         print("Missing columns.")
         return
         
-    gyeonggi = df[df['광역지역'].astype(str).str.contains('경기', na=False)]
-    total_sales = gyeonggi['실결제 금액'].sum()
+    total_sales = state['total_sales']
     
     print(f"Total Gyeonggi Sales: {total_sales:,.0f}")
     
-    top_sellers = gyeonggi.groupby('셀러명')['실결제 금액'].sum().sort_values(ascending=False).head(5)
+    top_sellers = state['seller_sales'].sort_values(ascending=False).head(5)
     print("Top 5 Sellers in Gyeonggi:")
     print(top_sellers)
     
     top_share = top_sellers.sum() / total_sales * 100
     print(f"Top 5 Sellers Share in Gyeonggi: {top_share:.1f}%")
 
-def analyze_event_efficiency(df):
-    print("\n[H2] Event Product Efficiency")
+def analyze_region_seller_impact(df):
+    region_seller_report(region_seller_partial(df))
+
+def event_partial(df):
     if '이벤트 여부' not in df.columns:
+        return None
+    return {'group': df.groupby('이벤트 여부')[['주문-취소 수량', '실결제 금액', 'NetProfit']].sum()}
+
+def event_report(state):
+    print("\n[H2] Event Product Efficiency")
+    if state is None:
         print("Missing '이벤트 여부'.")
         return
         
-    group = df.groupby('이벤트 여부')[['주문-취소 수량', '실결제 금액', 'NetProfit']].sum()
+    group = state['group']
     group['ProfitMargin'] = group['NetProfit'] / group['실결제 금액'] * 100
     print(group)
 
-def analyze_gift_options(df):
-    print("\n[H3] Gift Buying Behavior")
+def analyze_event_efficiency(df):
+    event_report(event_partial(df))
+
+def gift_partial(df):
     # Identify Gift purchases
     # Priority: '목적' == '선물' > '선물세트_여부' == '선물세트'
     is_gift = pd.Series(False, index=df.index)
@@ -90,136 +150,244 @@ def analyze_gift_options(df):
         
     gifts = df[is_gift]
     non_gifts = df[~is_gift]
+    # 평균은 합계 / 건수 로 복원 (Means are recovered as sum / count)
+    return {
+        'gift_orders': len(gifts),
+        'non_gift_orders': len(non_gifts),
+        'gift_price_sum': gifts['판매단가'].sum(),
+        'gift_price_n': gifts['판매단가'].count(),
+        'non_gift_price_sum': non_gifts['판매단가'].sum(),
+        'non_gift_price_n': non_gifts['판매단가'].count(),
+        'gift_sizes': gifts['과수 크기'].value_counts() if '과수 크기' in df.columns else None,
+    }
+
+def gift_report(state):
+    print("\n[H3] Gift Buying Behavior")
+    print(f"Gift Orders: {state['gift_orders']}, Non-Gift: {state['non_gift_orders']}")
     
-    print(f"Gift Orders: {len(gifts)}, Non-Gift: {len(non_gifts)}")
-    
+    gift_mean = state['gift_price_sum'] / state['gift_price_n'] if state['gift_price_n'] else float('nan')
+    non_gift_mean = state['non_gift_price_sum'] / state['non_gift_price_n'] if state['non_gift_price_n'] else float('nan')
     print("Average Price: Gift vs Non-Gift")
-    print(f"Gift: {gifts['판매단가'].mean():,.0f} KRW")
-    print(f"Non-: {non_gifts['판매단가'].mean():,.0f} KRW")
+    print(f"Gift: {gift_mean:,.0f} KRW")
+    print(f"Non-: {non_gift_mean:,.0f} KRW")
     
-    if '과수 크기' in df.columns:
+    if state['gift_sizes'] is not None:
         print("\nTop 3 Fruit Sizes for Gifts:")
-        print(gifts['과수 크기'].value_counts().head(3))
+        print(_rank(state['gift_sizes']).head(3))
 
-def analyze_seller_retention(df):
+def analyze_gift_options(df):
+    gift_report(gift_partial(df))
+
+def retention_partial(df):
+    if 'UID' not in df.columns or '셀러명' not in df.columns:
+        return None
+    # Count orders per User per Seller (same index as the dashboard's retention tab)
+    return {'pairs': RetentionIndex(df['UID'], df['셀러명'])}
+
+def retention_report(state):
     print("\n[H4] Seller Retention (Repeat Purchase from Same Seller)")
-    if 'UID' not in df.columns or '셀러명' not in df.columns: return
+    if state is None: return
     
-    # Count orders per User per Seller
-    user_seller_counts = df.groupby(['UID', '셀러명']).size()
+    retention = state['pairs']
     
     # Repurchase is > 1
-    repurchases = user_seller_counts[user_seller_counts > 1]
-    
-    total_pairs = len(user_seller_counts)
-    repurchase_pairs = len(repurchases)
+    total_pairs = retention.total_pairs
+    repurchase_pairs = retention.repeat_pairs
     
     print(f"Total User-Seller Pairs: {total_pairs}")
     print(f"Pairs with Repurchase (>1): {repurchase_pairs} ({repurchase_pairs/total_pairs*100:.1f}%)")
     
-    # Top Sellers by Retention Rate (min 10 users)
-    seller_stats = df.groupby('셀러명')['UID'].nunique().reset_index(name='UserCount')
-    
-    # Calculate repurchase count per seller (users who bought > 1)
-    repurchase_counts = repurchases.reset_index().groupby('셀러명')['UID'].count().reset_index(name='RetainedUsers')
-    
-    merged = seller_stats.merge(repurchase_counts, on='셀러명', how='left').fillna(0)
-    merged['RetentionRate'] = merged['RetainedUsers'] / merged['UserCount'] * 100
+    # Top Sellers by Retention Rate (min 50 users)
+    valid_sellers = retention.top(min_buyers=50).reset_index().rename(
+        columns={'Buyers': 'UserCount', 'RepeatBuyers': 'RetainedUsers', 'RepurchaseRate': 'RetentionRate'})
     
     print("\nTop 5 Sellers by Retention Rate (min 50 users):")
-    valid_sellers = merged[merged['UserCount'] >= 50].sort_values('RetentionRate', ascending=False)
     print(valid_sellers.head(5))
 
-def analyze_seller_specialty(df):
-    print("\n[H5] Seller Specialty (Economy vs Premium)")
+def analyze_seller_retention(df):
+    retention_report(retention_partial(df))
+
+def specialty_partial(df):
     # Define segments
     # Economy: Price <= 25000 
     # Premium: Price >= 35000 OR is_premium='프리미엄'
     
-    df['Segment'] = 'Mid'
-    df.loc[df['판매단가'] <= 25000, 'Segment'] = 'Economy'
-    df.loc[(df['판매단가'] >= 35000) | (df.get('is_premium') == '프리미엄'), 'Segment'] = 'Premium'
+    segment = pd.Series('Mid', index=df.index, name='Segment')
+    segment[df['판매단가'] <= 25000] = 'Economy'
+    segment[(df['판매단가'] >= 35000) | (df.get('is_premium') == '프리미엄')] = 'Premium'
     
+    return {
+        'segments': segment.value_counts(),
+        'economy_volume': df[segment == 'Economy'].groupby('셀러명')['주문-취소 수량'].sum(),
+        'premium_volume': df[segment == 'Premium'].groupby('셀러명')['주문-취소 수량'].sum(),
+    }
+
+def specialty_report(state):
+    print("\n[H5] Seller Specialty (Economy vs Premium)")
     print("\nSegment Distribution:")
-    print(df['Segment'].value_counts())
+    print(_rank(state['segments']))
     
     print("\nTop Seller for Economy (by Volume):")
-    print(df[df['Segment']=='Economy'].groupby('셀러명')['주문-취소 수량'].sum().nlargest(3))
+    print(state['economy_volume'].nlargest(3))
     
     print("\nTop Seller for Premium (by Volume):")
-    print(df[df['Segment']=='Premium'].groupby('셀러명')['주문-취소 수량'].sum().nlargest(3))
+    print(state['premium_volume'].nlargest(3))
 
-def analyze_seller_lifecycle(df):
+def analyze_seller_specialty(df):
+    specialty_report(specialty_partial(df))
+
+def lifecycle_partial(df, approx=None):
+    if '주문일' not in df.columns:
+        return None
+    if approx:
+        # Per-month HyperLogLog sketches of sellers at relative error `approx`; chunks merge register-wise
+        return {'sketch': ApproxLifecycle.from_orders(df, 'M', error=approx)}
+    # Distinct (month, seller) pairs
+    month = df['주문일'].dt.to_period('M')
+    return {'month_sellers': pd.MultiIndex.from_arrays([month, df['셀러명']], names=['Month', '셀러명']).unique()}
+
+def lifecycle_report(state):
     print("\n[H6] Seller Lifecycle")
-    if '주문일' not in df.columns: return
-    
-    df['Month'] = df['주문일'].dt.to_period('M')
-    
-    # Active sellers per month
-    monthly_sellers = df.groupby('Month')['셀러명'].unique()
-    
-    lifecycle_stats = []
-    
-    all_seen_sellers = set()
-    prev_month_sellers = set()
+    if state is None: return
+
+    if 'sketch' in state:
+        # Approximate mode: counts are estimates; the cohort matrix needs exact per-seller first months
+        sketch = state['sketch']
+        lifecycle_stats = sketch.summary().rename(columns={'Period': 'Month'})
+        print(f"(Approximate: HyperLogLog estimates, relative standard error about ±{sketch.relative_error:.1%})")
+        print(lifecycle_stats[['Month', 'Active', 'New', 'Churned', 'Retained']])
+        print("\nCohort Retention: not available in approximate mode (run without --approx)")
+        return
     
-    for month in sorted(monthly_sellers.index):
-        current_sellers = set(monthly_sellers[month])
-        
-        # New: In current but never seen before
-        new_entrants = current_sellers - all_seen_sellers
-        
-        # Churn: In prev but not in current
-        # Note: This is simplified churn (churned THIS month). They might return later.
-        churned = prev_month_sellers - current_sellers if prev_month_sellers else set()
-        
-        # Retention: In prev AND current
-        retained = prev_month_sellers & current_sellers
-        
-        lifecycle_stats.append({
-            'Month': month,
-            'Active': len(current_sellers),
-            'New': len(new_entrants),
-            'Churned': len(churned),
-            'Retained': len(retained)
-        })
-        
-        all_seen_sellers.update(current_sellers)
-        prev_month_sellers = current_sellers
+    # Seller x month activity bitmap; New / Churned / Retained are vectorized over it
+    # Churn is simplified churn (churned THIS month). They might return later (see Reactivated in the engine).
+    pairs = state['month_sellers'].to_frame(index=False)
+    lifecycle = SellerLifecycle(pairs['셀러명'], pairs['Month'])
+    lifecycle_stats = lifecycle.summary().rename(columns={'Period': 'Month'})
         
-    print(pd.DataFrame(lifecycle_stats))
+    print(lifecycle_stats[['Month', 'Active', 'New', 'Churned', 'Retained']])
+    
+    print("\nCohort Retention (% of each first-month cohort active N months later):")
+    print(lifecycle.cohort_matrix().round(1))
 
-def analyze_seoul_packages(df):
-    print("\n[H7] Seoul Demographics (Small Package Preference)")
-    if '광역지역' not in df.columns or '무게 구분' not in df.columns: return
+def analyze_seller_lifecycle(df, approx=None):
+    lifecycle_report(lifecycle_partial(df, approx))
+
+def seoul_partial(df):
+    if '광역지역' not in df.columns or '무게 구분' not in df.columns:
+        return None
 
     # Normalize Region
-    df['RegionGroup'] = df['광역지역'].apply(lambda x: 'Seoul' if '서울' in str(x) else 'Non-Seoul')
+    region_group = df['광역지역'].apply(lambda x: 'Seoul' if '서울' in str(x) else 'Non-Seoul').rename('RegionGroup')
     
     # Check 'Small' (<3kg) vs others
     # Assuming '무게 구분' has values like '3kg 미만' or '<3kg' or derived from data
-    # Let's check distribution
-    
-    ct = pd.crosstab(df['무게 구분'], df['RegionGroup'], normalize='columns') * 100
+    # Raw counts here; column shares are taken after merging
+    return {'counts': pd.crosstab(df['무게 구분'], region_group)}
+
+def seoul_report(state):
+    print("\n[H7] Seoul Demographics (Small Package Preference)")
+    if state is None: return
+
+    counts = state['counts'].fillna(0)
+    ct = counts / counts.sum() * 100
     print("\nPackage Size Preference by Region (%):")
     print(ct)
 
+def analyze_seoul_packages(df):
+    seoul_report(seoul_partial(df))
+
+# 가설 목록과 각 가설이 읽는 컬럼 (Hypotheses in print order, with the columns each one reads)
+HYPOTHESES = [
+    Hypothesis('H1', region_seller_partial, region_seller_report, ['광역지역', '셀러명', '실결제 금액']),
+    Hypothesis('H2', event_partial, event_report, ['이벤트 여부', '주문-취소 수량', '실결제 금액', 'NetProfit']),
+    Hypothesis('H3', gift_partial, gift_report, ['목적', '선물세트_여부', '판매단가', '과수 크기']),
+    Hypothesis('H4', retention_partial, retention_report, ['UID', '셀러명']),
+    Hypothesis('H5', specialty_partial, specialty_report, ['판매단가', 'is_premium', '셀러명', '주문-취소 수량']),
+    Hypothesis('H6', lifecycle_partial, lifecycle_report, ['주문일', '셀러명']),
+    Hypothesis('H7', seoul_partial, seoul_report, ['광역지역', '무게 구분']),
+]
+
+# clean_data 가 NetProfit 계산과 유효 판매 필터에 읽는 컬럼 (Columns clean_data reads for NetProfit and the valid-sales filter)
+CLEAN_COLUMNS = ['주문-취소 수량', '판매단가', '공급단가']
+
+def hypothesis_columns(hypotheses=HYPOTHESES):
+    # 가설들이 읽는 원본 컬럼만 로드하도록 하는 컬럼 목록, 파생 컬럼(NetProfit)은 파일에 없으면 무시됨
+    # (Source columns the hypotheses read, for a projected load; derived ones such as NetProfit are skipped if absent)
+    return list(dict.fromkeys(CLEAN_COLUMNS + [col for h in hypotheses for col in h.columns]))
+
+def approx_hypotheses(error, hypotheses=HYPOTHESES):
+    # H6 를 스케치 근사 모드로 바꾼 가설 목록 (The hypotheses with H6 switched to its sketch-based approximate mode)
+    # 재구매율(H4)은 쌍별 주문 수가 필요해 항상 정확값 (H4 needs per-pair order counts, so it always stays exact)
+    return [h._replace(partial=partial(lifecycle_partial, approx=error)) if h.partial is lifecycle_partial else h
+            for h in hypotheses]
+
+def run_streaming(filepath, chunksize=CHUNK_SIZE, hypotheses=HYPOTHESES):
+    # 청크 단위로 한 번만 읽으며 모든 가설의 부분 집계를 누적, 최대 메모리는 청크 크기 + 집계 상태
+    # (One pass over the CSV in chunks feeding every hypothesis; peak memory is one chunk plus the
+    #  aggregate states, which grow with distinct keys such as (UID, seller) pairs, not with rows)
+    print(f"Loading data from {filepath} in chunks of {chunksize:,} rows...")
+    states = {}
+    total_rows = valid_rows = 0
+    for chunk in read_orders(filepath, usecols=hypothesis_columns(hypotheses), chunksize=chunksize):
+        df, valid_sales = clean_data(chunk)
+        total_rows += len(df)
+        valid_rows += len(valid_sales)
+        for h in hypotheses:
+            state = h.partial(valid_sales)
+            states[h.label] = merge_partials(states[h.label], state) if h.label in states else state
+    print(f"Data Loaded. Total: {total_rows}, Valid Sales: {valid_rows}")
+    if not states:
+        return states
+
+    for h in hypotheses:
+        h.report(states[h.label])
+    return states
+
+def run_parallel(valid_df, jobs=None, hypotheses=HYPOTHESES):
+    # 가설별 프로세스에서 실행 후 입력 순서대로 출력, 구조화된 결과 반환
+    # (Run each hypothesis in a worker process, print in order, return the structured results)
+    results = run_hypotheses(valid_df, hypotheses, jobs)
+    for result in results.values():
+        print(result['output'], end='')
+    return results
+
 def main():
-    filepath = 'data/project1 - classification_results.csv'
+    parser = argparse.ArgumentParser(description="가설 H1-H7 분석 (EDA hypotheses H1-H7)")
+    parser.add_argument('--input', default='data/project1 - classification_results.csv',
+                        help="주문 CSV 또는 파티션 디렉터리 / glob (Order CSV, or a directory / glob of partitions)")
+    parser.add_argument('--chunksize', type=int, nargs='?', const=CHUNK_SIZE,
+                        help="청크 단위 스트리밍 모드, 메모리에 다 올리지 않음 (Stream the CSV in chunks of this many rows)")
+    parser.add_argument('--jobs', type=int, nargs='?', const=0,
+                        help="가설을 프로세스 풀에서 병렬 실행, 값이 없으면 CPU 수 (Run hypotheses on a process pool)")
+    parser.add_argument('--approx', metavar='ERROR', type=float, nargs='?', const=DEFAULT_ERROR,
+                        help="H6 셀러 수를 HyperLogLog 로 근사, 값은 목표 상대 오차 "
+                             "(Approximate the H6 seller counts with HyperLogLog sketches at this relative error)")
+    args = parser.parse_args()
+    filepath = args.input
+    hypotheses = approx_hypotheses(args.approx) if args.approx else HYPOTHESES
     try:
-        original_df, valid_df = load_and_clean_data(filepath)
+        if args.chunksize:
+            # Running H1-H7 in one streaming pass
+            run_streaming(filepath, args.chunksize, hypotheses)
+        else:
+            original_df, valid_df = load_and_clean_data(filepath, hypothesis_columns(hypotheses))
+
+            if args.jobs is not None:
+                # Running H1-H7 in parallel
+                run_parallel(valid_df, args.jobs or None, hypotheses)
+            else:
+                # Running H1-H7
+                analyze_region_seller_impact(valid_df)
+                analyze_event_efficiency(valid_df)
+                analyze_gift_options(valid_df)
+                analyze_seller_retention(valid_df)
+                analyze_seller_specialty(valid_df)
+                analyze_seller_lifecycle(valid_df, args.approx)
+                analyze_seoul_packages(valid_df)
     except FileNotFoundError:
         print(f"File not found: {filepath}")
         return
-
-    # Running H1-H7
-    analyze_region_seller_impact(valid_df)
-    analyze_event_efficiency(valid_df)
-    analyze_gift_options(valid_df)
-    analyze_seller_retention(valid_df)
-    analyze_seller_specialty(valid_df)
-    analyze_seller_lifecycle(valid_df)
-    analyze_seoul_packages(valid_df)
     
     print("\nExpanded Analysis Complete.")
 
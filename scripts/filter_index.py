@@ -0,0 +1,137 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# 교차 분석에서 필터 / 그룹화에 쓰는 범주 컬럼 (Categorical columns used for filters and group-by)
+INDEXED_COLS = ['광역지역', '셀러명', '상품명', '과수 크기', '무게 구분', '이벤트 여부']
+
+# 상품명 부분 문자열 검색용 n-gram 길이 (n-gram size of the product-name substring index)
+NGRAM = 2
+
+
+def _csr(codes, n_groups):
+    # 코드 -> 행 번호 CSR (Code -> sorted row positions, CSR layout); 결측(-1) 행은 제외
+    valid = np.flatnonzero(codes >= 0)
+    order = valid[np.argsort(codes[valid], kind='stable')]
+    offsets = np.zeros(n_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes[valid], minlength=n_groups), out=offsets[1:])
+    return offsets, order
+
+
+def _gather(offsets, rows, keys):
+    # 여러 코드의 포스팅을 한 번에 모음 (Concatenate the postings of several codes without a Python loop)
+    starts, ends = offsets[keys], offsets[keys + 1]
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    # 각 구간의 시작 위치에서 이어지는 인덱스 생성 (Build run-length indices into `rows`)
+    run_starts = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return np.sort(rows[run_starts + np.arange(total)])
+
+
+class FilterIndex:
+    # 로드 시 한 번 만드는 교차 분석 필터 엔진 (Filter engine for the Drill Down page, built once per dataset)
+    #  - 범주 코드 -> 행 번호 포스팅 (categorical code -> row postings)
+    #  - 고유 상품명 위의 n-gram 색인으로 부분 문자열 검색 (n-gram index over distinct product names)
+    #  - 필터 결과는 행 번호 배열로만 다루며 프레임을 복사하지 않음 (results are row ids, never frame copies)
+
+    def __init__(self, df, columns=INDEXED_COLS, name_col='상품명'):
+        self.n_rows = len(df)
+        self.codes, self.uniques, self.postings = {}, {}, {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[col], sort=True)
+            self.codes[col] = codes
+            self.uniques[col] = uniques
+            self.postings[col] = _csr(codes, len(uniques))
+
+        # 고유 상품명 n-gram 색인 (n-gram -> product codes over lower-cased distinct names)
+        self.name_col = name_col
+        self._ngrams = {}
+        if name_col in self.codes:
+            self._names = [str(name).lower() for name in self.uniques[name_col]]
+            grams = {}
+            for code, name in enumerate(self._names):
+                for gram in {name[i:i + NGRAM] for i in range(len(name) - NGRAM + 1)}:
+                    grams.setdefault(gram, []).append(code)
+            self._ngrams = {gram: np.array(codes, dtype=np.int64) for gram, codes in grams.items()}
+
+    def options(self, col):
+        # 선택 위젯용 정렬된 고유값 (Sorted distinct values for the select widgets)
+        return list(self.uniques[col]) if col in self.uniques else []
+
+    def match_products(self, text):
+        # 검색어를 포함하는 상품 코드 (Product codes whose name contains `text`, case-insensitive)
+        if self.name_col not in self.codes:
+            return np.empty(0, dtype=np.int64)
+        names = self.uniques[self.name_col]
+        if re.escape(text) != text:
+            # 정규식 문자가 있으면 기존 str.contains 와 같게 고유 상품명에만 정규식 적용
+            # (Regex input keeps str.contains semantics, evaluated over distinct names only)
+            try:
+                mask = pd.Series(names).str.contains(text, case=False, na=False, regex=True).to_numpy()
+                return np.flatnonzero(mask)
+            except re.error:
+                pass
+
+        query = text.lower()
+        if len(query) < NGRAM:
+            candidates = range(len(self._names))
+        else:
+            # 모든 n-gram 포스팅의 교집합이 후보 (Candidates = intersection of every n-gram posting)
+            candidates = None
+            for gram in {query[i:i + NGRAM] for i in range(len(query) - NGRAM + 1)}:
+                posting = self._ngrams.get(gram)
+                if posting is None:
+                    return np.empty(0, dtype=np.int64)
+                candidates = posting if candidates is None else np.intersect1d(candidates, posting, assume_unique=True)
+        return np.array([c for c in candidates if query in self._names[c]], dtype=np.int64)
+
+    def select(self, filters=None, search=None, keywords=None):
+        # 조건에 맞는 행 번호 (정렬됨), 조건이 없으면 None = 전체
+        # (Sorted matching row ids; None means "all rows")
+        # filters: {컬럼: 값} 동등 조건 (equality filters), search: 상품명 검색어 (product search text)
+        # keywords: 같은 데이터셋의 KeywordIndex, 한글 검색어는 키워드 포스팅으로 바로 행을 얻음
+        # (KeywordIndex of the same dataset; a Hangul search word is answered from its row postings)
+        conditions = []
+        for col, value in (filters or {}).items():
+            if col not in self.codes:
+                continue
+            code = self.uniques[col].get_indexer([value])[0]
+            if code < 0:
+                return np.empty(0, dtype=np.int64)
+            offsets, rows = self.postings[col]
+            conditions.append((offsets[code + 1] - offsets[code], col, np.array([code])))
+        if search and self.name_col in self.codes:
+            rows = keywords.search(search) if keywords is not None else None
+            if rows is not None:
+                # 컬럼 없이 행 번호 자체가 조건 (A ready row list, no column)
+                conditions.append((len(rows), None, rows))
+            else:
+                products = self.match_products(search)
+                offsets, _ = self.postings[self.name_col]
+                size = int((offsets[products + 1] - offsets[products]).sum())
+                conditions.append((size, self.name_col, products))
+        if not conditions:
+            return None
+
+        # 가장 선택적인 조건의 포스팅에서 시작해 나머지는 코드 조회로 거름
+        # (Start from the most selective posting; the rest are O(candidates) code lookups)
+        conditions.sort(key=lambda c: c[0])
+        _, col, keys = conditions[0]
+        if col is None:
+            result = keys
+        else:
+            offsets, rows = self.postings[col]
+            result = _gather(offsets, rows, keys)
+        for _, col, keys in conditions[1:]:
+            if col is None:
+                result = np.intersect1d(result, keys, assume_unique=True)
+                continue
+            allowed = np.zeros(len(self.uniques[col]) + 1, dtype=bool)
+            allowed[keys] = True
+            result = result[allowed[self.codes[col][result]]]
+        return result
@@ -0,0 +1,198 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# 기본 출력 경로 (Default output path, same schema as the preprocessed export)
+output_path = 'data/synthetic - preprocessed_data.csv'
+
+# 광역지역과 대략적인 주문 비중 (Metropolitan regions and rough order weights)
+REGIONS = {
+    '서울특별시': 19, '경기도': 26, '인천광역시': 6, '부산광역시': 6, '대구광역시': 4, '광주광역시': 3,
+    '대전광역시': 3, '울산광역시': 2, '세종특별자치시': 1, '강원특별자치도': 3, '충청북도': 3,
+    '충청남도': 4, '전북특별자치도': 3, '전라남도': 3, '경상북도': 4, '경상남도': 6, '제주특별자치도': 2,
+}
+
+# 품종별 과수 크기와 기본 단가 (Varieties with their sizes and base unit price)
+VARIETIES = {
+    '감귤': (['소과', '중과', '대과', '로얄과', '혼합'], 19900),
+    '한라봉': (['소과', '중과', '중대과', '대과', '혼합'], 34900),
+    '레드향': (['중과', '중대과', '대과', '혼합'], 36900),
+    '천혜향': (['중과', '중대과', '대과', '혼합'], 35900),
+    '황금향': (['중과', '중대과', '대과', '혼합'], 33900),
+}
+
+# 무게 구분과 단가 배수 (Weight buckets and price multipliers)
+WEIGHTS = {'3kg 미만': 0.7, '3~5kg': 1.0, '5~10kg': 1.6, '10kg 이상': 2.4}
+
+# 앱이 찾는 상품명 키워드 (Product-name keywords the dashboard looks for)
+NAME_KEYWORDS = ['고당도', '초고당도', '꿀당도', '맛보장', '타이벡', '과즙폭발', '산지직송', '노지', '못난이',
+                 '가정용', '전용', '특품', '정품', '제철', '새콤달콤', '당일수확']
+GIFT_KEYWORDS = ['선물세트', '선물용', '명절선물']
+
+
+def parse_rows(text):
+    # '100k', '1M', '10M' 같은 표기 지원 (Accept shorthands like 100k / 1M / 10M)
+    text = str(text).strip().lower()
+    scale = {'k': 1_000, 'm': 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip('km')) * scale)
+
+
+def _zipf_weights(n, s=1.1):
+    # 상위 셀러 / 상품에 주문이 몰리는 분포 (Long-tailed popularity)
+    w = 1.0 / np.arange(1, n + 1) ** s
+    return w / w.sum()
+
+
+def _comma(values):
+    # 원본 CSV 처럼 콤마 포함 문자열로 (Comma-formatted strings, like the source export)
+    return pd.Series(values).map('{:,}'.format).to_numpy()
+
+
+def build_catalog(n_rows, rng):
+    # 셀러 / 상품 / 구매자 수를 데이터 규모에 맞춰 결정 (Cardinalities scaled with the row count)
+    n_sellers = max(50, int(np.sqrt(n_rows) * 0.8))
+    n_products = n_sellers * 4
+    n_users = max(100, n_rows // 3)
+
+    # 셀러: 주력 지역과 지역 집중도 (Sellers: home region and how local their buyers are)
+    region_names = np.array(list(REGIONS), dtype=object)
+    region_p = np.array(list(REGIONS.values()), dtype=float)
+    region_p /= region_p.sum()
+    sellers = pd.DataFrame({
+        '셀러명': [f'{rng.choice(["제주", "서귀포", "한림", "애월", "남원", "성산"])}농원{i:04d}' for i in range(n_sellers)],
+        'home_region': rng.choice(len(region_names), n_sellers, p=region_p),
+        'locality': np.clip(rng.beta(1.2, 3.0, n_sellers), 0, 1),
+    })
+
+    # 상품: 셀러, 품종, 크기, 무게, 단가, 상품명 (Products with attributes baked into the name)
+    variety_names = list(VARIETIES)
+    product_variety = rng.choice(len(variety_names), n_products, p=[0.5, 0.15, 0.12, 0.11, 0.12])
+    product_seller = rng.choice(n_sellers, n_products, p=_zipf_weights(n_sellers, 0.9))
+    weight_names = np.array(list(WEIGHTS), dtype=object)
+    product_weight = rng.choice(len(weight_names), n_products, p=[0.15, 0.5, 0.28, 0.07])
+    is_gift = rng.random(n_products) < 0.06
+
+    names, sizes, prices = [], [], []
+    for variety_code, weight_code, gift in zip(product_variety, product_weight, is_gift):
+        variety = variety_names[variety_code]
+        size_options, base_price = VARIETIES[variety]
+        size = size_options[rng.integers(len(size_options))]
+        kg = {0: 2, 1: rng.choice([3, 4.5, 5]), 2: rng.choice([7, 10]), 3: 15}[weight_code]
+        words = list(rng.choice(NAME_KEYWORDS, size=rng.integers(2, 5), replace=False))
+        if gift:
+            words.append(rng.choice(GIFT_KEYWORDS))
+        names.append(f'[{rng.choice(["제주", "서귀포"])}] {variety} {" ".join(words)} {kg}kg {size}')
+        sizes.append(size)
+        price = base_price * WEIGHTS[weight_names[weight_code]] * (1.3 if gift else 1.0)
+        # 900원 단위 가격 (Prices end in 900 like the storefronts)
+        prices.append(int(round(price / 1000)) * 1000 - 100)
+
+    products = pd.DataFrame({
+        '상품명': names,
+        'seller': product_seller,
+        '품종': np.array(variety_names, dtype=object)[product_variety],
+        '과수 크기': sizes,
+        '무게 구분': weight_names[product_weight],
+        '판매단가': prices,
+        'is_gift': is_gift,
+    })
+    return {'sellers': sellers, 'products': products, 'regions': region_names, 'region_p': region_p,
+            'n_users': n_users}
+
+
+def generate_chunk(n, catalog, rng, start, end):
+    products = catalog['products']
+    sellers = catalog['sellers']
+    regions = catalog['regions']
+
+    # 상품 인기 분포로 주문 생성 (Orders drawn from a long-tailed product popularity)
+    product = rng.choice(len(products), n, p=_zipf_weights(len(products)))
+    seller = products['seller'].to_numpy()[product]
+
+    # 지역 셀러일수록 주력 지역 주문 비중이 높음 (Local sellers sell mostly to their home region)
+    local = rng.random(n) < sellers['locality'].to_numpy()[seller]
+    region = np.where(local, sellers['home_region'].to_numpy()[seller],
+                      rng.choice(len(regions), n, p=catalog['region_p']))
+    region_values = regions[region].astype(object)
+    region_values[rng.random(n) < 0.002] = np.nan
+
+    qty = rng.choice([1, 1, 1, 2, 2, 3], n)
+    cancelled = np.where(rng.random(n) < 0.05, qty, 0)
+    price = products['판매단가'].to_numpy()[product]
+    gift = products['is_gift'].to_numpy()[product]
+
+    # 주문일: 기간 내 균등, 배송준비는 1~3일 뒤 (Order time uniform in range; shipping 1-3 days later)
+    span = int((end - start).total_seconds())
+    order_time = start + pd.to_timedelta(rng.integers(0, span, n), unit='s')
+    ship_day = (order_time + pd.to_timedelta(rng.integers(1, 4, n), unit='D')).normalize()
+
+    option = np.where(gift, '선물용 포장', rng.choice(['가정용', '기본', '가정용 실속'], n)).astype(object)
+    option[rng.random(n) < 0.1] = np.nan
+
+    return pd.DataFrame({
+        'UID': [f'U{u:08d}' for u in rng.choice(catalog['n_users'], n, p=_zipf_weights(catalog['n_users'], 0.6))],
+        '셀러명': sellers['셀러명'].to_numpy()[seller],
+        '광역지역': region_values,
+        '상품명': products['상품명'].to_numpy()[product],
+        '고객선택옵션': option,
+        '품종': products['품종'].to_numpy()[product],
+        '과수 크기': products['과수 크기'].to_numpy()[product],
+        '무게 구분': products['무게 구분'].to_numpy()[product],
+        '이벤트 여부': np.where(rng.random(n) < 0.15, '이벤트', '일반'),
+        '목적': np.where(gift | (rng.random(n) < 0.05), '선물', '가정용'),
+        '선물세트_여부': np.where(gift, '선물세트', '일반'),
+        '주문수량': qty,
+        '취소수량': cancelled,
+        '주문-취소 수량': qty - cancelled,
+        '결제금액': _comma(price * qty),
+        '주문취소 금액': _comma(price * cancelled),
+        '실결제 금액': _comma(price * (qty - cancelled)),
+        '판매단가': _comma(price),
+        '공급단가': _comma((price * 0.68).astype(int)),
+        '재구매 횟수': rng.geometric(0.55, n) - 1,
+        '주문일': order_time.strftime('%Y-%m-%d %H:%M:%S'),
+        '배송준비 처리일': ship_day.strftime('%Y-%m-%d'),
+        '입금일': order_time.strftime('%Y-%m-%d'),
+    })
+
+
+def generate(n_rows, path, seed=0, start='2023-10-01', end='2024-03-31', chunk_size=500_000):
+    # 청크 단위로 생성해 바로 기록, 메모리는 청크 크기로 제한 (Write chunk by chunk to bound memory)
+    rng = np.random.default_rng(seed)
+    catalog = build_catalog(n_rows, rng)
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    written = 0
+    while written < n_rows:
+        n = min(chunk_size, n_rows - written)
+        chunk = generate_chunk(n, catalog, rng, start, end)
+        chunk.to_csv(path, mode='w' if written == 0 else 'a', header=written == 0, index=False)
+        written += n
+        print(f"  {written:,} / {n_rows:,} rows")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스키마가 같은 합성 주문 데이터 생성 (Generate schema-faithful synthetic orders)")
+    parser.add_argument('--rows', default='100k', help="행 수, 예: 100k, 1M, 10M (Row count)")
+    parser.add_argument('--output', default=output_path)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--classify', metavar='PATH',
+                        help="분류 파이프라인까지 실행해 classification_results 형식으로 저장 (Also run the classify pipeline)")
+    args = parser.parse_args()
+
+    n_rows = parse_rows(args.rows)
+    print(f"합성 데이터 생성 (Generating synthetic data): {n_rows:,} rows -> {args.output}")
+    generate(n_rows, args.output, seed=args.seed)
+
+    if args.classify:
+        from classify_pipeline import run_pipeline
+        df = run_pipeline(pd.read_csv(args.output), report=False)
+        df.to_csv(args.classify, index=False)
+        print(f"분류 결과 저장 (Classified copy saved): {args.classify}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import contextlib
+import io
+import os
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# 가설 정의: 라벨, 부분 집계 함수, 출력 함수, 읽는 컬럼, 선행 가설
+# (Hypothesis spec: label, partial aggregate fn, report fn, input columns, labels it must run after)
+# 부분 집계는 입력 프레임을 수정하지 않으므로 (Segment / Month / RegionGroup 은 함수 안에서만 계산)
+# 선행 관계가 없으면 모두 동시에 실행 가능 (Partials never mutate the frame, so with no `after` edges all run at once)
+Hypothesis = namedtuple('Hypothesis', ['label', 'partial', 'report', 'columns', 'after'], defaults=[()])
+
+
+def run_one(spec, df):
+    # 부분 집계 + 출력 캡처 (Partial aggregate, with the printed report captured)
+    start = time.perf_counter()
+    state = spec.partial(df)
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        spec.report(state)
+    return {'label': spec.label, 'state': state, 'output': buffer.getvalue(),
+            'seconds': time.perf_counter() - start, 'pid': os.getpid()}
+
+
+def _run_shared(spec, path, columns):
+    # 워커: 공유 Arrow 파일을 메모리 맵으로 열고 필요한 컬럼만 변환 (Worker: memory-map the shared file, read own columns)
+    df = feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+    return run_one(spec, df)
+
+
+def dependency_levels(hypotheses):
+    # 선행 가설 그래프를 단계별로 나눔 (Split the `after` graph into levels that can run concurrently)
+    labels = {h.label for h in hypotheses}
+    done, levels = set(), []
+    pending = list(hypotheses)
+    while pending:
+        ready = [h for h in pending if all(dep in done or dep not in labels for dep in h.after)]
+        if not ready:
+            raise ValueError(f"순환 의존성 (Cyclic dependencies): {[h.label for h in pending]}")
+        levels.append(ready)
+        done.update(h.label for h in ready)
+        pending = [h for h in pending if h.label not in done]
+    return levels
+
+
+def run_hypotheses(df, hypotheses, jobs=None):
+    # 가설들을 프로세스 풀에서 실행, 결과는 {라벨: {state, output, seconds, pid}} (입력 순서 유지)
+    # (Run the hypotheses on a process pool; returns {label: {state, output, seconds, pid}} in input order)
+    # 프레임은 워커마다 피클하지 않고 압축 없는 Arrow IPC 파일 하나로 공유
+    # (The frame is written once as an uncompressed Arrow IPC file and memory-mapped by every worker)
+    jobs = jobs or os.cpu_count() or 1
+    results = {}
+    if jobs == 1:
+        for level in dependency_levels(hypotheses):
+            for h in level:
+                results[h.label] = run_one(h, df)
+        return {h.label: results[h.label] for h in hypotheses}
+
+    # 가설들이 읽는 컬럼만 공유 (Only the columns some hypothesis reads are shared)
+    shared = list(dict.fromkeys(c for h in hypotheses for c in h.columns if c in df.columns))
+    with tempfile.TemporaryDirectory(prefix='eda2-hyp-') as tmp:
+        path = os.path.join(tmp, 'frame.arrow')
+        try:
+            feather.write_feather(df[shared].reset_index(drop=True), path, compression='uncompressed')
+        except pa.ArrowException:
+            # 타입이 섞인 object 컬럼처럼 Arrow 로 못 쓰는 프레임은 가설별 컬럼을 피클로 전달
+            # (Frames Arrow cannot hold, e.g. object columns of mixed types, are pickled per hypothesis instead)
+            path = None
+        with ProcessPoolExecutor(max_workers=min(jobs, len(hypotheses))) as pool:
+            for level in dependency_levels(hypotheses):
+                futures = []
+                for h in level:
+                    columns = [c for c in h.columns if c in df.columns]
+                    if path is None:
+                        futures.append(pool.submit(run_one, h, df[columns].reset_index(drop=True)))
+                    else:
+                        futures.append(pool.submit(_run_shared, h, path, columns))
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[result['label']] = result
+    return {h.label: results[h.label] for h in hypotheses}
@@ -0,0 +1,235 @@
+import glob
+import itertools
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from compact_layout import concat_frames
+
+# 콤마가 포함된 숫자 컬럼 (Numeric columns that arrive as comma-formatted strings)
+NUMERIC_COLS = ['주문수량', '취소수량', '주문-취소 수량', '결제금액', '실결제 금액', '판매단가', '공급단가', '재구매 횟수']
+
+# 숫자 컬럼의 선언 타입, 건수와 원 단위 금액은 정수라 int32 로 충분
+# (Declared dtypes of the numeric columns; counts and won amounts are whole numbers, so int32 holds them)
+# 결측이나 소수가 섞인 컬럼은 합계 정밀도를 위해 float64 유지, float32 합계는 float32 로 누적되어 오차가 남
+# (Columns with NaN or fractions stay float64: float32 sums accumulate in float32 and drift)
+NUMERIC_DTYPES = {
+    '주문수량': np.int32,
+    '취소수량': np.int32,
+    '주문-취소 수량': np.int32,
+    '재구매 횟수': np.int32,
+    '결제금액': np.int32,
+    '주문취소 금액': np.int32,
+    '실결제 금액': np.int32,
+    '판매단가': np.int32,
+    '공급단가': np.int32,
+}
+
+# 날짜 컬럼 (Date columns)
+DATE_COLS = ['주문일', '배송준비 처리일', '입금일']
+
+# 문자열로 미리 선언하는 컬럼, 타입 추론 생략 (Text columns declared up front to skip type inference)
+TEXT_DTYPES = {
+    '셀러명': 'object',
+    '광역지역': 'object',
+    '상품명': 'object',
+    '고객선택옵션': 'object',
+    '품종': 'object',
+    '과수 크기': 'object',
+    '무게 구분': 'object',
+    '이벤트 여부': 'object',
+    '목적': 'object',
+    '주문일': 'object',
+    '배송준비 처리일': 'object',
+    '입금일': 'object',
+}
+
+# 원본을 출력 파일로 옮겨 쓸 때 한 번에 읽는 행 수 (Rows per chunk when a source is copied through to an output)
+COPY_CHUNK = 500_000
+
+# 먼저 시도하는 명시적 날짜 형식, 모두 실패하면 형식 추론으로 대체
+# (Explicit fast-path date formats; format inference is the fallback)
+DATE_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%Y-%m-%d %H:%M', '%Y.%m.%d', '%Y/%m/%d']
+
+
+def _broadcast(values, codes, fill):
+    # 고유값 결과를 factorize 코드로 행 전체에 펼침, 결측(-1)은 fill
+    # (Spread per-unique results back to rows through the codes; -1 becomes fill)
+    return np.append(values, fill)[codes]
+
+
+def _is_text(series):
+    # 아직 파싱 전인 문자열 컬럼, pandas 3 기본 str 타입 포함 (Still raw text, including pandas 3's default str dtype)
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+
+def declare_dtype(series, dtype):
+    # 값이 하나도 바뀌지 않을 때만 선언 타입으로 변환 (Cast to the declared dtype only when no value changes)
+    if dtype is None or series.dtype.kind not in 'iuf':
+        return series
+    values = series.to_numpy()
+    if np.dtype(dtype).kind in 'iu':
+        if series.dtype.kind == 'f' and (not np.isfinite(values).all() or (values != np.round(values)).any()):
+            return series
+        limits = np.iinfo(dtype)
+        if len(values) and (values.min() < limits.min or values.max() > limits.max):
+            return series
+    return series.astype(dtype)
+
+
+def parse_numeric(series, dtype=None):
+    # 고유값마다 한 번만 콤마 제거 후 float 변환, dtype 이 있으면 무손실일 때 그 타입으로
+    # (Strip commas and cast once per distinct value; then the declared dtype when it is lossless)
+    if not _is_text(series):
+        return declare_dtype(series, dtype)
+    codes, uniques = pd.factorize(series)
+    try:
+        parsed = pd.Series(uniques).str.replace(',', '').astype(float).to_numpy()
+    except (ValueError, TypeError, AttributeError):
+        # 변환할 수 없는 컬럼은 그대로 둠 (Leave unparseable columns untouched)
+        return series
+    return declare_dtype(pd.Series(_broadcast(parsed, codes, np.nan), index=series.index, name=series.name), dtype)
+
+
+def parse_dates(series):
+    # 고유값마다 한 번만 날짜 변환 (Parse each distinct value once)
+    if not _is_text(series):
+        return pd.to_datetime(series, errors='coerce')
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Series(uniques, dtype=object)
+
+    parsed = None
+    for fmt in DATE_FORMATS:
+        # 명시적 형식이 모든 고유값을 해석하면 채택 (Accept a format only if it parses every distinct value)
+        candidate = pd.to_datetime(uniques, format=fmt, errors='coerce')
+        if candidate.notna().all():
+            parsed = candidate
+            break
+    if parsed is None:
+        parsed = pd.to_datetime(uniques, errors='coerce')
+
+    values = _broadcast(parsed.to_numpy(), codes, np.datetime64('NaT'))
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def is_partitioned(path):
+    # 디렉터리나 glob 패턴이면 파티션 묶음, 파일 객체는 단일 원본 (A directory or a glob pattern names a set of
+    # partitions; file-like objects, e.g. the appended tail read by data_cache, are a single source)
+    if not isinstance(path, (str, os.PathLike)):
+        return False
+    return os.path.isdir(path) or glob.has_magic(os.fspath(path))
+
+
+def list_partitions(path):
+    # 파티션 파일 목록, 이름순 (Partition files in name order, e.g. one export per month)
+    #  - 디렉터리: 하위 폴더까지 모든 *.csv (directory: every *.csv below it, e.g. YearMonth=2024-01/data.csv)
+    #  - glob: 일치하는 파일 (glob: the matching files); 단일 파일: 그 파일 하나 (a single file: itself)
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, '**', '*.csv'), recursive=True))
+    if glob.has_magic(path):
+        return sorted(f for f in glob.glob(path, recursive=True) if os.path.isfile(f))
+    return [path]
+
+
+def source_signature(path):
+    # 파일별 [경로, 크기, mtime], 원본 변경 감지용 (Per-file [path, size, mtime_ns], used to detect source changes)
+    signature = []
+    for f in list_partitions(path):
+        stat = os.stat(f)
+        signature.append([os.path.abspath(f), stat.st_size, stat.st_mtime_ns])
+    return signature
+
+
+def read_partitions(files, read_fn=pd.read_csv, clean_fn=None, workers=None):
+    # 파티션을 스레드 풀에서 동시에 읽고 (선택적으로) 파티션별 정제 후 이어 붙임
+    # (Parse, and optionally clean, the partitions concurrently in a thread pool, then concatenate)
+    #  - CSV 파서는 GIL 을 놓으므로 스레드로 충분, 결과 프레임을 프로세스 간에 복사하지 않음
+    #    (the CSV parser releases the GIL, so threads suffice and no frame is copied between processes)
+    #  - 행 번호는 파티션 순서대로 이어지도록 보정 (row labels continue across partitions, in file order)
+    #  - 범주형 사전은 합집합으로 맞춤, 코드만 다시 매핑 (categorical dictionaries are unioned; only codes are remapped)
+    # 반환: (프레임, 파티션별 원본 행 수) (Returns (frame, raw rows per partition))
+    if not files:
+        raise FileNotFoundError("파티션 파일이 없습니다 (No partition files)")
+
+    def load(path):
+        raw = read_fn(path)
+        return len(raw), (clean_fn(raw) if clean_fn is not None else raw)
+
+    with ThreadPoolExecutor(max_workers=workers or min(len(files), os.cpu_count() or 1)) as pool:
+        parts = list(pool.map(load, files))
+
+    frames, offset = [], 0
+    for raw_rows, df in parts:
+        df.index = df.index + offset
+        offset += raw_rows
+        frames.append(df)
+    return concat_frames(frames), [raw_rows for raw_rows, _ in parts]
+
+
+def read_source(path, chunksize=None, workers=None, **kwargs):
+    # pd.read_csv 와 같지만 디렉터리 / glob 이면 모든 파티션을 읽음 (pd.read_csv that also takes a partition directory or glob)
+    # chunksize 를 주면 파티션 순서대로 청크 반복 (With chunksize, chunks are yielded partition by partition)
+    if not is_partitioned(path):
+        return pd.read_csv(path, chunksize=chunksize, **kwargs)
+    files = list_partitions(path)
+    if chunksize is not None:
+        if not files:
+            raise FileNotFoundError(path)
+        return itertools.chain.from_iterable(pd.read_csv(f, chunksize=chunksize, **kwargs) for f in files)
+    return read_partitions(files, lambda f: pd.read_csv(f, **kwargs), workers=workers)[0]
+
+
+def read_orders(filepath, usecols=None, chunksize=None):
+    # 주문 CSV 로드, 필요한 컬럼만 읽고 문자열 컬럼 타입은 미리 지정
+    # (Read the order CSV with declared text dtypes; usecols limits the columns read)
+    # chunksize 를 주면 프레임 대신 청크 반복자 반환 (With chunksize, returns an iterator of chunks)
+    # filepath 는 파티션 디렉터리 / glob 도 가능 (filepath may also be a partition directory or glob, see read_source)
+    if usecols is not None:
+        wanted = set(usecols)
+        return read_source(filepath, usecols=lambda c: c in wanted, dtype=TEXT_DTYPES, chunksize=chunksize)
+    return read_source(filepath, dtype=TEXT_DTYPES, chunksize=chunksize)
+
+
+def write_with_columns(source, output_path, columns, drop=(), chunksize=COPY_CHUNK):
+    # 원본을 청크로 읽어 문자열 그대로 옮기면서 columns {컬럼명: 행 값} 을 행 순서대로 붙여 씀
+    # (Stream the source as text and attach `columns` {name: row values} by row position, so a consumer can
+    #  classify a projected read and still write every source column with its original formatting)
+    # drop 의 컬럼은 빼고 끝에 다시 붙이고, 이미 있는 다른 컬럼은 제자리에서 교체
+    # (Columns in `drop` are removed and re-added at the end; other existing columns are replaced in place)
+    # 임시 파일에 쓴 뒤 교체하므로 source 와 output_path 가 같아도 됨 (Written to a temp file then swapped; source may be output_path)
+    values = {name: np.asarray(v) for name, v in columns.items()}
+    n_rows = len(next(iter(values.values()))) if values else None
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='', suffix='.tmp', delete=False,
+                                     dir=os.path.dirname(os.path.abspath(output_path))) as f:
+        tmp_path = f.name
+        try:
+            start = 0
+            for chunk in read_source(source, dtype=str, keep_default_na=False, chunksize=chunksize):
+                stop = start + len(chunk)
+                chunk = chunk.drop(columns=[c for c in drop if c in chunk.columns])
+                chunk = chunk.assign(**{name: v[start:stop] for name, v in values.items()})
+                chunk.to_csv(f, header=start == 0, index=False)
+                start = stop
+            if n_rows is not None and start != n_rows:
+                raise ValueError(f"원본 행 수가 다름 (Source has {start} rows, expected {n_rows}): {source}")
+        except BaseException:
+            f.close()
+            os.remove(tmp_path)
+            raise
+    os.replace(tmp_path, output_path)
+
+
+def clean_orders(df, numeric_cols=NUMERIC_COLS, date_cols=DATE_COLS):
+    # Numeric cleanup
+    for col in numeric_cols:
+        if col in df.columns:
+            df[col] = parse_numeric(df[col], NUMERIC_DTYPES.get(col))
+
+    # Date parse
+    for col in date_cols:
+        if col in df.columns:
+            df[col] = parse_dates(df[col])
+    return df
@@ -0,0 +1,153 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from filter_index import _gather
+
+# 한글 단어만 키워드로 사용, 숫자/기호 제외 (Hangul words only; numbers and symbols are dropped)
+KEYWORD_PATTERN = re.compile(r'[가-힣]+')
+
+
+def tokenize(text):
+    # Extract words, remove numbers/symbols
+    return KEYWORD_PATTERN.findall(str(text))
+
+
+def _csr(groups, values, n_groups):
+    # (그룹, 값) 쌍을 그룹별 CSR 배열로 정렬 (Group (group, value) pairs into CSR offsets + values)
+    order = np.argsort(groups, kind='stable')
+    offsets = np.zeros(n_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(groups, minlength=n_groups), out=offsets[1:])
+    return offsets, values[order]
+
+
+def extract_keywords_column(names):
+    # 고유 상품명마다 한 번만 토큰화하여 행 단위 키워드 리스트로 펼침
+    # (Tokenize each distinct product name once and broadcast the lists to rows)
+    codes, uniques = pd.factorize(names)
+    token_lists = np.empty(len(uniques) + 1, dtype=object)
+    token_lists[:len(uniques)] = [tokenize(name) for name in uniques]
+    # 상품명 결측은 str(nan) 과 마찬가지로 빈 리스트 (Missing names yield no keywords, as before)
+    token_lists[len(uniques)] = tokenize(np.nan)
+    return pd.Series(token_lists[codes], index=names.index, name='Keywords')
+
+
+class KeywordColumn:
+    # 행마다 리스트를 두는 대신 평탄한 배열로 보관하는 키워드 컬럼 (Per-row keywords as flat arrays, not one list per row)
+    #  - 행 -> 상품 코드 (row -> product code, int32)
+    #  - 상품 -> 키워드 코드 CSR (product -> keyword codes over `vocab`, offsets + codes)
+    #  - 고유 상품명만 토큰화 (only distinct product names are tokenized)
+
+    def __init__(self, names):
+        product_codes, products = pd.factorize(names)
+        n_products = len(products)
+        token_lists = [tokenize(name) for name in products]
+        if (product_codes < 0).any():
+            # 상품명 결측은 하나의 가상 상품으로 취급 (Missing names act as one extra pseudo-product)
+            product_codes = np.where(product_codes < 0, n_products, product_codes)
+            token_lists.append(tokenize(np.nan))
+            n_products += 1
+        self.n_products = n_products
+        self.product_codes = product_codes.astype(np.int32)
+        self.offsets = np.zeros(n_products + 1, dtype=np.int64)
+        np.cumsum(np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=n_products), out=self.offsets[1:])
+        codes, vocab = pd.factorize(pd.Series([w for tokens in token_lists for w in tokens], dtype=object))
+        self.codes = codes.astype(np.int32)
+        self.vocab = pd.Index(vocab, name='Keyword')
+
+    def __len__(self):
+        return len(self.product_codes)
+
+    @property
+    def nbytes(self):
+        return (self.product_codes.nbytes + self.offsets.nbytes + self.codes.nbytes
+                + self.vocab.memory_usage(deep=True))
+
+
+class KeywordIndex:
+    # 데이터셋당 한 번 만드는 키워드 역색인 (Keyword inverted index, built once per dataset)
+    #  - KeywordColumn 의 토큰화 결과를 재사용 (reuses the tokenization of a KeywordColumn)
+    #  - 키워드 -> 상품 코드, 상품 코드 -> 행 번호 CSR 포스팅 (keyword -> product and product -> row postings)
+    #  - 키워드별 등장 횟수, 매출, 주문 건수, 평균 단가를 미리 계산 (precomputed per-keyword stats)
+
+    def __init__(self, df, name_col='상품명', revenue_col='실결제 금액', price_col='판매단가', keywords=None):
+        if keywords is None:
+            keywords = KeywordColumn(df[name_col])
+        product_codes = keywords.product_codes
+        n_products = keywords.n_products
+        self.n_rows = len(df)
+
+        # 상품별 토큰 (중복 포함) 의 (상품, 키워드) 쌍 (Token occurrences of each distinct product, duplicates kept)
+        occ_product = np.repeat(np.arange(n_products), np.diff(keywords.offsets))
+        occ_keyword = keywords.codes
+        self.vocab = keywords.vocab
+        self._lookup = {word: i for i, word in enumerate(self.vocab)}
+        n_keywords = len(self.vocab)
+
+        # 상품 -> 행 포스팅과 상품 단위 합계 (Product -> row postings and per-product sums)
+        self.product_offsets, self.product_rows = _csr(product_codes, np.arange(self.n_rows), n_products)
+        rows_per_product = np.diff(self.product_offsets)
+        revenue = self._column(df, revenue_col)
+        price = self._column(df, price_col)
+        product_revenue = np.bincount(product_codes, weights=np.nan_to_num(revenue), minlength=n_products)
+        product_price_sum = np.bincount(product_codes, weights=np.nan_to_num(price), minlength=n_products)
+        product_price_n = np.bincount(product_codes, weights=~np.isnan(price), minlength=n_products)
+
+        # 등장 횟수는 상품명 안의 중복 단어까지 센다 (Count includes repeats within a name, like Counter did)
+        count = np.bincount(occ_keyword, weights=rows_per_product[occ_product], minlength=n_keywords)
+
+        # 키워드 -> 상품 포스팅은 (키워드, 상품) 중복 제거 후 구성 (Keyword -> product postings over unique pairs)
+        base = max(n_products, 1)
+        pairs = np.unique(occ_keyword.astype(np.int64) * base + occ_product)
+        pair_keyword, pair_product = pairs // base, pairs % base
+        self.keyword_offsets, self.keyword_products = _csr(pair_keyword, pair_product, n_keywords)
+
+        def per_keyword(values):
+            return np.bincount(pair_keyword, weights=values[pair_product], minlength=n_keywords)
+
+        orders = per_keyword(rows_per_product)
+        price_n = per_keyword(product_price_n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg_price = per_keyword(product_price_sum) / price_n
+
+        self.stats = pd.DataFrame({
+            'Count': count.astype(np.int64),
+            'Orders': orders.astype(np.int64),
+            'Revenue': per_keyword(product_revenue),
+            'AvgPrice': avg_price,
+        }, index=self.vocab)
+
+    @staticmethod
+    def _column(df, col):
+        if col in df.columns:
+            return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+        return np.full(len(df), np.nan)
+
+    def top(self, n=20, by='Count'):
+        # 상위 n개 키워드, 동률은 처음 등장한 순서 유지 (Top n keywords; ties keep first-seen order)
+        values = self.stats[by].to_numpy()
+        order = np.argsort(-values, kind='stable')[:n]
+        return self.stats.iloc[order].reset_index()
+
+    def _rows_of(self, keyword_codes):
+        # 키워드 코드들 중 하나라도 포함한 상품의 행 번호, 정렬됨 (Sorted rows of products containing any of the keywords)
+        products = np.unique(_gather(self.keyword_offsets, self.keyword_products, np.asarray(keyword_codes)))
+        return _gather(self.product_offsets, self.product_rows, products)
+
+    def rows(self, keyword):
+        # 키워드를 포함한 행 번호 (Row positions whose product name contains the keyword)
+        k = self._lookup.get(keyword)
+        if k is None:
+            return np.empty(0, dtype=np.int64)
+        return self._rows_of([k])
+
+    def search(self, text):
+        # 상품명에 text 가 들어간 행 번호, 한글 단어가 아니면 None (호출 측이 상품명 검색으로 처리)
+        # (Rows whose product name contains `text`; None unless `text` is a Hangul word, left to the caller)
+        # 한글만으로 된 검색어는 항상 한 키워드 안에 들어가므로 어휘만 훑으면 됨
+        # (A Hangul-only query always lies inside one keyword, so only the vocabulary is scanned)
+        if not KEYWORD_PATTERN.fullmatch(text):
+            return None
+        matches = self.vocab.str.contains(text, regex=False)
+        return self._rows_of(np.flatnonzero(np.asarray(matches, dtype=bool)))
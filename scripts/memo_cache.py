@@ -0,0 +1,90 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# 메모리 예산 (MB), 환경 변수로 조정 (Memory budget in MB, tunable through the environment)
+#   DASHBOARD_MEMO_MB=<MB>   0 이면 메모이제이션 끔 (0 turns memoization off)
+DEFAULT_BUDGET_MB = float(os.environ.get('DASHBOARD_MEMO_MB', 64))
+
+
+def nbytes(value):
+    # 캐시 항목의 대략적인 상주 바이트 (Approximate resident bytes of a cached value)
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(nbytes(k) + nbytes(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class MemoCache:
+    # 바이트 예산으로 제한되는 LRU 메모이제이션 (LRU memoization bounded by a byte budget, not an entry count)
+    #  - 프로세스 전체 공유, 세션 스레드 간 잠금 (process-wide, locked across session threads)
+    #  - 계산은 잠금 밖에서 수행, 같은 키를 동시에 계산하면 나중 결과가 남음
+    #    (values are computed outside the lock; concurrent misses on one key keep the last result)
+    #  - 예산보다 큰 값은 저장하지 않음 (values larger than the whole budget are not stored)
+    #  - 캐시된 값은 공유되므로 호출자는 수정하지 않아야 함 (cached values are shared; callers must not mutate them)
+
+    def __init__(self, budget_mb=DEFAULT_BUDGET_MB):
+        self.budget = int(budget_mb * 2 ** 20)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, compute_fn):
+        # key 의 값, 없으면 compute_fn() 결과를 저장 후 반환 (Cached value for key, else compute_fn() stored)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+        value = compute_fn()
+        size = nbytes(value)
+        if size > self.budget:
+            return value
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            # 가장 오래 쓰이지 않은 항목부터 제거 (Evict least recently used entries first)
+            while self._bytes > self.budget:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+        return value
+
+    def discard(self, predicate):
+        # predicate(key) 가 참인 항목 제거, 예: 교체된 데이터셋 버전 (Drop matching keys, e.g. a replaced dataset version)
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        # 예산 조정용 적중 / 미스 / 제거 통계 (Hit, miss and eviction counters for tuning the budget)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'budget': self.budget,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
@@ -1,29 +1,31 @@
 import pandas as pd
+import argparse
+import hashlib
+import json
 import re
 import os
+from functools import partial
 
-def load_and_clean_data(input_path, output_path):
-    print(f"Loading data from {input_path}...")
-    try:
-        df = pd.read_csv(input_path)
-    except FileNotFoundError:
-        print(f"Error: File not found at {input_path}")
-        return
+from distinct_sketch import DEFAULT_ERROR, DistinctSketch
+from ingest import clean_orders, is_partitioned, list_partitions, read_orders, read_partitions
+
+# Partition column of the partitioned export (one directory per month)
+PARTITION_COL = 'YearMonth'
+
+# Pre-aggregated extracts written next to the partitions: name -> grain
+SUMMARY_GRAINS = {
+    'seller_month': ['YearMonth', '셀러명'],
+    'region_month': ['YearMonth', '광역지역'],
+}
+
+MANIFEST_NAME = 'manifest.json'
+
+# Source columns prepare_frame always reads with --columns: the valid-sales filter and the YearMonth key
+REQUIRED_COLUMNS = ['주문-취소 수량', '주문일']
 
-    # Numeric cleanup
-    numeric_cols = ['주문수량', '취소수량', '주문-취소 수량', '결제금액', '실결제 금액', '판매단가', '공급단가', '재구매 횟수']
-    for col in numeric_cols:
-        if col in df.columns and df[col].dtype == object:
-             try:
-                df[col] = df[col].str.replace(',', '').astype(float)
-             except:
-                pass
-
-    # Date parse
-    date_cols = ['주문일', '배송준비 처리일', '입금일']
-    for col in date_cols:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors='coerce')
+def prepare_frame(df):
+    # Numeric cleanup / Date parse (shared ingest, one parse per distinct value)
+    df = clean_orders(df)
     
     # Net Profit (Removed as per user request, but keeping columns if needed for other calcs)
     # if {'판매단가', '공급단가', '주문-취소 수량'}.issubset(df.columns):
@@ -44,14 +46,165 @@ def load_and_clean_data(input_path, output_path):
     # Keywords Extraction (Simple - flattened for CSV)
     # Looker Studio doesn't handle lists well, so we might skip this or create a string
     # created a simple string of top keywords might be better, but for now we skip complex list columns
-    
+    return valid_sales
+
+def buyer_sketch(valid_sales, error):
+    # One HyperLogLog sketch of buyers per seller x month x region; every summary grain is a rollup of it
+    dims = sorted({col for grain in SUMMARY_GRAINS.values() for col in grain if col in valid_sales.columns})
+    return DistinctSketch.build(valid_sales, dims, 'UID', error=error)
+
+def summarize(valid_sales, grain, buyers=None):
+    # Orders, quantity, revenue and distinct buyers per grain (keeps Looker scans small);
+    # with a buyer sketch, Buyers is approximate and BuyersError holds its relative standard error
+    grouped = valid_sales.groupby(grain, dropna=False, sort=True)
+    summary = grouped.size().rename('Orders').to_frame()
+    if '주문-취소 수량' in valid_sales.columns:
+        summary['Quantity'] = grouped['주문-취소 수량'].sum()
+    if '실결제 금액' in valid_sales.columns:
+        summary['Revenue'] = grouped['실결제 금액'].sum()
+    if buyers is not None:
+        # Same groups in the same sorted order as the groupby above
+        rolled = buyers.rollup(grain)
+        summary['Buyers'] = rolled.estimates().round().astype('int64')
+        summary['BuyersError'] = round(rolled.relative_error, 4)
+    elif 'UID' in valid_sales.columns:
+        summary['Buyers'] = grouped['UID'].nunique()
+    return summary.reset_index()
+
+def content_hash(df):
+    # Hash of the values, columns and dtypes; equal hashes mean the written files would be identical
+    digest = hashlib.sha256(json.dumps([list(map(str, df.columns)), list(map(str, df.dtypes))]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def _write_atomic(path, write_fn):
+    # Write to a temp file then swap it in, so an upload never picks up a half-written file
+    tmp_path = f'{path}.tmp'
+    write_fn(tmp_path)
+    os.replace(tmp_path, path)
+
+def _write_manifest(output_dir, manifest):
+    def write(p):
+        with open(p, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    _write_atomic(os.path.join(output_dir, MANIFEST_NAME), write)
+
+def _read_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _sync(entries, name, df, base_path, parquet, output_dir):
+    # Rewrite one output only if its content hash changed or a file is missing; returns whether it was written
+    digest = content_hash(df)
+    previous = entries.get(name)
+    files = [f'{base_path}.csv'] + ([f'{base_path}.parquet'] if parquet else [])
+    if (previous is not None and previous['sha256'] == digest and previous['files'] == files
+            and all(os.path.exists(os.path.join(output_dir, f)) for f in files)):
+        return False
+    os.makedirs(os.path.dirname(os.path.join(output_dir, base_path)), exist_ok=True)
+    for f in files:
+        path = os.path.join(output_dir, f)
+        if f.endswith('.parquet'):
+            _write_atomic(path, lambda p: df.to_parquet(p, index=False))
+        else:
+            _write_atomic(path, lambda p: df.to_csv(p, index=False, encoding='utf-8-sig'))
+    # Files of a format that is no longer exported (e.g. Parquet turned off)
+    for f in set(previous['files'] if previous else []) - set(files):
+        if os.path.exists(os.path.join(output_dir, f)):
+            os.remove(os.path.join(output_dir, f))
+    entries[name] = {'sha256': digest, 'rows': len(df), 'files': files}
+    return True
+
+def export_partitioned(valid_sales, output_dir, parquet=False, approx_buyers=None):
+    # One file per YearMonth (YearMonth=2024-01/data.csv, optional .parquet) plus summary extracts;
+    # manifest.json keeps content hashes so only changed partitions are rewritten
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = _read_manifest(output_dir)
+    partitions = manifest.get('partitions', {})
+    extracts = manifest.get('extracts', {})
+
+    written = []
+    if PARTITION_COL in valid_sales.columns:
+        keys = valid_sales[PARTITION_COL]
+    else:
+        keys = pd.Series('all', index=valid_sales.index)
+    seen = set()
+    for key, part in valid_sales.groupby(keys, sort=True):
+        key = str(key)
+        seen.add(key)
+        if _sync(partitions, key, part, f'{PARTITION_COL}={key}/data', parquet, output_dir):
+            written.append(key)
+
+    # Months that disappeared from the source are removed
+    removed = sorted(set(partitions) - seen)
+    for key in removed:
+        for f in partitions.pop(key)['files']:
+            if os.path.exists(os.path.join(output_dir, f)):
+                os.remove(os.path.join(output_dir, f))
+        try:
+            os.rmdir(os.path.join(output_dir, f'{PARTITION_COL}={key}'))
+        except OSError:
+            pass
+
+    # Approximate buyers: the sketch is built once and merged up to each grain
+    buyers = buyer_sketch(valid_sales, approx_buyers) if approx_buyers and 'UID' in valid_sales.columns else None
+    for name, grain in SUMMARY_GRAINS.items():
+        if all(col in valid_sales.columns for col in grain):
+            if _sync(extracts, name, summarize(valid_sales, grain, buyers), f'summary_{name}', parquet, output_dir):
+                written.append(f'summary_{name}')
+
+    _write_manifest(output_dir, {'partition_col': PARTITION_COL, 'partitions': partitions, 'extracts': extracts})
+    return written, removed
+
+def load_and_clean_data(input_path, output_path, partitioned_dir=None, parquet=False, approx_buyers=None,
+                        columns=None):
+    # columns: only these source columns (plus REQUIRED_COLUMNS) are read and exported; None keeps them all
+    print(f"Loading data from {input_path}...")
+    usecols = None if columns is None else list(dict.fromkeys(REQUIRED_COLUMNS + list(columns)))
+    read_fn = partial(read_orders, usecols=usecols)
+    try:
+        if is_partitioned(input_path):
+            # Partitions are read and prepared in parallel, then concatenated
+            valid_sales = read_partitions(list_partitions(input_path), read_fn, prepare_frame)[0]
+        else:
+            valid_sales = prepare_frame(read_fn(input_path))
+    except FileNotFoundError:
+        print(f"Error: File not found at {input_path}")
+        return
+
     print(f"Data Processed. Rows: {len(valid_sales)}")
-    
+
+    if partitioned_dir:
+        written, removed = export_partitioned(valid_sales, partitioned_dir, parquet, approx_buyers)
+        print(f"Rewrote {len(written)} partition/extract files in {partitioned_dir}: {', '.join(written) or 'none'}")
+        if removed:
+            print(f"Removed partitions: {', '.join(removed)}")
+        return
+
     # Save to CSV
     valid_sales.to_csv(output_path, index=False, encoding='utf-8-sig')
     print(f"Saved cleaned data to {output_path}")
 
+def main():
+    parser = argparse.ArgumentParser(description="Prepare the Looker Studio source")
+    parser.add_argument('--input', default='data/project1 - classification_results.csv',
+                        help="Order CSV, or a directory / glob of partitions (parsed in parallel)")
+    parser.add_argument('--output', default='data/project1 - looker_studio_source.csv')
+    parser.add_argument('--partitioned', metavar='DIR',
+                        help="Write one file per YearMonth plus seller/region-month extracts to DIR, "
+                             "rewriting only changed partitions")
+    parser.add_argument('--parquet', action='store_true', help="Also write Parquet next to each partitioned CSV")
+    parser.add_argument('--approx-buyers', metavar='ERROR', type=float, nargs='?', const=DEFAULT_ERROR,
+                        help="Estimate Buyers in the summary extracts with HyperLogLog sketches at this relative "
+                             "error (default DASHBOARD_SKETCH_ERROR or 0.01) instead of exact distinct counts; adds a BuyersError column")
+    parser.add_argument('--columns', nargs='+', metavar='COL',
+                        help="Only read and export these source columns (주문-취소 수량 and 주문일 are always kept); "
+                             "summary extracts whose grain or measure columns are left out are skipped")
+    args = parser.parse_args()
+    load_and_clean_data(args.input, args.output, args.partitioned, args.parquet, args.approx_buyers, args.columns)
+
 if __name__ == "__main__":
-    input_csv = 'data/project1 - classification_results.csv'
-    output_csv = 'data/project1 - looker_studio_source.csv'
-    load_and_clean_data(input_csv, output_csv)
+    main()
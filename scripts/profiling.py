@@ -0,0 +1,128 @@
+import contextvars
+import json
+import logging
+import os
+import resource
+import time
+from contextlib import contextmanager
+
+# 환경 변수로 켜는 단계별 프로파일링 (Per-stage profiling, switched on by an environment variable)
+#   DASHBOARD_PROFILE=1            사이드바 패널 + 구조화 로그 (sidebar panel + structured log)
+#   DASHBOARD_PROFILE_LOG=<path>   로그를 JSON Lines 파일로 (write the log as JSON Lines to a file)
+ENABLED = os.environ.get('DASHBOARD_PROFILE', '').lower() not in ('', '0', 'false', 'no')
+
+logger = logging.getLogger('dashboard.profile')
+
+# 현재 스크립트 실행(세션 스레드)의 프로파일러 (Profiler of the current script run / session thread)
+_current = contextvars.ContextVar('dashboard_profiler', default=None)
+
+
+def _rss_mb():
+    # 현재 상주 메모리 (Current resident memory in MB; Linux /proc, else the peak from getrusage)
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class _NullStage:
+    # 비활성 시 공유되는 빈 컨텍스트, rows 등을 설정해도 무시됨 (Shared no-op stage used when disabled)
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StageRecord:
+    __slots__ = ('name', 'depth', 'rows', 'ms', 'mem_mb')
+
+    def __init__(self, name, depth, rows=None):
+        self.name = name
+        self.depth = depth
+        self.rows = rows
+        self.ms = None
+        self.mem_mb = None
+
+    def to_dict(self):
+        return {'stage': self.name, 'depth': self.depth, 'rows': self.rows,
+                'ms': round(self.ms, 2), 'mem_mb': round(self.mem_mb, 2)}
+
+
+class Profiler:
+    # 한 번의 rerun 동안의 단계 기록 (Stage records of one rerun)
+
+    def __init__(self, session=None):
+        self.session = session
+        self.page = None
+        self.stages = []
+        self.total_ms = None
+        self._depth = 0
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        record = StageRecord(name, self._depth, rows)
+        self.stages.append(record)
+        self._depth += 1
+        mem_before = _rss_mb()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.ms = (time.perf_counter() - start) * 1000
+            record.mem_mb = _rss_mb() - mem_before
+            self._depth -= 1
+
+    def finish(self):
+        # 구조화 로그 한 줄 기록 (Emit one structured log line per rerun)
+        self.total_ms = (time.perf_counter() - self._start) * 1000
+        logger.info(json.dumps({
+            'event': 'rerun',
+            'ts': time.time(),
+            'session': self.session,
+            'page': self.page,
+            'total_ms': round(self.total_ms, 2),
+            'rss_mb': round(_rss_mb(), 1),
+            'stages': [s.to_dict() for s in self.stages if s.ms is not None],
+        }, ensure_ascii=False))
+        return self
+
+
+def _configure_logger():
+    if logger.handlers:
+        return
+    path = os.environ.get('DASHBOARD_PROFILE_LOG')
+    handler = logging.FileHandler(path, encoding='utf-8') if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def start_run(session=None):
+    # rerun 시작 시 호출, 비활성이면 None (Call at the start of a rerun; None when disabled)
+    if not ENABLED:
+        return None
+    _configure_logger()
+    profiler = Profiler(session)
+    _current.set(profiler)
+    return profiler
+
+
+def stage(name, rows=None):
+    # with stage('name') as s: ...; s.rows = n  (비활성 시 비용 없는 공유 객체 반환)
+    # (returns a shared no-op object when profiling is off)
+    profiler = _current.get()
+    if profiler is None:
+        return _NULL_STAGE
+    return profiler.stage(name, rows)
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+# 쌍 키 = 셀러 코드 << 32 | 구매자 코드 (Pair key = seller code << 32 | buyer code; stable while dictionaries grow)
+_UID_BITS = 32
+_UID_MASK = (1 << _UID_BITS) - 1
+
+
+def _encode(dictionary, values):
+    # 값을 사전 코드로 변환, 처음 보는 값은 사전 끝에 추가 (Codes in `dictionary`, unseen values are appended)
+    # 결측은 -1 (Missing values get -1)
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Index(np.asarray(uniques, dtype=object))
+    mapping = dictionary.get_indexer(uniques)
+    unseen = mapping < 0
+    if unseen.any():
+        mapping[unseen] = len(dictionary) + np.arange(unseen.sum())
+        dictionary = dictionary.append(uniques[unseen])
+    return dictionary, np.where(codes >= 0, np.append(mapping, -1)[codes], -1).astype(np.int64)
+
+
+class RetentionIndex:
+    # (구매자, 셀러) 쌍별 주문 수, 셀러 재구매율 계산용 (Order counts per (buyer, seller) pair, for repurchase rates)
+    #  - 구매자 / 셀러 사전은 배치가 들어올 때마다 늘어나며 기존 코드는 유지 (dictionaries only grow, codes are stable)
+    #  - update() 로 새 주문 배치를, merge() 로 다른 색인을 합침 (update() adds an order batch, merge() another index)
+    #  - 구매자 = 쌍 수, 재구매자 = 주문 2건 이상인 쌍 수 (buyers = pairs, repeat buyers = pairs with 2+ orders)
+
+    def __init__(self, uids=None, sellers=None):
+        self.uids = pd.Index([], dtype=object)
+        self.sellers = pd.Index([], dtype=object)
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self._stats = None
+        if uids is not None:
+            self.update(uids, sellers)
+
+    def update(self, uids, sellers):
+        # 주문 배치 추가, 구매자나 셀러가 결측인 행은 제외 (Add an order batch; rows missing either side are skipped)
+        self.uids, uid_codes = _encode(self.uids, uids)
+        self.sellers, seller_codes = _encode(self.sellers, sellers)
+        valid = (uid_codes >= 0) & (seller_codes >= 0)
+        keys = (seller_codes[valid] << _UID_BITS) | uid_codes[valid]
+        self._add(keys, np.ones(len(keys), dtype=np.int64))
+        return self
+
+    def merge(self, other):
+        # 다른 색인의 쌍 수를 더한 새 색인 (New index holding the pair counts of both)
+        merged = RetentionIndex()
+        merged.uids, merged.sellers = self.uids, self.sellers
+        merged.keys, merged.counts = self.keys, self.counts
+        merged.uids, uid_map = _encode(merged.uids, other.uids)
+        merged.sellers, seller_map = _encode(merged.sellers, other.sellers)
+        keys = (seller_map[other.keys >> _UID_BITS] << _UID_BITS) | uid_map[other.keys & _UID_MASK]
+        merged._add(keys, other.counts)
+        return merged
+
+    def _add(self, keys, counts):
+        if len(keys) == 0:
+            return
+        keys, inverse = np.unique(np.concatenate([self.keys, keys]), return_inverse=True)
+        self.counts = np.bincount(inverse, weights=np.concatenate([self.counts, counts]),
+                                  minlength=len(keys)).astype(np.int64)
+        self.keys = keys
+        self._stats = None
+
+    @property
+    def total_pairs(self):
+        return len(self.keys)
+
+    @property
+    def repeat_pairs(self):
+        return int((self.counts > 1).sum())
+
+    def seller_stats(self):
+        # 셀러별 구매자 수, 재구매자 수, 재구매율(%) (Buyers, repeat buyers and repurchase rate per seller)
+        if self._stats is None:
+            pair_seller = self.keys >> _UID_BITS
+            n_sellers = len(self.sellers)
+            buyers = np.bincount(pair_seller, minlength=n_sellers)
+            repeat = np.bincount(pair_seller, weights=self.counts > 1, minlength=n_sellers).astype(np.int64)
+            present = buyers > 0
+            with np.errstate(invalid='ignore', divide='ignore'):
+                rate = repeat / buyers * 100
+            self._stats = pd.DataFrame({
+                'Buyers': buyers[present],
+                'RepeatBuyers': repeat[present],
+                'RepurchaseRate': rate[present],
+            }, index=pd.Index(self.sellers[present], name='셀러명')).sort_index()
+        return self._stats
+
+    def top(self, min_buyers=1, n=None):
+        # 구매자 min_buyers 명 이상 셀러를 재구매율 내림차순, 동률은 셀러명 순
+        # (Sellers with at least min_buyers buyers, highest repurchase rate first; ties by seller name)
+        stats = self.seller_stats()
+        ranked = stats[stats['Buyers'] >= min_buyers].sort_values('RepurchaseRate', ascending=False, kind='stable')
+        return ranked.head(n) if n else ranked
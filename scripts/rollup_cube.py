@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from compact_layout import concat_frames
+
+# 큐브 차원 (Cube dimensions: every filter / group-by the dashboard offers, plus month)
+CUBE_DIMS = ['광역지역', '셀러명', '상품명', '과수 크기', '무게 구분', '이벤트 여부', 'YearMonth']
+
+# 합산 측정값 (Additive measures; 평균 단가는 합계 / 건수 로 복원)
+# (Additive measures; the average price is recovered as sum / count)
+CUBE_MEASURES = ['실결제 금액', '주문-취소 수량', '판매단가_sum', '판매단가_n', 'rows']
+
+# 저장된 큐브의 빌드 버전, build_cube / merge_cubes 를 바꾸면 올림
+# (Build version of persisted cubes; bump when build_cube / merge_cubes change)
+CUBE_VERSION = 1
+
+
+def build_cube(df):
+    # 주문 행을 차원 조합별로 미리 집계 (Pre-aggregate order rows per dimension combination)
+    dims = [c for c in CUBE_DIMS if c in df.columns]
+    price = pd.to_numeric(df['판매단가'], errors='coerce') if '판매단가' in df.columns \
+        else pd.Series(np.nan, index=df.index)
+    measures = pd.DataFrame({
+        '실결제 금액': df['실결제 금액'],
+        '주문-취소 수량': df['주문-취소 수량'],
+        '판매단가_sum': price.fillna(0),
+        '판매단가_n': price.notna().astype(np.int64),
+        'rows': np.ones(len(df), dtype=np.int64),
+    }, index=df.index)
+    keys = [df[c] for c in dims]
+    return measures.groupby(keys, dropna=False, sort=False, observed=True).sum().reset_index()
+
+
+def merge_cubes(*cubes):
+    # 큐브끼리 다시 합산 (Re-aggregate several cubes, e.g. the stored cube and a delta cube)
+    combined = concat_frames(cubes)
+    dims = [c for c in CUBE_DIMS if c in combined.columns]
+    return combined.groupby(dims, dropna=False, sort=False, observed=True)[CUBE_MEASURES].sum().reset_index()
+
+
+def filter_cube(cube, filters=None, products=None):
+    # 큐브 행 필터: filters {차원: 값}, products 허용 상품명 목록
+    # (Filter cube rows: equality filters plus an optional allowed product-name list)
+    mask = np.ones(len(cube), dtype=bool)
+    for col, value in (filters or {}).items():
+        mask &= (cube[col] == value).to_numpy()
+    if products is not None:
+        mask &= cube['상품명'].isin(products).to_numpy()
+    return cube[mask]
+
+
+def kpis(cube):
+    # 홈 KPI (Home KPIs: total revenue, total quantity, average unit price)
+    price_n = cube['판매단가_n'].sum()
+    return {
+        'total_sales': cube['실결제 금액'].sum(),
+        'total_orders': cube['주문-취소 수량'].sum(),
+        'avg_price': cube['판매단가_sum'].sum() / price_n if price_n else np.nan,
+        'rows': int(cube['rows'].sum()),
+    }
+
+
+def top_by(cube, col, measure='실결제 금액', n=None):
+    # col 별 재집계 후 내림차순 (Re-aggregate by `col`, largest first)
+    totals = cube.groupby(col, observed=True)[measure].sum()
+    return (totals.nlargest(n) if n else totals.sort_values(ascending=False)).reset_index()
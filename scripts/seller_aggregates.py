@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+# 셀러 집계가 읽는 원본 컬럼, 결제금액은 있으면 매출에 사용 (Source columns the seller aggregates read; 결제금액 is optional)
+AGGREGATE_COLUMNS = ['셀러명', '광역지역', '결제금액']
+
+# 누적 상태 테이블의 총 건수 / 총 매출 컬럼 (Total count and revenue columns of the running seller table)
+TOTAL_COL = '__total__'
+REVENUE_COL = '__revenue__'
+
+
+def to_numeric_amount(series):
+    # 콤마 제거 및 숫자형 변환 (Remove commas and convert to numeric)
+    # pandas 3 의 기본 str 타입도 문자열 (pandas 3 reads text as its default str dtype)
+    if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+        return series.str.replace(',', '').astype(float)
+    return series
+
+
+def build_seller_aggregates(df):
+    # 셀러 / 지역을 범주 코드로 바꾸고 셀러 x 지역 건수 행렬을 한 번만 계산하여 모든 분류 단계가 공유
+    # (Factorize seller and region once and build a seller x region count matrix shared by every stage)
+    seller_codes, sellers = pd.factorize(df['셀러명'], sort=True)
+    region_codes, regions = pd.factorize(df['광역지역'], sort=True)
+    n_sellers, n_regions = len(sellers), len(regions)
+
+    # 셀러명이 없는 행(-1)은 셀러 집계에서 제외 (Rows without a seller (-1) are not counted for any seller)
+    has_seller = seller_codes >= 0
+
+    # 지역이 없는 행은 마지막 열에 모아 총 건수에만 반영 (Missing regions go to a spare last column)
+    region_slot = np.where(region_codes >= 0, region_codes, n_regions)
+    flat = seller_codes[has_seller] * (n_regions + 1) + region_slot[has_seller]
+    counts = np.bincount(flat, minlength=n_sellers * (n_regions + 1)).reshape(n_sellers, n_regions + 1)
+    seller_totals = counts.sum(axis=1)
+    region_matrix = counts[:, :n_regions]
+
+    # 셀러별 총 매출액 (Total revenue per seller)
+    if '결제금액' in df.columns:
+        revenue = np.nan_to_num(to_numeric_amount(df['결제금액']).to_numpy(dtype=float)[has_seller])
+    else:
+        revenue = np.zeros(has_seller.sum())
+    seller_revenue = np.bincount(seller_codes[has_seller], weights=revenue, minlength=n_sellers)
+    return _aggregate_views(seller_codes, sellers, regions, seller_totals, region_matrix, seller_revenue)
+
+
+def _aggregate_views(seller_codes, sellers, regions, seller_totals, region_matrix, seller_revenue):
+    # 셀러 x 지역 행렬에서 분류 단계가 읽는 집계 형태를 만듦 (Views the stages read, derived from the matrix)
+    seller_revenue = pd.Series(seller_revenue, index=pd.Index(sellers, name='셀러명'))
+
+    # 셀러별 총 판매 건수 (Total sales count per seller)
+    seller_counts = pd.Series(seller_totals, index=pd.Index(sellers, name='셀러명')).sort_values(ascending=False)
+
+    # 셀러별 지역 판매 비중 (Regional sales share for each seller, long format)
+    s_idx, r_idx = np.nonzero(region_matrix)
+    seller_region_counts = pd.DataFrame({
+        '셀러명': sellers[s_idx],
+        '광역지역': regions[r_idx],
+        'count': region_matrix[s_idx, r_idx],
+        'total_sales': seller_totals[s_idx],
+    })
+    seller_region_counts['share'] = seller_region_counts['count'] / seller_region_counts['total_sales']
+
+    return {
+        'seller_codes': seller_codes,
+        'sellers': sellers,
+        'regions': regions,
+        'seller_totals': seller_totals,
+        'region_matrix': region_matrix,
+        'seller_counts': seller_counts,
+        'seller_revenue': seller_revenue,
+        'seller_region_counts': seller_region_counts,
+    }
+
+
+def seller_table(aggregates):
+    # 셀러별 지역 건수 + 총 건수 + 총 매출을 한 프레임으로, 일별 추가분과 더해 누적 상태로 사용
+    # (Per-seller region counts, total count and revenue in one frame; summed with daily deltas as running state)
+    table = pd.DataFrame(aggregates['region_matrix'], index=pd.Index(aggregates['sellers'], name='셀러명'),
+                         columns=pd.Index(aggregates['regions'], dtype=object))
+    table[TOTAL_COL] = aggregates['seller_totals']
+    table[REVENUE_COL] = aggregates['seller_revenue'].to_numpy()
+    return table
+
+
+def merge_seller_tables(table, delta):
+    # 두 누적 상태의 합, 셀러 / 지역은 합집합을 정렬 순서로 (Sum of two states over the sorted union of sellers and regions)
+    merged = table.add(delta, fill_value=0).fillna(0).sort_index()
+    counts = [c for c in merged.columns if c != REVENUE_COL]
+    return merged.astype({c: np.int64 for c in counts})
+
+
+def table_aggregates(table, df):
+    # 누적 상태에서 build_seller_aggregates 와 같은 형태의 집계, df 행은 상태의 셀러 코드로 연결
+    # (Aggregates shaped like build_seller_aggregates from a running state; df rows are coded against its sellers)
+    # 지역 열은 factorize(sort=True) 와 같은 정렬 순서 (Region columns in the same sorted order as the full build)
+    sellers = pd.Index(table.index, dtype=object)
+    regions = pd.Index(sorted(c for c in table.columns if c not in (TOTAL_COL, REVENUE_COL)), dtype=object)
+    region_matrix = table[list(regions)].to_numpy(dtype=np.int64).reshape(len(sellers), len(regions))
+    return _aggregate_views(sellers.get_indexer(df['셀러명']), sellers, regions,
+                            table[TOTAL_COL].to_numpy(dtype=np.int64), region_matrix,
+                            table[REVENUE_COL].to_numpy(dtype=float))
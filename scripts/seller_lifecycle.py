@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+
+from distinct_sketch import DEFAULT_ERROR, DistinctSketch, estimate_registers
+
+# 지원하는 집계 단위 (Supported granularities: pandas period frequencies)
+FREQS = {'M': '월', 'W': '주', 'D': '일'}
+
+
+def _seller_codes(sellers):
+    # 셀러명 코드화, 결측도 하나의 셀러로 취급 (기존 집합 연산과 동일)
+    # (Seller codes; a missing name counts as one seller, as the previous set logic did)
+    if isinstance(sellers.dtype, pd.CategoricalDtype):
+        codes = sellers.cat.codes.to_numpy().astype(np.int64)
+        uniques = sellers.cat.categories
+        if (codes < 0).any():
+            codes = np.where(codes < 0, len(uniques), codes)
+            uniques = uniques.append(pd.Index([np.nan]))
+        return codes, uniques
+    return pd.factorize(sellers, use_na_sentinel=False)
+
+
+def _period_codes(dates, freq):
+    # 날짜를 일 단위 정수로 바꾼 뒤 고유 일자만 기간으로 변환
+    # (Dates become day numbers and only the distinct days are mapped to periods)
+    # 반환: 날짜가 있는 행 마스크, 그 행들의 관측 기간 코드, 관측 기간 (주문이 있는 기간만)
+    # (Returns the mask of dated rows, their observed-period codes, and the observed periods, those with orders)
+    days = dates.to_numpy().astype('datetime64[D]')
+    valid = ~np.isnat(days)
+    if not valid.any():
+        return valid, np.empty(0, dtype=np.int64), pd.PeriodIndex([], freq=freq)
+    day_numbers = days[valid].view(np.int64)
+    low = day_numbers.min()
+    day_codes = day_numbers - low
+    span = int(day_codes.max()) + 1
+    used = np.bincount(day_codes, minlength=span) > 0
+    day_periods = pd.period_range(pd.Timestamp(low, unit='D'), periods=span, freq='D').asfreq(freq)
+    observed = np.unique(day_periods.asi8[used])
+    day_to_period = np.searchsorted(observed, day_periods.asi8)
+    return valid, day_to_period[day_codes], day_periods[used].unique()
+
+
+class SellerLifecycle:
+    # 셀러 x 기간 활동 비트맵 기반 생애주기 엔진 (Seller lifecycle engine over a seller x period activity bitmap)
+    #  - 비트맵은 한 번만 만들고 모든 지표는 벡터 연산으로 도출 (bitmap built once, every metric is vectorized)
+    #  - 주문이 없는 기간은 제외, 기존 월별 집합 비교와 같은 의미 (periods without any order are dropped,
+    #    matching the previous month-by-month set comparison)
+
+    def __init__(self, sellers, periods):
+        # sellers: 셀러명, periods: 같은 주기의 Period 값 (same-frequency Period values); 기간 결측 행은 제외
+        periods = pd.PeriodIndex(periods)
+        valid = ~periods.isna()
+        seller_codes, seller_uniques = _seller_codes(pd.Series(sellers).iloc[valid])
+        _, first, period_codes = np.unique(periods.asi8[valid], return_index=True, return_inverse=True)
+        self._build(seller_codes, seller_uniques, period_codes, periods[valid][first])
+
+    @classmethod
+    def from_orders(cls, df, freq='M', seller_col='셀러명', date_col='주문일'):
+        # 주문 행에서 바로 생성: 날짜는 일 단위 정수로 바꾼 뒤 고유 일자만 기간으로 변환
+        # (Fast path from order rows: dates become day numbers and only the distinct days are mapped to periods)
+        self = cls.__new__(cls)
+        valid, period_codes, periods = _period_codes(df[date_col], freq)
+        seller_codes, seller_uniques = _seller_codes(df[seller_col])
+        self._build(seller_codes[valid], seller_uniques, period_codes, periods)
+        return self
+
+    def _build(self, seller_codes, seller_uniques, period_codes, periods):
+        bitmap = np.zeros((len(seller_uniques), len(periods)), dtype=bool)
+        bitmap[seller_codes, period_codes] = True
+        # 해당 기간에 주문이 없는 셀러는 제외 (Sellers without orders in range are dropped)
+        active = bitmap.any(axis=1)
+        self.bitmap = bitmap[active]
+        self.sellers = pd.Index(seller_uniques)[active]
+        self.periods = periods
+
+        # 처음 / 마지막 활동 기간 위치 (Positions of the first and last active period)
+        self.first_seen = self.bitmap.argmax(axis=1)
+        self.last_seen = self.bitmap.shape[1] - 1 - self.bitmap[:, ::-1].argmax(axis=1)
+
+    def summary(self):
+        # 기간별 활동 / 신규 / 이탈 / 유지 / 복귀 셀러 수 (Active, new, churned, retained and reactivated per period)
+        #  - 유지: 직전 기간과 이번 기간 모두 활동 (retained: active in the previous period and now)
+        #  - 이탈: 직전 기간에 활동, 이번 기간 비활동 = 직전 활동 - 유지 (churned = previous active - retained)
+        #  - 복귀: 이전에 활동했고 직전 기간은 비활동 = 활동 - 신규 - 유지 (reactivated = active - new - retained)
+        n_periods = len(self.periods)
+        active = self.bitmap.sum(axis=0)
+        new = np.bincount(self.first_seen, minlength=n_periods)[:n_periods]
+        retained = np.zeros(n_periods, dtype=np.int64)
+        retained[1:] = (self.bitmap[:, 1:] & self.bitmap[:, :-1]).sum(axis=0)
+        churned = np.zeros(n_periods, dtype=np.int64)
+        churned[1:] = active[:-1] - retained[1:]
+        return pd.DataFrame({
+            'Period': self.periods,
+            'Active': active,
+            'New': new,
+            'Churned': churned,
+            'Retained': retained,
+            'Reactivated': active - new - retained,
+        })
+
+    def seller_table(self):
+        # 셀러별 첫 / 마지막 활동 기간과 활동 기간 수 (First / last active period and active period count per seller)
+        return pd.DataFrame({
+            'first_seen': self.periods[self.first_seen],
+            'last_seen': self.periods[self.last_seen],
+            'active_periods': self.bitmap.sum(axis=1),
+        }, index=pd.Index(self.sellers, name='셀러명'))
+
+    def cohort_matrix(self, share=True):
+        # 첫 활동 기간(코호트) x 경과 기간별 활동 셀러 수, share=True 면 코호트 크기 대비 %
+        # (Cohort by first-seen period x periods since then; share=True gives % of the cohort size)
+        # 경과 기간은 달력 기준, 주문이 없는 기간도 한 칸으로 셈 (Offsets count calendar periods, empty ones included)
+        order = np.argsort(self.first_seen, kind='stable')
+        cohorts, starts, sizes = np.unique(self.first_seen[order], return_index=True, return_counts=True)
+        if len(cohorts) == 0:
+            return pd.DataFrame(columns=['Size'], index=pd.Index(self.periods[:0], name='Cohort'))
+        # 관측 기간을 첫 기간부터 마지막 기간까지의 달력 위치로 (Observed periods placed on the full calendar range)
+        calendar = pd.period_range(self.periods[0], self.periods[-1], freq=self.periods.freq)
+        position = self.periods.asi8 - calendar.asi8[0]
+        n_periods = len(calendar)
+        # 코호트별 기간 합계를 구한 뒤 코호트 시작 기준으로 왼쪽 정렬 (Per-cohort column sums, then left-aligned)
+        by_period = np.zeros((len(cohorts), n_periods), dtype=np.int64)
+        by_period[:, position] = np.add.reduceat(self.bitmap[order], starts, axis=0, dtype=np.int64)
+        offsets = np.arange(n_periods)
+        columns = position[cohorts][:, None] + offsets[None, :]
+        # 관측 가능한 기간이 지난 칸은 NaN (Cells beyond the last observed period are NaN)
+        inside = columns < n_periods
+        values = np.full((len(cohorts), n_periods), np.nan)
+        values[inside] = np.take_along_axis(by_period, np.minimum(columns, n_periods - 1), axis=1)[inside]
+        if share:
+            values = values / sizes[:, None] * 100
+        matrix = pd.DataFrame(values, index=pd.Index(self.periods[cohorts], name='Cohort'),
+                              columns=pd.RangeIndex(n_periods, name='Offset'))
+        matrix.insert(0, 'Size', sizes)
+        return matrix
+
+
+class ApproxLifecycle:
+    # 기간별 셀러 HyperLogLog 스케치로 근사한 생애주기 지표 (Lifecycle counts approximated from per-period seller sketches)
+    #  - 활동 = 기간별 추정, 신규 = 누적 합집합 추정의 증가분 (active per period; new = growth of the running union)
+    #  - 유지 = |이번| + |직전| - |이번 ∪ 직전| (retained by inclusion-exclusion over the two periods' union)
+    #  - 청크 / 파티션별로 만들어 merge() 로 합침 (built per chunk or partition and combined with merge())
+    #  - 셀러명 결측은 세지 않음, 코호트 행렬은 SellerLifecycle 만 제공
+    #    (missing seller names are not counted; the cohort matrix is only offered by SellerLifecycle)
+
+    def __init__(self, sketch, freq):
+        self.sketch = sketch
+        self.freq = freq
+
+    @classmethod
+    def from_orders(cls, df, freq='M', seller_col='셀러명', date_col='주문일', error=DEFAULT_ERROR):
+        # 기간은 Period 서수로 묶음 (Periods are grouped by their ordinals)
+        valid, period_codes, periods = _period_codes(df[date_col], freq)
+        frame = pd.DataFrame({'Period': periods.asi8[period_codes], seller_col: df[seller_col].to_numpy()[valid]})
+        return cls(DistinctSketch.build(frame, ['Period'], seller_col, error), freq)
+
+    @property
+    def relative_error(self):
+        return self.sketch.relative_error
+
+    def merge(self, other):
+        return ApproxLifecycle(self.sketch.merge(other.sketch), self.freq)
+
+    def summary(self):
+        # SellerLifecycle.summary() 와 같은 형태의 추정치 (Estimates shaped like SellerLifecycle.summary())
+        periods = pd.PeriodIndex.from_ordinals(self.sketch.keys['Period'].to_numpy(dtype=np.int64), freq=self.freq)
+        dense = self.sketch.dense()
+        active = np.rint(estimate_registers(dense)).astype(np.int64)
+        seen = np.rint(estimate_registers(np.maximum.accumulate(dense, axis=0))).astype(np.int64)
+        new = np.clip(np.diff(seen, prepend=0), 0, active)
+        retained = np.zeros(len(periods), dtype=np.int64)
+        if len(periods) > 1:
+            union = np.rint(estimate_registers(np.maximum(dense[1:], dense[:-1]))).astype(np.int64)
+            retained[1:] = np.clip(active[1:] + active[:-1] - union, 0, np.minimum(active[1:], active[:-1]))
+        churned = np.zeros(len(periods), dtype=np.int64)
+        churned[1:] = active[:-1] - retained[1:]
+        return pd.DataFrame({
+            'Period': periods,
+            'Active': active,
+            'New': new,
+            'Churned': churned,
+            'Retained': retained,
+            'Reactivated': np.maximum(active - new - retained, 0),
+        })
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from classify_pipeline import append_delta, run_pipeline
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'orders.csv')
+
+
+@pytest.mark.parametrize('with_region', [False, True])
+def test_append_matches_full_run(tmp_path, with_region):
+    orders = pd.read_csv(FIXTURE)
+    history, delta = orders.iloc[:4], orders.iloc[4:]
+    stage_options = {'seller_type': {'with_region': with_region}}
+    output = tmp_path / 'classification_results.csv'
+    run_pipeline(history, report=False, stage_options=stage_options).to_csv(output, index=False)
+
+    result = append_delta(delta, output, stage_options=stage_options, cache_dir=tmp_path / 'cache')
+
+    expected = tmp_path / 'full.csv'
+    run_pipeline(orders, report=False, stage_options=stage_options).to_csv(expected, index=False)
+    pd.testing.assert_frame_equal(pd.read_csv(output), pd.read_csv(expected))
+    # 제주농원0006 은 지역 비중이 절반 아래로 내려가 기존 행도 일반 셀러가 됨
+    # (제주농원0006 drops below the regional share, so its stored rows change type too)
+    assert '제주농원0006' in result['changed'].index
+    assert result['relabelled'] >= 1
+
+
+def test_append_without_label_changes_only_appends(tmp_path):
+    orders = pd.read_csv(FIXTURE)
+    output = tmp_path / 'classification_results.csv'
+    run_pipeline(orders, report=False).to_csv(output, index=False)
+    before = output.read_bytes()
+
+    result = append_delta(orders.iloc[:0], output, cache_dir=tmp_path / 'cache')
+
+    assert result['relabelled'] == 0
+    assert output.read_bytes() == before
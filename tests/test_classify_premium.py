@@ -0,0 +1,69 @@
+import contextlib
+import io
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from classify_premium import RULES_PATH, classify_premium, premium_columns, print_premium_summary
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'orders.csv')
+
+
+def reference_premium(df):
+    # 규칙 설정 파일 이전의 하드코딩 분류 (The hard-coded classification the rule config replaced)
+    gift = (df['상품명'].str.contains('선물세트|선물용', na=False)
+            | df['고객선택옵션'].str.contains('선물세트|선물용', na=False))
+    tangerine = (df['품종'] == '감귤') & (df['과수 크기'] == '로얄과')
+    mangamryu = df['품종'].isin(['황금향', '한라봉', '레드향', '천혜향']) & df['과수 크기'].isin(['중과', '중대과', '대과'])
+    return np.where(gift | tangerine | mangamryu, '프리미엄', '일반')
+
+
+@pytest.fixture(scope='module')
+def orders():
+    df = pd.read_csv(FIXTURE)
+    # 결측 값과 반복 행으로 튜플 묶음 경로도 확인 (Missing values and repeated rows exercise the tuple grouping)
+    df = pd.concat([df, df.iloc[[0, 2]]], ignore_index=True)
+    df.loc[len(df) - 1, ['상품명', '품종']] = np.nan
+    return df
+
+
+def test_default_rules_match_reference(orders):
+    columns = classify_premium(orders)
+    assert list(columns) == ['is_premium']
+    assert columns['is_premium'].tolist() == reference_premium(orders).tolist()
+
+
+def test_with_rule_names_the_first_matching_rule(orders):
+    columns = classify_premium(orders, with_rule=True)
+    names = pd.Series(columns['premium_rule'])
+    assert (names.notna() == (columns['is_premium'] == '프리미엄')).all()
+    gift = (orders['상품명'].str.contains('선물세트|선물용', na=False)
+            | orders['고객선택옵션'].str.contains('선물세트|선물용', na=False))
+    assert (names[gift.to_numpy()] == '선물세트').all()
+
+
+def test_custom_label_is_used_by_summary(orders, tmp_path):
+    with open(RULES_PATH, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    config.update(label='P', default='N')
+    rules_path = tmp_path / 'rules.json'
+    rules_path.write_text(json.dumps(config, ensure_ascii=False), encoding='utf-8')
+
+    columns = classify_premium(orders, rules_path=str(rules_path))
+    expected = np.where(reference_premium(orders) == '프리미엄', 'P', 'N')
+    assert columns['is_premium'].tolist() == expected.tolist()
+
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        print_premium_summary(orders.assign(**columns), rules_path=str(rules_path))
+    examples = buffer.getvalue().split('(Premium Product Examples) ---')[1]
+    assert orders.loc[expected == 'P', '상품명'].iloc[0] in examples
+
+
+def test_premium_columns_cover_rules_and_summary():
+    assert set(premium_columns()) == {'상품명', '고객선택옵션', '품종', '과수 크기'}
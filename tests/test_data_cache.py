@@ -0,0 +1,129 @@
+import os
+import shutil
+import sys
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from data_cache import _write_atomic, load_bundle, load_cached, store_bundle
+from ingest import clean_orders, read_orders
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'orders.csv')
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'orders.csv'
+    shutil.copy(FIXTURE, path)
+    return str(path)
+
+
+def build(df):
+    return clean_orders(df)
+
+
+def assert_same_frame(cached, expected):
+    # 숫자 / 날짜는 타입까지, 문자열은 값만 비교 (Arrow 왕복 후 결측 표기와 pandas 3 의 str 타입이 다를 수 있음)
+    # (Numbers and dates must keep their dtypes; text compares by value, since the Arrow round trip may
+    #  change the missing marker and pandas 3's str dtype)
+    numeric = [c for c in expected.columns if expected[c].dtype.kind in 'iufM']
+    text = [c for c in expected.columns if c not in numeric]
+    pd.testing.assert_frame_equal(cached[numeric], expected[numeric])
+    pd.testing.assert_frame_equal(cached[text].astype(object).fillna(''), expected[text].astype(object).fillna(''))
+
+
+def test_cache_matches_fresh_build(source, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    expected = build(read_orders(source))
+    cold = load_cached(source, build, 'orders', cache_dir=cache_dir, read_fn=read_orders)
+    warm = load_cached(source, build, 'orders', cache_dir=cache_dir, read_fn=read_orders)
+    assert_same_frame(cold, expected)
+    assert_same_frame(warm, expected)
+    assert warm.attrs['dataset_version'] == cold.attrs['dataset_version']
+
+
+def test_append_rebuilds_only_the_tail(source, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    load_cached(source, build, 'orders', cache_dir=cache_dir, read_fn=read_orders)
+    with open(FIXTURE, 'rb') as f:
+        rows = f.read().split(b'\n', 1)[1]
+    with open(source, 'ab') as f:
+        f.write(rows)
+
+    built = []
+    df = load_cached(source, lambda raw: built.append(len(raw)) or build(raw), 'orders',
+                     cache_dir=cache_dir, read_fn=read_orders)
+    assert built == [7]
+    assert_same_frame(df, build(read_orders(source)))
+    assert [rows for _, rows in df.attrs['dataset_lineage']] == [7, 14]
+
+
+def test_source_changes_invalidate_the_cache(source, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    load_cached(source, build, 'orders', cache_dir=cache_dir, read_fn=read_orders)
+    with open(source, 'r', encoding='utf-8') as f:
+        text = f.read()
+    with open(source, 'w', encoding='utf-8') as f:
+        f.write(text.replace('제주농원0006', '제주농원9999'))
+    df = load_cached(source, build, 'orders', cache_dir=cache_dir, read_fn=read_orders)
+    assert_same_frame(df, build(read_orders(source)))
+    assert len(df.attrs['dataset_lineage']) == 1
+
+
+def test_concurrent_writers_do_not_collide(tmp_path):
+    path = str(tmp_path / 'data.txt')
+    payloads = [f'writer {i}\n' * 1000 for i in range(8)]
+    errors = []
+
+    def write(payload):
+        def write_fn(p):
+            with open(p, 'w', encoding='utf-8') as f:
+                f.write(payload[:len(payload) // 2])
+                time.sleep(0.01)
+                f.write(payload[len(payload) // 2:])
+        try:
+            _write_atomic(path, write_fn)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(p,)) for p in payloads]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    with open(path, 'r', encoding='utf-8') as f:
+        assert f.read() in payloads
+    assert os.listdir(tmp_path) == ['data.txt']
+
+
+def test_bundle_store_swaps_whole_bundles(tmp_path):
+    cache_dir = str(tmp_path)
+    store_bundle('snap', {'a': pd.DataFrame({'x': [1]}), 'b': pd.DataFrame({'x': [2]})}, {'v': 1}, cache_dir)
+    store_bundle('snap', {'a': pd.DataFrame({'x': [3]})}, {'v': 2}, cache_dir)
+    assert load_bundle('snap', match={'v': 1}, cache_dir=cache_dir) is None
+    bundle = load_bundle('snap', match={'v': 2}, cache_dir=cache_dir)
+    assert list(bundle) == ['a'] and bundle['a']['x'].tolist() == [3]
+    # 이전 저장의 항목 파일은 정리됨 (Item files of the previous store are removed)
+    assert len(os.listdir(tmp_path / 'snap')) == 2
+
+
+def test_concurrent_bundle_stores_stay_consistent(tmp_path):
+    cache_dir = str(tmp_path)
+
+    def store(i):
+        frames = {key: pd.DataFrame({'writer': [i] * 100}) for key in 'abcd'}
+        store_bundle('snap', frames, {'writer': i}, cache_dir)
+
+    threads = [threading.Thread(target=store, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    bundle = load_bundle('snap', cache_dir=cache_dir)
+    writers = {int(df['writer'].iloc[0]) for df in bundle.values()}
+    assert len(writers) == 1
+    assert load_bundle('snap', match={'writer': writers.pop()}, cache_dir=cache_dir) is not None
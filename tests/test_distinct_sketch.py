@@ -0,0 +1,79 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from distinct_sketch import DistinctSketch, expected_error
+from ingest import clean_orders, read_orders
+from seller_lifecycle import ApproxLifecycle, SellerLifecycle
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'orders.csv')
+
+
+@pytest.fixture(scope='module')
+def orders():
+    return clean_orders(read_orders(FIXTURE))
+
+
+@pytest.fixture(scope='module')
+def history(orders):
+    # 픽스처 주문을 반복해 구매자 수를 늘린 이력 (The fixture orders repeated with many more buyers)
+    rng = np.random.default_rng(0)
+    df = orders.iloc[rng.integers(0, len(orders), 60_000)].reset_index(drop=True)
+    df['UID'] = 'U' + pd.Series(rng.integers(0, 20_000, len(df))).astype(str)
+    return df
+
+
+def within_bound(estimate, exact, relative_error):
+    # 상대 표준 오차의 3배 이내 (Within three relative standard errors)
+    return abs(estimate - exact) <= 3 * relative_error * exact + 1
+
+
+@pytest.mark.parametrize('error', [0.01, 0.05])
+def test_estimates_match_nunique_on_fixture(orders, error):
+    sketch = DistinctSketch.build(orders, ['셀러명'], 'UID', error=error)
+    exact = orders.groupby('셀러명')['UID'].nunique()
+    estimates = pd.Series(sketch.estimates(), index=sketch.keys['셀러명'])
+    assert (estimates.round() == exact.loc[estimates.index]).all()
+    assert round(sketch.estimate()) == orders['UID'].nunique()
+
+
+@pytest.mark.parametrize('error', [0.01, 0.02, 0.05])
+def test_error_bound_against_nunique(history, error):
+    sketch = DistinctSketch.build(history, ['셀러명', '광역지역'], 'UID', error=error)
+    assert sketch.relative_error == pytest.approx(expected_error(error))
+    assert sketch.relative_error <= error
+    assert within_bound(sketch.estimate(), history['UID'].nunique(), sketch.relative_error)
+    by_seller = sketch.rollup(['셀러명'])
+    exact = history.groupby('셀러명')['UID'].nunique()
+    for seller, estimate in zip(by_seller.keys['셀러명'], by_seller.estimates()):
+        assert within_bound(estimate, exact[seller], sketch.relative_error)
+
+
+def test_merge_equals_build_over_both(history):
+    half = len(history) // 2
+    dims = ['셀러명', '광역지역']
+    merged = DistinctSketch.build(history.iloc[:half], dims, 'UID').merge(
+        DistinctSketch.build(history.iloc[half:], dims, 'UID'))
+    whole = DistinctSketch.build(history, dims, 'UID')
+    pd.testing.assert_frame_equal(merged.keys, whole.keys)
+    np.testing.assert_array_equal(merged.slots, whole.slots)
+    np.testing.assert_array_equal(merged.ranks, whole.ranks)
+
+
+def test_mask_estimate_matches_filtered_nunique(history):
+    sketch = DistinctSketch.build(history, ['셀러명', '광역지역'], 'UID')
+    region = history['광역지역'].dropna().iloc[0]
+    exact = history.loc[history['광역지역'] == region, 'UID'].nunique()
+    assert within_bound(sketch.estimate((sketch.keys['광역지역'] == region).to_numpy()), exact, sketch.relative_error)
+
+
+@pytest.mark.parametrize('freq', ['M', 'W', 'D'])
+def test_approx_lifecycle_matches_exact_on_fixture(orders, freq):
+    # 셀러 수가 작으면 선형 계수 구간이라 정확값과 같음 (Small counts fall in the linear-counting range and are exact)
+    dated = orders[orders['셀러명'].notna()]
+    expected = SellerLifecycle.from_orders(dated, freq).summary()
+    pd.testing.assert_frame_equal(ApproxLifecycle.from_orders(dated, freq).summary(), expected)
@@ -0,0 +1,63 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from compact_layout import compact_frame
+from filter_index import FilterIndex
+from ingest import clean_orders, read_orders
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'orders.csv')
+
+
+@pytest.fixture(scope='module')
+def orders():
+    df = clean_orders(read_orders(FIXTURE))
+    # 결측 상품명 / 지역이 있는 행 (Rows with a missing product name and region)
+    df = pd.concat([df, df.iloc[[1, 3]]], ignore_index=True)
+    df.loc[len(df) - 2, '상품명'] = np.nan
+    df.loc[len(df) - 1, '광역지역'] = np.nan
+    return df
+
+
+def reference_rows(df, filters, search):
+    # 색인 이전 교차 분석의 불리언 마스크 필터 (The Drill Down boolean-mask filtering the index replaced)
+    mask = pd.Series(True, index=df.index)
+    for col, value in filters.items():
+        mask &= df[col] == value
+    if search:
+        mask &= df['상품명'].str.contains(search, case=False, na=False)
+    return np.flatnonzero(mask.to_numpy())
+
+
+SEARCHES = ['감귤', '귤', '레드향', 'KG', '15kg', 'k', '로얄', '[제주]', '감귤|레드', r'\d+kg', '^\\[서귀포', '없는상품']
+
+
+@pytest.mark.parametrize('search', SEARCHES)
+def test_search_matches_str_contains(orders, search):
+    np.testing.assert_array_equal(FilterIndex(orders).select(search=search), reference_rows(orders, {}, search))
+
+
+@pytest.mark.parametrize('filters', [{'광역지역': '서울특별시'}, {'셀러명': '성산농장0011'},
+                                     {'광역지역': '경상남도', '과수 크기': '로얄과'}, {'광역지역': '없는지역'}])
+@pytest.mark.parametrize('search', ['', '감귤', 'kg', '감귤|레드'])
+def test_filters_match_boolean_masks(orders, filters, search):
+    rows = FilterIndex(orders).select(filters, search)
+    np.testing.assert_array_equal(rows, reference_rows(orders, filters, search))
+
+
+def test_no_conditions_selects_everything(orders):
+    assert FilterIndex(orders).select() is None
+    assert FilterIndex(orders).select({'없는컬럼': 'x'}) is None
+
+
+def test_compact_frame_gives_the_same_rows(orders):
+    # 범주형으로 압축한 데이터셋도 같은 결과 (The compact, categorical dataset selects the same rows)
+    index, compact = FilterIndex(orders), FilterIndex(compact_frame(orders))
+    for search in SEARCHES:
+        np.testing.assert_array_equal(compact.select({'광역지역': '서울특별시'}, search),
+                                      index.select({'광역지역': '서울특별시'}, search))
+    assert compact.options('광역지역') == index.options('광역지역')
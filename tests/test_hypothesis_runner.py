@@ -0,0 +1,59 @@
+import contextlib
+import io
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from eda_analysis import HYPOTHESES, clean_data
+from hypothesis_runner import Hypothesis, run_hypotheses
+from ingest import read_orders
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'orders.csv')
+
+
+@pytest.fixture(scope='module')
+def valid_sales():
+    return clean_data(read_orders(FIXTURE))[1]
+
+
+def printed(h, df):
+    # 가설을 직접 실행했을 때의 출력 (The report printed by running the hypothesis directly)
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        h.report(h.partial(df))
+    return buffer.getvalue()
+
+
+def test_sequential_results_follow_input_order():
+    # 선행 가설이 뒤에 있어도 결과는 입력 순서 (Input order even when a prerequisite comes later)
+    noop = Hypothesis('A', lambda df: len(df), lambda state: None, [], after=('B',))
+    first = noop._replace(label='B', after=())
+    results = run_hypotheses(pd.DataFrame({'x': [1]}), [noop, first], jobs=1)
+    assert list(results) == ['A', 'B']
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_runner_matches_direct_reports(valid_sales, jobs):
+    results = run_hypotheses(valid_sales, HYPOTHESES, jobs=jobs)
+    assert list(results) == [h.label for h in HYPOTHESES]
+    for h in HYPOTHESES:
+        assert results[h.label]['output'] == printed(h, valid_sales)
+
+
+def test_region_seller_state_matches_pandas(valid_sales):
+    state = run_hypotheses(valid_sales, HYPOTHESES[:1], jobs=2)['H1']['state']
+    gyeonggi = valid_sales[valid_sales['광역지역'].str.contains('경기', na=False)]
+    assert state['total_sales'] == gyeonggi['실결제 금액'].sum()
+    pd.testing.assert_series_equal(state['seller_sales'], gyeonggi.groupby('셀러명')['실결제 금액'].sum())
+
+
+def test_mixed_type_columns_fall_back_to_pickling(valid_sales):
+    # Arrow 로 쓸 수 없는 object 컬럼 (An object column Arrow cannot write)
+    mixed = valid_sales.copy()
+    mixed['무게 구분'] = mixed['무게 구분'].astype(object)
+    mixed.iloc[0, mixed.columns.get_loc('무게 구분')] = 3
+    results = run_hypotheses(mixed, HYPOTHESES, jobs=2)
+    assert results['H7']['output'] == printed(HYPOTHESES[-1], mixed)
@@ -0,0 +1,81 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from ingest import (DATE_COLS, NUMERIC_COLS, clean_orders, declare_dtype, parse_dates, parse_numeric, read_orders,
+                    write_with_columns)
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'orders.csv')
+
+
+def reference_clean(df):
+    # 공유 파서 이전 로더의 정제 (The per-loader cleaning that scripts/ingest.py replaced)
+    for col in NUMERIC_COLS:
+        if col in df.columns and (pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col])):
+            try:
+                df[col] = df[col].str.replace(',', '').astype(float)
+            except (ValueError, TypeError, AttributeError):
+                pass
+    for col in DATE_COLS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    return df
+
+
+def test_clean_orders_matches_reference():
+    parsed = clean_orders(read_orders(FIXTURE))
+    expected = reference_clean(pd.read_csv(FIXTURE))
+    columns = [c for c in NUMERIC_COLS + DATE_COLS if c in expected.columns]
+    # 값은 같고 타입만 선언 타입으로 좁혀짐 (Same values; only the dtypes are narrowed to the declared ones)
+    pd.testing.assert_frame_equal(parsed[columns], expected[columns], check_dtype=False)
+
+
+def test_comma_numbers_are_parsed():
+    parsed = clean_orders(read_orders(FIXTURE))
+    assert parsed['실결제 금액'].dtype == np.int32
+    assert parsed['실결제 금액'].tolist()[:4] == [47900.0, 0.0, 143700.0, 1250000.0]
+    assert parsed['공급단가'].isna().tolist() == [False, False, False, True, False, False, False]
+    # 결측이 있는 컬럼은 float64 유지 (Columns with NaN stay float64)
+    assert parsed['공급단가'].dtype == np.float64
+
+
+def test_declare_dtype_is_lossless():
+    assert declare_dtype(pd.Series([1.0, 2.0]), np.int32).dtype == np.int32
+    for values in ([1.5, 2.0], [1.0, np.nan], [3e9, 1.0]):
+        series = pd.Series(values)
+        assert declare_dtype(series, np.int32) is series
+
+
+@pytest.mark.parametrize('values', [
+    ['2024-03-27 15:45:00', '2024-03-28 01:02:03', None],
+    ['2024-03-27', '2024-03-28', ''],
+    ['2024.03.27', '2024.03.28', '2024.13.01'],
+    ['2024-03-27 15:45:00', '2024-03-28', 'not a date'],
+])
+def test_parse_dates_matches_to_datetime(values):
+    series = pd.Series(values * 3, dtype=object, name='주문일')
+    pd.testing.assert_series_equal(parse_dates(series), pd.to_datetime(series, errors='coerce'))
+
+
+def test_parsed_columns_are_left_alone():
+    numbers = pd.Series([1.5, 2.0])
+    assert parse_numeric(numbers) is numbers
+    text = pd.Series(['abc', '1,000'])
+    assert parse_numeric(text) is text
+
+
+def test_write_with_columns_copies_source_text(tmp_path):
+    # 투영해서 읽은 프레임의 라벨을 붙여도 원본 컬럼은 표기 그대로 (Labels from a projected read; source columns keep their text)
+    df = read_orders(FIXTURE, usecols=['셀러명'])
+    output = tmp_path / 'out.csv'
+    write_with_columns(FIXTURE, output, {'label': df['셀러명'].str[:2], '목적': ['x'] * len(df)}, chunksize=3)
+    source = pd.read_csv(FIXTURE, dtype=str, keep_default_na=False)
+    written = pd.read_csv(output, dtype=str, keep_default_na=False)
+    assert list(written.columns) == list(source.columns) + ['label']
+    pd.testing.assert_frame_equal(written.drop(columns=['label', '목적']), source.drop(columns=['목적']))
+    assert written['label'].tolist() == source['셀러명'].str[:2].tolist()
+    assert (written['목적'] == 'x').all()
@@ -0,0 +1,69 @@
+import os
+import re
+import sys
+from collections import Counter
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from filter_index import FilterIndex
+from ingest import clean_orders, read_orders
+from keyword_index import KeywordIndex
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'orders.csv')
+
+
+@pytest.fixture(scope='module')
+def orders():
+    df = clean_orders(read_orders(FIXTURE))
+    # 결측 상품명도 한 행 (One row with a missing product name)
+    df.loc[len(df)] = df.iloc[0]
+    df.loc[len(df) - 1, '상품명'] = np.nan
+    return df
+
+
+def test_counts_match_counter(orders):
+    # 이전 render_details 의 행별 re.findall + Counter (The former per-row re.findall + Counter)
+    keywords = orders['상품명'].apply(lambda text: re.findall(r'[가-힣]+', str(text)))
+    expected = Counter(word for words in keywords for word in words)
+    stats = KeywordIndex(orders).stats
+    assert stats['Count'].to_dict() == dict(expected)
+
+
+def test_revenue_and_orders_per_keyword(orders):
+    stats = KeywordIndex(orders).stats
+    keywords = orders['상품명'].apply(lambda text: set(re.findall(r'[가-힣]+', str(text))))
+    for word, row in stats.iterrows():
+        mask = keywords.apply(lambda words: word in words)
+        assert row['Orders'] == mask.sum()
+        assert row['Revenue'] == pytest.approx(orders.loc[mask, '실결제 금액'].sum())
+        assert row['AvgPrice'] == pytest.approx(orders.loc[mask, '판매단가'].mean(), nan_ok=True)
+
+
+def test_rows_match_token_membership(orders):
+    index = KeywordIndex(orders)
+    keywords = orders['상품명'].apply(lambda text: set(re.findall(r'[가-힣]+', str(text))))
+    for word in index.vocab:
+        expected = np.flatnonzero(keywords.apply(lambda words: word in words).to_numpy())
+        np.testing.assert_array_equal(index.rows(word), expected)
+    assert len(index.rows('없는키워드')) == 0
+
+
+@pytest.mark.parametrize('text', ['감귤', '귤', '레드', '한라봉', '서귀포', '없음'])
+def test_search_matches_str_contains(orders, text):
+    expected = np.flatnonzero(orders['상품명'].str.contains(text, regex=False, na=False).to_numpy())
+    np.testing.assert_array_equal(KeywordIndex(orders).search(text), expected)
+
+
+def test_search_leaves_non_hangul_to_the_caller(orders):
+    index = KeywordIndex(orders)
+    assert index.search('15kg') is None
+    assert index.search('감귤 특품') is None
+
+
+@pytest.mark.parametrize('filters, text', [({}, '감귤'), ({'광역지역': '서울특별시'}, '감귤'), ({}, '15kg'),
+                                           ({'셀러명': '성산농장0011'}, '레드향'), ({}, '없음')])
+def test_filter_select_with_keywords_matches_ngram_search(orders, filters, text):
+    index, keywords = FilterIndex(orders), KeywordIndex(orders)
+    np.testing.assert_array_equal(index.select(filters, text, keywords), index.select(filters, text))
@@ -0,0 +1,82 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from ingest import read_orders
+from prepare_looker_data import PARTITION_COL, SUMMARY_GRAINS, export_partitioned, prepare_frame
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'orders.csv')
+
+
+@pytest.fixture(scope='module')
+def valid_sales():
+    # 여러 달에 걸친 주문, 결측 지역 포함 (Orders over several months, with missing regions)
+    df = read_orders(FIXTURE)
+    rng = np.random.default_rng(6)
+    df = df.iloc[rng.integers(0, len(df), 400)].reset_index(drop=True)
+    df['UID'] = 'U' + pd.Series(rng.integers(0, 90, len(df))).astype(str)
+    df['셀러명'] = 'S' + pd.Series(rng.integers(0, 20, len(df))).astype(str)
+    df['주문일'] = (pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 180, len(df)), unit='D')).astype(str)
+    df.loc[::23, '광역지역'] = np.nan
+    return prepare_frame(df)
+
+
+def read_partition(output_dir, key):
+    return pd.read_csv(os.path.join(output_dir, f'{PARTITION_COL}={key}', 'data.csv'), encoding='utf-8-sig')
+
+
+def test_partitions_hold_the_rows_of_each_month(valid_sales, tmp_path):
+    written, removed = export_partitioned(valid_sales, str(tmp_path))
+    months = sorted(valid_sales['YearMonth'].unique())
+    assert written == months + [f'summary_{name}' for name in SUMMARY_GRAINS] and removed == []
+    # 월별 파일 = 전체 파일을 월로 나눈 것 (Each month's file is the single-file export filtered to that month)
+    single = tmp_path / 'single.csv'
+    valid_sales.to_csv(single, index=False, encoding='utf-8-sig')
+    whole = pd.read_csv(single, encoding='utf-8-sig')
+    for month in months:
+        expected = whole[whole['YearMonth'] == month].reset_index(drop=True)
+        pd.testing.assert_frame_equal(read_partition(str(tmp_path), month), expected)
+
+
+def group_keys(df, grain):
+    # 결측 지역도 하나의 그룹 (A missing region is a group of its own)
+    return df[grain].astype(object).fillna('').astype(str).agg('|'.join, axis=1)
+
+
+@pytest.mark.parametrize('name', list(SUMMARY_GRAINS))
+def test_summaries_match_groupby(valid_sales, tmp_path, name):
+    export_partitioned(valid_sales, str(tmp_path))
+    summary = pd.read_csv(tmp_path / f'summary_{name}.csv', encoding='utf-8-sig')
+    grain = SUMMARY_GRAINS[name]
+    expected = valid_sales.groupby(grain, dropna=False).agg(
+        Orders=('UID', 'size'), Quantity=('주문-취소 수량', 'sum'),
+        Revenue=('실결제 금액', 'sum'), Buyers=('UID', 'nunique')).reset_index()
+    expected = expected.set_index(group_keys(expected, grain))
+    summary = summary.set_index(group_keys(summary, grain))
+    assert sorted(summary.index) == sorted(expected.index)
+    for col in ['Orders', 'Quantity', 'Revenue', 'Buyers']:
+        assert summary[col].to_dict() == expected[col].to_dict(), col
+
+
+def test_only_changed_months_are_rewritten(valid_sales, tmp_path):
+    output_dir = str(tmp_path)
+    export_partitioned(valid_sales, output_dir)
+    assert export_partitioned(valid_sales, output_dir) == ([], [])
+
+    months = sorted(valid_sales['YearMonth'].unique())
+    changed = valid_sales.copy()
+    changed.loc[changed['YearMonth'] == months[2], '실결제 금액'] += 1000
+    written, _ = export_partitioned(changed, output_dir)
+    assert written == [months[2]] + [f'summary_{name}' for name in SUMMARY_GRAINS]
+    part = read_partition(output_dir, months[2])
+    assert part['실결제 금액'].sum() == changed.loc[changed['YearMonth'] == months[2], '실결제 금액'].sum()
+
+    # 원본에서 사라진 달은 삭제 (A month missing from the source is deleted)
+    written, removed = export_partitioned(changed[changed['YearMonth'] != months[0]], output_dir)
+    assert removed == [months[0]]
+    assert written == [f'summary_{name}' for name in SUMMARY_GRAINS]
+    assert not os.path.exists(os.path.join(output_dir, f'{PARTITION_COL}={months[0]}'))
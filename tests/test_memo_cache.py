@@ -0,0 +1,88 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from memo_cache import MemoCache, nbytes
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'orders.csv')
+
+# 키마다 크기가 다른 값 (Values of a different size per key, in bytes)
+SIZES = {key: 8 * 1024 * (1 + key % 5) for key in range(12)}
+
+
+def value_of(key):
+    return np.full(SIZES[key] // 8, key, dtype=np.int64)
+
+
+def test_eviction_matches_a_reference_lru():
+    budget = 64 * 1024
+    memo = MemoCache(budget_mb=budget / 2 ** 20)
+    model, used, hits, misses, evictions = OrderedDict(), 0, 0, 0, 0
+    trace = np.random.default_rng(4).integers(0, len(SIZES), 400)
+    for key in trace:
+        key = int(key)
+        result = memo.get(key, lambda: value_of(key))
+        np.testing.assert_array_equal(result, value_of(key))
+        # 참조 모델: 순서 있는 사전으로 만든 바이트 예산 LRU (Reference: a byte-budget LRU over an OrderedDict)
+        if key in model:
+            model.move_to_end(key)
+            hits += 1
+        else:
+            misses += 1
+            model[key] = SIZES[key]
+            used += SIZES[key]
+            while used > budget:
+                used -= model.popitem(last=False)[1]
+                evictions += 1
+        assert list(memo._entries) == list(model)
+    stats = memo.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['bytes']) == (hits, misses, evictions, used)
+    assert stats['bytes'] <= budget
+
+
+def test_values_larger_than_the_budget_are_not_stored():
+    memo = MemoCache(budget_mb=4 / 1024)
+    calls = []
+    for _ in range(2):
+        memo.get('big', lambda: calls.append(1) or np.zeros(1024))
+    assert len(calls) == 2 and memo.stats()['entries'] == 0
+
+
+def test_frames_are_sized_with_their_strings():
+    df = pd.read_csv(FIXTURE)
+    assert nbytes(df) == df.memory_usage(deep=True).sum()
+    assert nbytes((df, df['UID'])) > nbytes(df) + nbytes(df['UID'])
+
+
+def test_discard_and_clear_keep_the_byte_count():
+    memo = MemoCache(budget_mb=1)
+    for key in range(6):
+        memo.get(('v1', key), lambda key=key: value_of(key))
+        memo.get(('v2', key), lambda key=key: value_of(key))
+    memo.discard(lambda key: key[0] == 'v1')
+    assert all(key[0] == 'v2' for key in memo._entries)
+    assert memo.stats()['bytes'] == sum(SIZES[key] for key in range(6))
+    memo.clear()
+    assert memo.stats()['entries'] == 0 and memo.stats()['bytes'] == 0
+
+
+def test_concurrent_gets_keep_the_budget():
+    budget = 48 * 1024
+    memo = MemoCache(budget_mb=budget / 2 ** 20)
+
+    def worker(seed):
+        for key in np.random.default_rng(seed).integers(0, len(SIZES), 300):
+            memo.get(int(key), lambda key=int(key): value_of(key))
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert memo.stats()['bytes'] == sum(size for _, size in memo._entries.values()) <= budget
+    assert memo.stats()['hits'] + memo.stats()['misses'] == 6 * 300
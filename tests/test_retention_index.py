@@ -0,0 +1,65 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from ingest import clean_orders, read_orders
+from retention_index import RetentionIndex
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'orders.csv')
+
+
+@pytest.fixture(scope='module')
+def orders():
+    # 같은 구매자가 여러 번 사는 주문 이력, 결측 UID / 셀러 포함 (Repeat buyers, with missing UIDs and sellers)
+    df = clean_orders(read_orders(FIXTURE))
+    rng = np.random.default_rng(3)
+    df = df.iloc[rng.integers(0, len(df), 500)].reset_index(drop=True)
+    df['UID'] = 'U' + pd.Series(rng.integers(0, 120, len(df))).astype(str)
+    df['셀러명'] = 'S' + pd.Series(rng.integers(0, 15, len(df))).astype(str)
+    df.loc[::31, 'UID'] = np.nan
+    df.loc[::47, '셀러명'] = np.nan
+    return df
+
+
+def reference_stats(df):
+    # 색인 이전 H4 의 groupby 계산 (The H4 groupby computation the index replaced)
+    pairs = df.groupby(['UID', '셀러명']).size()
+    buyers = df.dropna(subset=['UID']).groupby('셀러명')['UID'].nunique()
+    repeat = pairs[pairs > 1].reset_index().groupby('셀러명')['UID'].count()
+    stats = pd.DataFrame({'Buyers': buyers, 'RepeatBuyers': repeat.reindex(buyers.index, fill_value=0)})
+    stats['RepurchaseRate'] = stats['RepeatBuyers'] / stats['Buyers'] * 100
+    return pairs, stats[stats['Buyers'] > 0].sort_index()
+
+
+def test_pairs_and_seller_stats_match_groupby(orders):
+    index = RetentionIndex(orders['UID'], orders['셀러명'])
+    pairs, expected = reference_stats(orders)
+    assert index.total_pairs == len(pairs)
+    assert index.repeat_pairs == (pairs > 1).sum()
+    pd.testing.assert_frame_equal(index.seller_stats(), expected, check_dtype=False, check_names=False)
+
+
+def test_batches_and_merges_match_one_build(orders):
+    full = RetentionIndex(orders['UID'], orders['셀러명'])
+    chunks = [orders.iloc[i:i + 90] for i in range(0, len(orders), 90)]
+    updated = RetentionIndex()
+    for chunk in chunks:
+        updated.update(chunk['UID'], chunk['셀러명'])
+    merged = RetentionIndex(chunks[0]['UID'], chunks[0]['셀러명'])
+    for chunk in chunks[1:]:
+        merged = merged.merge(RetentionIndex(chunk['UID'], chunk['셀러명']))
+    for index in (updated, merged):
+        pd.testing.assert_frame_equal(index.seller_stats(), full.seller_stats())
+        assert (index.total_pairs, index.repeat_pairs) == (full.total_pairs, full.repeat_pairs)
+
+
+def test_top_ranks_by_rate_then_name(orders):
+    stats = reference_stats(orders)[1]
+    expected = stats[stats['Buyers'] >= 10].sort_values('RepurchaseRate', ascending=False, kind='stable').head(5)
+    top = RetentionIndex(orders['UID'], orders['셀러명']).top(min_buyers=10, n=5)
+    assert top.index.tolist() == expected.index.tolist()
+    np.testing.assert_allclose(top['RepurchaseRate'], expected['RepurchaseRate'])
@@ -0,0 +1,68 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from compact_layout import compact_frame
+from ingest import clean_orders, read_orders
+from rollup_cube import CUBE_DIMS, CUBE_MEASURES, build_cube, filter_cube, kpis, merge_cubes, top_by
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'orders.csv')
+
+
+@pytest.fixture(scope='module')
+def orders():
+    df = clean_orders(read_orders(FIXTURE))
+    rng = np.random.default_rng(2)
+    df = df.iloc[rng.integers(0, len(df), 300)].reset_index(drop=True)
+    df['셀러명'] = 'S' + pd.Series(rng.integers(0, 12, len(df))).astype(str)
+    df.loc[::17, '광역지역'] = np.nan
+    df['YearMonth'] = df['주문일'].dt.to_period('M').astype(str)
+    return df
+
+
+def test_kpis_match_row_aggregates(orders):
+    # 큐브 이전 홈 화면의 행 단위 합계 / 평균 (The row-level sums and mean the home page used before the cube)
+    result = kpis(build_cube(orders))
+    assert result['total_sales'] == orders['실결제 금액'].sum()
+    assert result['total_orders'] == orders['주문-취소 수량'].sum()
+    assert result['avg_price'] == pytest.approx(orders['판매단가'].mean())
+    assert result['rows'] == len(orders)
+
+
+@pytest.mark.parametrize('filters', [{}, {'광역지역': '서울특별시'}, {'셀러명': 'S3', '과수 크기': '로얄과'}])
+@pytest.mark.parametrize('col', ['셀러명', '상품명', 'YearMonth'])
+def test_top_by_matches_groupby(orders, filters, col):
+    mask = pd.Series(True, index=orders.index)
+    for key, value in filters.items():
+        mask &= orders[key] == value
+    expected = orders[mask].groupby(col)['실결제 금액'].sum()
+    result = top_by(filter_cube(build_cube(orders), filters), col).set_index(col)['실결제 금액']
+    pd.testing.assert_series_equal(result.sort_index(), expected.sort_index(), check_dtype=False)
+    assert result.is_monotonic_decreasing
+
+
+def test_product_filter_matches_isin(orders):
+    products = orders['상품명'].dropna().unique()[:2]
+    result = kpis(filter_cube(build_cube(orders), products=products))
+    assert result['total_sales'] == orders.loc[orders['상품명'].isin(products), '실결제 금액'].sum()
+
+
+def sorted_cube(cube):
+    dims = [c for c in CUBE_DIMS if c in cube.columns]
+    cube = cube.astype({c: object for c in dims})
+    return cube.sort_values(dims, na_position='last').reset_index(drop=True)[dims + CUBE_MEASURES]
+
+
+def test_merged_cubes_match_a_full_build(orders):
+    head, tail = orders.iloc[:180], orders.iloc[180:]
+    merged = merge_cubes(build_cube(head), build_cube(tail))
+    pd.testing.assert_frame_equal(sorted_cube(merged), sorted_cube(build_cube(orders)), check_dtype=False)
+
+
+def test_compact_layout_builds_the_same_cube(orders):
+    compact = build_cube(compact_frame(orders))
+    pd.testing.assert_frame_equal(sorted_cube(compact), sorted_cube(build_cube(orders)), check_dtype=False)
@@ -0,0 +1,78 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from ingest import clean_orders, read_orders
+from seller_lifecycle import SellerLifecycle
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'orders.csv')
+
+
+@pytest.fixture(scope='module')
+def orders():
+    # 픽스처 행을 흩어진 날짜로 반복, 주문이 없는 일 / 주도 생김 (Fixture rows spread over dates, leaving empty days and weeks)
+    df = clean_orders(read_orders(FIXTURE))
+    rng = np.random.default_rng(1)
+    df = df.iloc[rng.integers(0, len(df), 400)].reset_index(drop=True)
+    df['셀러명'] = 'S' + pd.Series(rng.integers(0, 40, len(df))).astype(str)
+    df['주문일'] = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 120, len(df)) * 3, unit='D')
+    return df
+
+
+def reference_summary(df, freq):
+    # 생애주기 엔진 이전의 기간별 집합 비교 (The period-by-period set comparison the engine replaced)
+    periods = df['주문일'].dt.to_period(freq)
+    per_period = df.groupby(periods)['셀러명'].unique()
+    rows, seen, previous = [], set(), set()
+    for period in sorted(per_period.index):
+        current = set(per_period[period])
+        rows.append({'Period': period, 'Active': len(current), 'New': len(current - seen),
+                     'Churned': len(previous - current), 'Retained': len(previous & current)})
+        seen |= current
+        previous = current
+    return pd.DataFrame(rows)
+
+
+def reference_cohorts(df, freq):
+    # 셀러별 첫 기간 기준, 달력 기간 수로 센 경과 기간별 활동 셀러 수
+    # (Active sellers per cohort and calendar periods since the seller's first period)
+    periods = df['주문일'].dt.to_period(freq)
+    active = pd.DataFrame({'seller': df['셀러명'], 'period': periods.map(lambda p: p.ordinal)}).drop_duplicates()
+    first = active.groupby('seller')['period'].transform('min')
+    last = active['period'].max()
+    counts = active.assign(offset=active['period'] - first, cohort=first).groupby(['cohort', 'offset']).size()
+    sizes = active.groupby('seller')['period'].min().value_counts().sort_index()
+    n_offsets = last - active['period'].min() + 1
+    matrix = counts.unstack(fill_value=0).reindex(index=sizes.index, columns=range(n_offsets), fill_value=0)
+    matrix = matrix.astype(float)
+    for cohort in matrix.index:
+        matrix.loc[cohort, matrix.columns > last - cohort] = np.nan
+    return sizes, matrix
+
+
+@pytest.mark.parametrize('freq', ['M', 'W', 'D'])
+def test_summary_matches_set_comparison(orders, freq):
+    summary = SellerLifecycle.from_orders(orders, freq).summary()
+    expected = reference_summary(orders, freq)
+    pd.testing.assert_frame_equal(summary[expected.columns], expected, check_dtype=False)
+    assert (summary['Reactivated'] == summary['Active'] - summary['New'] - summary['Retained']).all()
+
+
+@pytest.mark.parametrize('freq', ['M', 'W', 'D'])
+def test_cohort_offsets_count_calendar_periods(orders, freq):
+    matrix = SellerLifecycle.from_orders(orders, freq).cohort_matrix(share=False)
+    sizes, expected = reference_cohorts(orders, freq)
+    assert matrix['Size'].tolist() == sizes.tolist()
+    assert [p.ordinal for p in matrix.index] == sizes.index.tolist()
+    np.testing.assert_array_equal(matrix.drop(columns='Size').to_numpy(), expected.to_numpy())
+
+
+def test_constructor_matches_from_orders(orders):
+    built = SellerLifecycle(orders['셀러명'], orders['주문일'].dt.to_period('W'))
+    fast = SellerLifecycle.from_orders(orders, 'W')
+    pd.testing.assert_frame_equal(built.summary(), fast.summary())
+    pd.testing.assert_frame_equal(built.cohort_matrix(), fast.cohort_matrix())
@@ -0,0 +1,86 @@
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from eda_analysis import HYPOTHESES, load_and_clean_data, merge_partials, run_streaming
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'orders.csv')
+
+
+@pytest.fixture(scope='module')
+def orders_csv(tmp_path_factory):
+    # 픽스처 행을 재표본화한 원본 CSV, 구매자 / 셀러 / 월이 여러 청크에 걸침
+    # (Resampled raw CSV; buyers, sellers and months span several chunks)
+    raw = pd.read_csv(FIXTURE, dtype=str, keep_default_na=False)
+    rng = np.random.default_rng(5)
+    raw = raw.iloc[rng.integers(0, len(raw), 600)].reset_index(drop=True)
+    raw['UID'] = 'U' + pd.Series(rng.integers(0, 150, len(raw))).astype(str)
+    raw['셀러명'] = 'S' + pd.Series(rng.integers(0, 60, len(raw))).astype(str)
+    raw['주문일'] = (pd.Timestamp('2023-06-01') + pd.to_timedelta(rng.integers(0, 300, len(raw)), unit='D')).astype(str)
+    path = tmp_path_factory.mktemp('orders') / 'orders.csv'
+    raw.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(scope='module')
+def valid_sales(orders_csv):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return load_and_clean_data(orders_csv)[1]
+
+
+def printed(fn, *args):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        fn(*args)
+    return buffer.getvalue()
+
+
+def in_memory(path):
+    # 전체를 읽어 가설을 차례로 출력 (Load everything, then print every hypothesis)
+    df, valid = load_and_clean_data(path)
+    for h in HYPOTHESES:
+        h.report(h.partial(valid))
+
+
+@pytest.mark.parametrize('chunksize', [50, 170, 10_000])
+def test_streaming_prints_the_in_memory_reports(orders_csv, chunksize):
+    # 첫 줄(읽기 안내)만 다름 (Only the loading banner differs)
+    streamed = printed(run_streaming, orders_csv, chunksize).split('\n', 1)[1]
+    assert streamed == printed(in_memory, orders_csv).split('\n', 1)[1]
+
+
+@pytest.mark.parametrize('chunksize', [5, 37, 250])
+def test_merged_chunk_partials_print_like_one_partial(valid_sales, chunksize):
+    for h in HYPOTHESES:
+        state = None
+        for start in range(0, len(valid_sales), chunksize):
+            state = merge_partials(state, h.partial(valid_sales.iloc[start:start + chunksize]))
+        assert printed(h.report, state) == printed(h.report, h.partial(valid_sales)), h.label
+
+
+def test_merged_states_match_pandas(valid_sales):
+    states = {}
+    for start in range(0, len(valid_sales), 64):
+        chunk = valid_sales.iloc[start:start + 64]
+        for h in HYPOTHESES:
+            state = h.partial(chunk)
+            states[h.label] = merge_partials(states[h.label], state) if h.label in states else state
+    gyeonggi = valid_sales[valid_sales['광역지역'].str.contains('경기', na=False)]
+    assert states['H1']['total_sales'] == gyeonggi['실결제 금액'].sum()
+    pd.testing.assert_series_equal(states['H1']['seller_sales'].sort_index(),
+                                   gyeonggi.groupby('셀러명')['실결제 금액'].sum(), check_dtype=False)
+    expected = valid_sales.groupby('이벤트 여부')[['주문-취소 수량', '실결제 금액', 'NetProfit']].sum()
+    pd.testing.assert_frame_equal(states['H2']['group'], expected, check_dtype=False)
+    seoul = valid_sales['광역지역'].str.contains('서울', na=False).map({True: 'Seoul', False: 'Non-Seoul'})
+    expected = pd.crosstab(valid_sales['무게 구분'], seoul.rename('RegionGroup'))
+    pd.testing.assert_frame_equal(states['H7']['counts'].fillna(0), expected, check_dtype=False)
+    pairs = states['H6']['month_sellers'].to_frame(index=False)
+    expected = valid_sales.assign(Month=valid_sales['주문일'].dt.to_period('M'))[['Month', '셀러명']].drop_duplicates()
+    assert len(pairs) == len(expected)
+    assert set(map(tuple, pairs.to_numpy())) == set(map(tuple, expected.to_numpy()))